@@ -0,0 +1,87 @@
+"""Measure bulk message/event insert throughput against a real Postgres.
+
+Usage::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bulk_insert --rows 200000
+
+Creates a throwaway tenant, customer and thread, writes ``--rows`` messages in
+batches of ``--batch`` (a ``--dup-ratio`` share of them replays of earlier
+platform ids) and the same number of events, then deletes the tenant.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from supportdesk.app.db.bulk import insert_events, insert_messages
+from supportdesk.app.db.models import Customer, Tenant, Thread
+from supportdesk.app.db.session import dispose_engine, get_db_session
+
+
+async def _fixture() -> tuple[uuid.UUID, uuid.UUID]:
+    tenant_id, customer_id, thread_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    async with get_db_session() as session:
+        session.add(Tenant(id=tenant_id, name=f"bench-{tenant_id.hex[:8]}"))
+        await session.flush()
+        session.add(Customer(id=customer_id, tenant_id=tenant_id, platform="wa", platform_user_id="bench"))
+        await session.flush()
+        session.add(
+            Thread(id=thread_id, tenant_id=tenant_id, customer_id=customer_id, channel="wa", platform_thread_id="bench")
+        )
+    return tenant_id, thread_id
+
+
+async def main(rows: int, batch: int, dup_ratio: float) -> None:
+    tenant_id, thread_id = await _fixture()
+    rng = random.Random(0)
+    try:
+        messages = [
+            {
+                "tenant_id": tenant_id,
+                "thread_id": thread_id,
+                # Replays reuse an id from earlier in the run
+                "platform_message_id": f"wamid.{rng.randrange(max(i, 1)) if rng.random() < dup_ratio else i}",
+                "direction": "inbound",
+                "text": "hello " * rng.randint(1, 20),
+                "media": None,
+            }
+            for i in range(rows)
+        ]
+        inserted = duplicates = 0
+        started = time.perf_counter()
+        for start in range(0, rows, batch):
+            async with get_db_session() as session:
+                result = await insert_messages(session, messages[start : start + batch])
+            inserted += result.inserted
+            duplicates += result.duplicates
+        elapsed = time.perf_counter() - started
+        print(f"messages: {rows} rows in {elapsed:.2f}s = {rows / elapsed:,.0f} rows/s "
+              f"(inserted={inserted}, duplicates={duplicates})")
+
+        events = [
+            {"tenant_id": tenant_id, "thread_id": thread_id, "type": "debounce_end", "meta": {"messages": i % 7}}
+            for i in range(rows)
+        ]
+        started = time.perf_counter()
+        for start in range(0, rows, batch):
+            async with get_db_session() as session:
+                await insert_events(session, events[start : start + batch])
+        elapsed = time.perf_counter() - started
+        print(f"events:   {rows} rows in {elapsed:.2f}s = {rows / elapsed:,.0f} rows/s")
+    finally:
+        async with get_db_session() as session:
+            await session.execute(delete(Tenant).where(Tenant.id == tenant_id))
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=20_000)
+    parser.add_argument("--dup-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch, args.dup_ratio))
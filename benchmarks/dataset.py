@@ -0,0 +1,529 @@
+"""Generate a large synthetic dataset, into Postgres with COPY or as NDJSON.
+
+Usage::
+
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.dataset \\
+        --tenants 2000 --customers 2000000 --threads 5000000 --messages 20000000 --workers 8
+    python -m benchmarks.dataset --tenants 5 --customers 200 --threads 500 --messages 5000 --ndjson fixtures/
+
+Write into a throwaway database migrated to head. Nothing is deleted
+afterwards; drop the database when done.
+
+Volumes are skewed the way production traffic is. Tenant sizes follow a
+Zipf distribution (``--skew``). Within a tenant, a few customers open most
+threads, and thread lengths are Pareto-distributed. Each thread is a
+conversation: bursts of inbound messages, each answered by an outbound
+reply. The events a burst produces follow it: ``debounce_start``,
+``debounce_end``, then ``answer_sent``, ``clarify_sent`` or ``ack_sent``,
+sometimes with ``urgent_flagged`` or ``needs_review_created``. There are
+no ``--events``; their count follows from the conversations. Thread
+activity grows linearly over the ``--days`` up to ``--until``, and threads
+quiet for two days are mostly closed.
+
+Rows respect every foreign key and unique constraint in ``db/models``.
+Within a tenant, tables are written parent first, and platform ids are
+numbered per tenant. Every tenant's rows come from a ``random.Random``
+seeded with ``--seed`` and the tenant's index, so the output depends only on
+the arguments, never on ``--workers``.
+
+Tenants are spread over ``--workers`` processes, largest first. Each process
+writes its tenants with asyncpg ``copy_records_to_table``, one transaction
+per tenant. Monthly ``events`` partitions for the whole span are created
+up front so no row lands in ``events_default``. Messages get no embedding;
+the embedding worker picks them up, so stop it while loading.
+``thread_label_counts`` is left to its trigger. COPY skips the commit
+hooks, so cached list totals in Redis are dropped at the end. Run with
+``--analyze`` to refresh planner statistics at the end.
+
+With ``--ndjson DIR`` nothing touches a database. Each worker writes one
+``{table}.{worker}.ndjson`` file per table: one JSON object per row, keyed
+by column, with UUIDs and timestamps as strings. There is no trigger to
+fill ``thread_label_counts``, so those rows are written too.
+``load_ndjson`` loads a directory of them into any database the models
+support, SQLite included.
+
+Throughput depends on the indexes being maintained; expect generation in
+Python, not COPY, to be the limit with fewer than one worker per core. No
+numbers are recorded here yet: this script has not been run against
+Postgres in the environment it was written in.
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import os
+import random
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from supportdesk.app.config import settings
+from supportdesk.app.db.partitions import month_start
+
+# Columns written per table, in foreign key order
+COLUMNS = {
+    "tenants": ("id", "name", "created_at", "updated_at"),
+    "labels": ("id", "tenant_id", "name", "description", "created_at", "updated_at"),
+    "customers": ("id", "tenant_id", "platform", "platform_user_id", "phone", "email", "created_at", "updated_at"),
+    "threads": (
+        "id", "tenant_id", "channel", "platform_thread_id", "customer_id", "status", "labels",
+        "created_at", "updated_at",
+    ),
+    "messages": (
+        "id", "tenant_id", "thread_id", "platform_message_id", "direction", "text", "media", "language",
+        "created_at", "updated_at",
+    ),
+    "events": ("id", "tenant_id", "thread_id", "type", "meta", "ts"),
+    "kb_articles": ("id", "tenant_id", "title", "body", "url", "created_at", "updated_at"),
+    # Maintained by the threads_label_counts trigger on Postgres; NDJSON only
+    "thread_label_counts": ("tenant_id", "label", "status", "count"),
+}
+# asyncpg takes json and jsonb values as strings
+JSON_COLUMNS = {"threads": {"labels"}, "messages": {"media"}, "events": {"meta"}}
+
+CHANNELS = (["wa", "ig", "fb"], [6, 3, 1])
+LANGUAGES = (["en", "es", "de", "fr"], [70, 15, 10, 5])
+LABELS = [
+    ("refund", "Customer asks for money back"),
+    ("billing", "Charges, invoices and payment methods"),
+    ("shipping", "Delivery times and tracking"),
+    ("bug", "Something in the app is broken"),
+    ("login", "Account access problems"),
+    ("vip", "High-value customer"),
+    ("urgent", "Needs an answer today"),
+    ("feedback", "Suggestions and complaints"),
+    ("cancellation", "Wants to end a subscription"),
+    ("spam", "Not a real request"),
+]
+INBOUND = {
+    "en": [
+        "Hi, where is my refund?", "My order has not arrived yet.", "The app crashes when I log in.",
+        "I was charged twice this month.", "How do I change my shipping address?", "Can I cancel my subscription?",
+        "The tracking number does not work.", "I forgot my password.", "The item arrived damaged.",
+        "Any update?", "Please help, this is urgent.", "Thanks!", "Do you ship internationally?",
+    ],
+    "es": [
+        "Hola, ¿dónde está mi reembolso?", "Mi pedido no ha llegado todavía.", "La aplicación se cierra al entrar.",
+        "Me cobraron dos veces este mes.", "¿Cómo cambio mi dirección de envío?", "¡Gracias!", "¿Alguna novedad?",
+    ],
+    "de": [
+        "Hallo, wo bleibt meine Rückerstattung?", "Meine Bestellung ist noch nicht angekommen.",
+        "Die App stürzt beim Anmelden ab.", "Mir wurde zweimal abgebucht.", "Danke!", "Gibt es etwas Neues?",
+    ],
+    "fr": [
+        "Bonjour, où en est mon remboursement ?", "Ma commande n'est pas encore arrivée.",
+        "L'application plante à la connexion.", "J'ai été débité deux fois.", "Merci !", "Des nouvelles ?",
+    ],
+}
+OUTBOUND = {
+    "en": [
+        "Thanks for reaching out! Let me check that for you.", "Your refund was approved and takes 5 days.",
+        "Could you send me your order number?", "I have updated your address.", "Sorry about that, a replacement is on its way.",
+    ],
+    "es": ["¡Gracias por escribirnos! Lo reviso ahora.", "¿Me envías tu número de pedido?", "Tu reembolso fue aprobado."],
+    "de": ["Danke für Ihre Nachricht! Ich sehe nach.", "Können Sie mir Ihre Bestellnummer schicken?"],
+    "fr": ["Merci pour votre message ! Je vérifie.", "Pouvez-vous m'envoyer votre numéro de commande ?"],
+}
+KB_TOPICS = [
+    ("Refunds", "Refunds reach your card within 5 business days of approval.", "refunds"),
+    ("Shipping times", "Orders ship within 2 days; international delivery takes up to 3 weeks.", "shipping"),
+    ("Login problems", "Reinstall the app or reset your password if login crashes.", "login"),
+    ("Duplicate charges", "Duplicate charges are reversed automatically within a week.", "billing"),
+    ("Cancelling", "Subscriptions can be cancelled any time from the account page.", "cancel"),
+    ("Damaged items", "Send a photo of the damaged item and we ship a replacement.", "damaged"),
+]
+REPLY_EVENTS = (["answer_sent", "clarify_sent", "ack_sent"], [7, 2, 1])
+
+
+@dataclass(frozen=True)
+class TenantPlan:
+    index: int
+    id: uuid.UUID
+    customers: int
+    threads: int
+    messages: int
+    kb_articles: int
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _split(total: int, weights: list[float], minimum: int) -> list[int]:
+    """Largest-remainder split of ``total`` over ``weights``, at least ``minimum`` each."""
+    spare = max(total - minimum * len(weights), 0)
+    scale = spare / sum(weights)
+    shares = [minimum + int(w * scale) for w in weights]
+    by_remainder = sorted(range(len(weights)), key=lambda i: (int(weights[i] * scale) - weights[i] * scale, i))
+    for i in by_remainder[: minimum * len(weights) + spare - sum(shares)]:
+        shares[i] += 1
+    return shares
+
+
+def plan(args) -> list[TenantPlan]:
+    weights = [1 / (rank + 1) ** args.skew for rank in range(args.tenants)]
+    customers = _split(args.customers, weights, 1)
+    threads = _split(args.threads, weights, 1)
+    messages = _split(args.messages, weights, 1)
+    kb_articles = _split(args.kb_articles, [1.0] * args.tenants, 0)
+    return [
+        TenantPlan(
+            index=i,
+            id=_uuid(random.Random(f"{args.seed}:tenant:{i}")),
+            customers=customers[i],
+            threads=threads[i],
+            # Every thread has at least its opening message
+            messages=max(messages[i], threads[i]),
+            kb_articles=kb_articles[i],
+        )
+        for i in range(args.tenants)
+    ]
+
+
+def tenant_rows(tenant: TenantPlan, args) -> Iterator[tuple[str, list[tuple]]]:
+    """Batches of one tenant's rows, except the tenant itself, parents before children."""
+    rng = random.Random(f"{args.seed}:rows:{tenant.index}")
+    until = datetime.combine(args.until, datetime.min.time(), tzinfo=timezone.utc)
+    span = timedelta(days=args.days)
+    start = until - span
+    language = rng.choices(*LANGUAGES)[0]
+
+    label_names = [name for name, _ in LABELS[: rng.randint(3, len(LABELS))]]
+    yield "labels", [
+        (_uuid(rng), tenant.id, name, description, start, start) for name, description in LABELS if name in label_names
+    ]
+
+    customers = []
+    batch = []
+    for n in range(tenant.customers):
+        channel = rng.choices(*CHANNELS)[0]
+        created = start + span * rng.random()
+        phone = f"+1{2000000000 + n}" if channel == "wa" else None
+        email = f"customer{n}@example.com" if rng.random() < 0.3 else None
+        # Numbered per tenant: unique (tenant_id, platform, platform_user_id)
+        platform_user_id = phone[1:] if phone else f"{channel}-{n:09d}"
+        customer_id = _uuid(rng)
+        customers.append((customer_id, channel, platform_user_id))
+        batch.append((customer_id, tenant.id, channel, platform_user_id, phone, email, created, created))
+        if len(batch) >= args.chunk:
+            yield "customers", batch
+            batch = []
+    yield "customers", batch
+
+    # A few customers open most threads; a few threads carry most messages
+    customer_weights = [rng.paretovariate(1.5) for _ in customers]
+    lengths = _split(tenant.messages, [min(rng.paretovariate(1.3), 500) for _ in range(tenant.threads)], 1)
+    label_counts: Counter = Counter()
+    threads, messages, events = [], [], []
+    for n, (customer_id, channel, platform_user_id) in enumerate(
+        rng.choices(customers, customer_weights, k=tenant.threads)
+    ):
+        # Volume grows linearly over the span: sqrt of a uniform draw
+        created = start + span * rng.random() ** 0.5
+        thread_id = _uuid(rng)
+        thread_rng = random.Random(f"{args.seed}:thread:{tenant.index}:{n}")
+        last = _conversation(thread_rng, tenant, thread_id, n, lengths[n], created, language, messages, events)
+        quiet = until - last > timedelta(days=2)
+        status = rng.choices(["closed", "open", "paused"], [8, 2, 0] if quiet else [1, 8, 1])[0]
+        labels = rng.sample(label_names, k=min(int(rng.paretovariate(2)) - 1, 3))
+        label_counts.update((label, status) for label in labels)
+        threads.append(
+            (thread_id, tenant.id, channel, f"{platform_user_id}:{n}", customer_id, status, labels, created, last)
+        )
+        # Each block of threads goes out before its messages and events
+        if len(messages) >= args.chunk or n == tenant.threads - 1:
+            yield "threads", threads
+            yield "messages", messages
+            yield "events", events
+            threads, messages, events = [], [], []
+
+    articles = []
+    for n in range(tenant.kb_articles):
+        title, body, slug = rng.choice(KB_TOPICS)
+        created = start + span * rng.random()
+        articles.append((_uuid(rng), tenant.id, title, body, f"https://help.example.com/{slug}-{n}", created, created))
+    yield "kb_articles", articles
+
+    if args.ndjson:
+        yield "thread_label_counts", [
+            (tenant.id, label, status, count) for (label, status), count in sorted(label_counts.items())
+        ]
+
+
+def _conversation(
+    rng: random.Random,
+    tenant: TenantPlan,
+    thread_id: uuid.UUID,
+    n: int,
+    length: int,
+    ts: datetime,
+    language: str,
+    messages: list[tuple],
+    events: list[tuple],
+) -> datetime:
+    """Append one thread's messages and events; returns its last message's time."""
+    count = 0
+
+    def message(direction: str, text: Optional[str], media: Optional[dict]) -> str:
+        nonlocal count
+        platform_message_id = f"{tenant.index}.{n}.{count}"
+        count += 1
+        messages.append(
+            (_uuid(rng), tenant.id, thread_id, platform_message_id, direction, text, media, language, ts, ts)
+        )
+        return platform_message_id
+
+    def event(type: str, meta: Optional[dict]) -> None:
+        events.append((_uuid(rng), tenant.id, thread_id, type, meta, ts))
+
+    while count < length:
+        burst = min(int(rng.paretovariate(2.5)), length - count)
+        event("debounce_start", None)
+        urgent = False
+        for i in range(burst):
+            if i:
+                ts += timedelta(seconds=rng.randint(2, 40))
+            if rng.random() < 0.08:
+                message("inbound", None, {"type": "image", "id": f"media-{tenant.index}-{n}-{count}"})
+            else:
+                text = rng.choice(INBOUND[language])
+                urgent = urgent or "urgent" in text
+                message("inbound", text, None)
+        last = ts
+        ts += timedelta(seconds=settings.debounce_default_seconds + rng.randint(0, 4))
+        event("debounce_end", {"messages": burst})
+        if urgent:
+            event("urgent_flagged", None)
+        if rng.random() < 0.05:
+            event("needs_review_created", None)
+        if count < length:
+            ts += timedelta(seconds=rng.randint(1, 30))
+            last = ts
+            event(rng.choices(*REPLY_EVENTS)[0], {"message_id": message("outbound", rng.choice(OUTBOUND[language]), None)})
+        # The customer comes back minutes to days later
+        ts += timedelta(seconds=rng.expovariate(1 / 3600))
+    return last
+
+
+def assign(tenants: list[TenantPlan], workers: int) -> list[list[TenantPlan]]:
+    """Largest tenants first, each to the least loaded worker."""
+    heap = [(0, w) for w in range(workers)]
+    shares: list[list[TenantPlan]] = [[] for _ in range(workers)]
+    for tenant in sorted(tenants, key=lambda t: (-t.messages, t.index)):
+        load, w = heapq.heappop(heap)
+        shares[w].append(tenant)
+        heapq.heappush(heap, (load + tenant.messages + tenant.threads, w))
+    return shares
+
+
+def _dsn() -> str:
+    return make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _json_default(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class NdjsonSink:
+    def __init__(self, directory: str, worker: int):
+        self.directory = Path(directory)
+        self.worker = worker
+        self.files: dict = {}
+
+    async def write(self, table: str, records: list[tuple]) -> None:
+        if table not in self.files:
+            self.files[table] = open(self.directory / f"{table}.{self.worker:03d}.ndjson", "w")
+        out = self.files[table]
+        columns = COLUMNS[table]
+        for record in records:
+            out.write(json.dumps(dict(zip(columns, record, strict=True)), default=_json_default, ensure_ascii=False))
+            out.write("\n")
+
+    async def close(self) -> None:
+        for out in self.files.values():
+            out.close()
+
+
+async def load_ndjson(session: AsyncSession, directory: str, chunk: int = 5000) -> Counter:
+    """Insert the rows of an ``--ndjson`` directory through ``session``; returns rows per table."""
+    from supportdesk.app.db.models import Tenant
+
+    loaded: Counter = Counter()
+    for name in COLUMNS:
+        table = Tenant.metadata.tables[name]
+        parsers = {}
+        for column in COLUMNS[name]:
+            python_type = table.c[column].type.python_type if column not in JSON_COLUMNS.get(name, ()) else None
+            if python_type is uuid.UUID:
+                parsers[column] = uuid.UUID
+            elif python_type is datetime:
+                parsers[column] = datetime.fromisoformat
+        for path in sorted(Path(directory).glob(f"{name}.*.ndjson")):
+            with open(path) as lines:
+                rows = []
+                for line in lines:
+                    row = json.loads(line)
+                    for column, parse in parsers.items():
+                        if row[column] is not None:
+                            row[column] = parse(row[column])
+                    rows.append(row)
+            for start in range(0, len(rows), chunk):
+                await session.execute(insert(table), rows[start : start + chunk])
+            loaded[name] += len(rows)
+    return loaded
+
+
+class CopySink:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def write(self, table: str, records: list[tuple]) -> None:
+        columns = COLUMNS[table]
+        encode = [i for i, column in enumerate(columns) if column in JSON_COLUMNS.get(table, ())]
+        if encode:
+            records = [
+                tuple(json.dumps(v) if i in encode and v is not None else v for i, v in enumerate(record))
+                for record in records
+            ]
+        await self.connection.copy_records_to_table(table, records=records, columns=columns)
+
+    async def close(self) -> None:
+        await self.connection.close()
+
+
+async def _open_sink(args, worker: int):
+    if args.ndjson:
+        return NdjsonSink(args.ndjson, worker)
+    import asyncpg
+
+    return CopySink(await asyncpg.connect(_dsn()))
+
+
+async def _write_tenants(args, tenants: list[TenantPlan], worker: int) -> Counter:
+    written: Counter = Counter()
+    sink = await _open_sink(args, worker)
+    try:
+        for tenant in tenants:
+            transaction = None if args.ndjson else sink.connection.transaction()
+            if transaction is not None:
+                await transaction.start()
+            for table, records in tenant_rows(tenant, args):
+                if records:
+                    await sink.write(table, records)
+                    written[table] += len(records)
+            if transaction is not None:
+                await transaction.commit()
+    finally:
+        await sink.close()
+    return written
+
+
+def _worker(args, tenants: list[TenantPlan], worker: int) -> Counter:
+    return asyncio.run(_write_tenants(args, tenants, worker))
+
+
+async def _prepare(args, tenants: list[TenantPlan]) -> None:
+    """Write the tenants themselves and, on Postgres, the events partitions."""
+    until = datetime.combine(args.until, datetime.min.time(), tzinfo=timezone.utc)
+    start = until - timedelta(days=args.days)
+    rows = [(t.id, f"dataset-{args.seed}-{t.index}", start, start) for t in tenants]
+    sink = await _open_sink(args, 0)
+    try:
+        if not args.ndjson:
+            from supportdesk.app.db.partitions import ensure_partitions
+            from supportdesk.app.db.session import dispose_engine, get_db_session
+
+            first, last = month_start(start.date()), month_start(until.date())
+            months = (last.year - first.year) * 12 + last.month - first.month
+            async with get_db_session() as session:
+                # One month past --until for the replies that spill over
+                await ensure_partitions(session, "events", months_ahead=months + 1, now=start)
+            await dispose_engine()
+        await sink.write("tenants", rows)
+    finally:
+        await sink.close()
+
+
+async def _analyze() -> None:
+    import asyncpg
+
+    connection = await asyncpg.connect(_dsn())
+    try:
+        await connection.execute(
+            "ANALYZE tenants, labels, customers, threads, messages, events, kb_articles, thread_label_counts"
+        )
+    finally:
+        await connection.close()
+
+
+async def _drop_cached_counts(tenants: list[TenantPlan]) -> None:
+    """COPY skips the commit hooks, so cached list totals are dropped here."""
+    from supportdesk.app.core import redis_client
+    from supportdesk.app.db.counting import COUNTED_TABLES, drop_cached_counts
+
+    try:
+        for table in COUNTED_TABLES:
+            await drop_cached_counts(table, [t.id for t in tenants])
+    except redis_client.RedisError as e:
+        print(f"could not drop cached counts, they expire on their own: {e}")
+    finally:
+        await redis_client.close_redis_client()
+
+
+def main(args) -> None:
+    if args.ndjson:
+        os.makedirs(args.ndjson, exist_ok=True)
+    tenants = plan(args)
+    started = time.perf_counter()
+    asyncio.run(_prepare(args, tenants))
+    shares = [share for share in assign(tenants, args.workers) if share]
+    written: Counter = Counter({"tenants": len(tenants)})
+    if len(shares) == 1:
+        written += _worker(args, shares[0], 0)
+    else:
+        with ProcessPoolExecutor(len(shares), mp_context=get_context("spawn")) as pool:
+            for result in pool.map(_worker, [args] * len(shares), shares, range(len(shares))):
+                written += result
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    for table in COLUMNS:
+        if written[table]:
+            print(f"{table:20} {written[table]:>12,}")
+    print(f"{total:,} rows in {elapsed:.1f}s = {total / elapsed:,.0f} rows/s with {len(shares)} workers")
+    if not args.ndjson:
+        asyncio.run(_drop_cached_counts(tenants))
+    if args.analyze and not args.ndjson:
+        asyncio.run(_analyze())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=2000)
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--threads", type=int, default=2_000_000)
+    parser.add_argument("--messages", type=int, default=10_000_000)
+    parser.add_argument("--kb-articles", type=int, default=20_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of tenant sizes")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--until", type=date.fromisoformat, default=date(2025, 1, 1))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=50_000, help="Rows per COPY")
+    parser.add_argument("--ndjson", metavar="DIR", help="Write NDJSON files to DIR instead of the database")
+    parser.add_argument("--analyze", action="store_true")
+    main(parser.parse_args())
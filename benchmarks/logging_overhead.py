@@ -0,0 +1,94 @@
+"""Measure what request-path logging costs the event loop.
+
+Usage::
+
+    python -m benchmarks.logging_overhead --requests 20000 --stdout-latency-us 200
+
+Each simulated request emits the "Listed customers" INFO line the list
+endpoints log, through the real ``configure_logging`` pipeline. stdout is
+replaced by a sink whose ``write`` blocks for ``--stdout-latency-us``, standing
+in for a pipe the log shipper is not draining fast enough. The time reported
+is spent on the calling thread, i.e. added to every request:
+
+* ``sync``: structlog's ``WriteLogger`` pays the stdout latency per line.
+* ``queue``: the line is rendered and buffered; the writer thread pays it
+  (and drops lines once the buffer is full, which is counted).
+* ``queue+sampled``: as ``queue`` with ``Listed customers=0.01``.
+
+Measured here with 200us stdout latency: sync ~350-400us, queue ~20us,
+queue+sampled ~9us per request. Rendering dominates what ``queue`` still
+costs, which is why sampling drops events before the timestamp and JSON steps.
+"""
+
+import argparse
+import io
+import sys
+import time
+import uuid
+
+import structlog
+
+from supportdesk.app import logging as app_logging
+from supportdesk.app.config import settings
+
+
+class SlowStdout(io.TextIOBase):
+    """Discard writes after blocking for ``latency`` seconds each."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lines = 0
+
+    def write(self, data: str) -> int:
+        time.sleep(self.latency)
+        self.lines += data.count("\n")
+        return len(data)
+
+
+def run(mode: str, requests: int, latency: float) -> tuple[float, SlowStdout]:
+    sink = SlowStdout(latency)
+    settings.log_queue_enabled = mode != "sync"
+    settings.log_sample_rates = "Listed customers=0.01" if mode == "queue+sampled" else ""
+    real_stdout, sys.stdout = sys.stdout, sink
+    app_logging._writer = None
+    try:
+        app_logging.configure_logging()
+        logger = structlog.get_logger(f"bench.{mode}")
+        tenant_id = str(uuid.uuid4())
+        started = time.perf_counter()
+        for i in range(requests):
+            logger.info(
+                "Listed customers",
+                tenant_id=tenant_id,
+                total=1000,
+                returned=100,
+                skip=0,
+                limit=100,
+                cursor=i > 0,
+                count="exact",
+            )
+        elapsed = time.perf_counter() - started
+        if app_logging._writer is not None:
+            app_logging._writer.close()
+    finally:
+        sys.stdout = real_stdout
+    return elapsed, sink
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--stdout-latency-us", type=float, default=200)
+    args = parser.parse_args()
+
+    latency = args.stdout_latency_us / 1e6
+    for mode in ("sync", "queue", "queue+sampled"):
+        elapsed, sink = run(mode, args.requests, latency)
+        print(
+            f"{mode:>14}: {elapsed / args.requests * 1e6:8.1f} us/request on the caller, "
+            f"{sink.lines} lines written"
+        )
+
+
+if __name__ == "__main__":
+    main()
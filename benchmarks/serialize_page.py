@@ -0,0 +1,116 @@
+"""Compare list-page serialization paths on 100-item customer pages.
+
+Usage::
+
+    python -m benchmarks.serialize_page --pages 2000
+
+``orm`` is the previous path: load ORM entities, ``model_validate`` each row,
+wrap them in ``PaginatedResponse`` and let FastAPI validate and render the
+result against ``response_model``. ``fast`` selects plain columns and runs
+``dump_page``. Both read from the same in-memory SQLite table so the query
+itself is part of the measurement; the script also checks both produce
+byte-identical JSON.
+
+Measured here: ~2.3x end to end over SQLite and ~3.6x for serialization
+alone. The end-to-end gap is narrower only because of SQLite; see ``main``.
+"""
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from supportdesk.app.db.base import Base
+from supportdesk.app.db.models import Customer, Tenant
+from supportdesk.app.db.pagination import schema_columns
+from supportdesk.app.schemas.common import PaginatedResponse, dump_page
+from supportdesk.app.schemas.customer import CustomerResponse
+
+PAGE = 100
+
+
+def _seed(engine) -> None:
+    Base.metadata.create_all(engine)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with Session(engine) as session:
+        tenant = Tenant(id=uuid.uuid4(), name="bench")
+        session.add(tenant)
+        session.flush()
+        session.add_all(
+            Customer(
+                tenant_id=tenant.id,
+                platform="wa",
+                platform_user_id=str(i),
+                phone=f"+1555{i:07d}",
+                email=f"user{i}@example.com",
+                created_at=start + timedelta(seconds=i),
+            )
+            for i in range(PAGE)
+        )
+        session.commit()
+
+
+def fetch_entities(session: Session) -> list[Customer]:
+    customers = session.execute(select(Customer).limit(PAGE)).scalars().all()
+    session.expunge_all()
+    return customers
+
+
+def fetch_rows(session: Session) -> list:
+    return session.execute(select(*schema_columns(Customer, CustomerResponse)).limit(PAGE)).all()
+
+
+def render_orm(customers: list[Customer], response_adapter: TypeAdapter) -> bytes:
+    page = PaginatedResponse.create(
+        items=[CustomerResponse.model_validate(c) for c in customers], total=PAGE, limit=PAGE
+    )
+    # FastAPI re-validates the returned model against response_model, then renders it
+    content = response_adapter.dump_python(response_adapter.validate_python(page), mode="json")
+    return JSONResponse(content).body
+
+
+def render_fast(rows: list) -> bytes:
+    return dump_page(CustomerResponse, items=rows, total=PAGE, limit=PAGE)
+
+
+def _measure(label: str, pages: int, render) -> float:
+    started = time.perf_counter()
+    for _ in range(pages):
+        render()
+    elapsed = time.perf_counter() - started
+    rate = pages * PAGE / elapsed
+    print(f"{label:5} {pages} pages in {elapsed:.2f}s = {rate:,.0f} rows/s")
+    return rate
+
+
+def main(pages: int) -> None:
+    engine = create_engine("sqlite://")
+    _seed(engine)
+    response_adapter = TypeAdapter(PaginatedResponse)
+    with Session(engine) as session:
+        customers, rows = fetch_entities(session), fetch_rows(session)
+        assert render_orm(customers, response_adapter) == render_fast(rows)
+
+        print("query + serialization:")
+        orm = _measure("orm", pages, lambda: render_orm(fetch_entities(session), response_adapter))
+        fast = _measure("fast", pages, lambda: render_fast(fetch_rows(session)))
+        print(f"speedup: {fast / orm:.1f}x")
+
+        # SQLite hands back UUIDs and timestamps as strings that both paths
+        # parse in Python; asyncpg decodes them in C, so this is closer to
+        # what the change saves per request against Postgres.
+        print("serialization of fetched rows:")
+        orm = _measure("orm", pages, lambda: render_orm(customers, response_adapter))
+        fast = _measure("fast", pages, lambda: render_fast(rows))
+        print(f"speedup: {fast / orm:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=2000)
+    main(parser.parse_args().pages)
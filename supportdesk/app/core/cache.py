@@ -0,0 +1,341 @@
+"""Two-tier read-through cache for serialized API entities.
+
+Payloads live in Redis, shared by every worker, with an optional bounded
+in-process tier in front. Invalidations delete the Redis key and are
+published on a pub/sub channel so every worker drops its local copy within
+milliseconds. The local tier is only consulted while this worker is
+subscribed; if the subscription drops, caches fall back to Redis alone and
+are cleared on resubscribe, since invalidations may have been missed.
+
+Every invalidation also bumps a per-key version. A load notes the version
+before it reads the database and only stores its payload if the version is
+unchanged, so a load racing a commit cannot re-cache what the commit replaced.
+"""
+
+import asyncio
+import json
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncContextManager, Awaitable, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..db.listeners import ChangedRow, on_commit
+from ..logging import get_logger
+from .local_cache import LocalCache
+from . import redis_client
+from .redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+CACHE_PREFIX = "supportdesk:cache"
+INVALIDATION_CHANNEL = f"{CACHE_PREFIX}:invalidate"
+
+# Stored in place of a payload to remember that an entity does not exist
+_NEGATIVE = "\x00"
+
+# Cross-worker stampede protection: the first miss takes a short lock and
+# loads; other workers poll for the value instead of hitting Postgres too.
+_LOCK_TTL_MS = 2000
+_LOCK_POLL_SECONDS = 0.025
+_LOCK_POLL_ATTEMPTS = 40
+
+# KEYS: payload, version, lock
+# ARGV: payload, ttl_seconds, version seen before loading ("" for none), "1" to release the lock
+_STORE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[3] then
+  redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+end
+if ARGV[4] == '1' then
+  redis.call('DEL', KEYS[3])
+end
+"""
+
+Loader = Callable[[AsyncSession], Awaitable[Optional[str]]]
+# A session factory, such as an async_sessionmaker
+Sessions = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+@dataclass
+class CacheStats:
+    """Counters for a single cache namespace."""
+
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    errors: int = 0
+
+
+class EntityCache:
+    """Cache JSON payloads of one entity type in Redis.
+
+    Misses are loaded once per key at a time (single-flight within a worker,
+    a Redis lock across workers) and missing entities are cached negatively
+    for a shorter TTL. With ``local`` set, payloads are also kept in this
+    worker's memory.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        negative_ttl_seconds: int,
+        local: Optional[LocalCache] = None,
+    ):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.local = local
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Task[Optional[str]]] = {}
+        _caches[namespace] = self
+
+    def key(self, entity_id: uuid.UUID | str) -> str:
+        return f"{CACHE_PREFIX}:{self.namespace}:{entity_id}"
+
+    async def get_or_load(self, entity_id: uuid.UUID | str, loader: Loader, sessions: Sessions) -> Optional[str]:
+        """Return the cached payload for ``entity_id``, calling ``loader`` on a miss.
+
+        ``loader`` returns the serialized entity, or ``None`` if it does not
+        exist. A load is shared by every request waiting on the key, so it
+        runs in its own session from ``sessions`` rather than the caller's;
+        pass the primary's factory, since whatever it reads is cached for the
+        full TTL. Redis failures fall back to ``loader`` without caching.
+        """
+        key = self.key(entity_id)
+        cached: Optional[str]
+        local = self.local if cache_invalidations.live else None
+        if local is not None:
+            cached = local.get(key)
+            if cached is not None:
+                return None if cached == _NEGATIVE else cached
+            generation = local.generation
+
+        try:
+            redis = await get_redis_client()
+            cached = await redis.get(key)
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Entity cache unavailable", namespace=self.namespace, error=str(e))
+            return await _run(loader, sessions)
+
+        if cached is not None:
+            if local is not None:
+                local.set(key, cached, generation=generation)
+            if cached == _NEGATIVE:
+                self.stats.negative_hits += 1
+                return None
+            self.stats.hits += 1
+            return cached
+
+        self.stats.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, sessions))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        value = await asyncio.shield(task)
+        if local is not None:
+            local.set(key, _NEGATIVE if value is None else value, generation=generation)
+        return value
+
+    async def _load(self, key: str, loader: Loader, sessions: Sessions) -> Optional[str]:
+        redis = await get_redis_client()
+        lock_key = f"{key}:lock"
+        version_key = f"{key}:version"
+        version: Optional[str] = None
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.set(lock_key, "1", nx=True, px=_LOCK_TTL_MS)
+                pipe.get(version_key)
+                locked, version = await pipe.execute()
+            version = version or ""
+            if not locked:
+                for _ in range(_LOCK_POLL_ATTEMPTS):
+                    await asyncio.sleep(_LOCK_POLL_SECONDS)
+                    cached = await redis.get(key)
+                    if cached is not None:
+                        return None if cached == _NEGATIVE else cached
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Entity cache lock failed", namespace=self.namespace, error=str(e))
+            locked = False
+
+        self.stats.loads += 1
+        value = await _run(loader, sessions)
+        if version is None:
+            # Without the version there is no telling whether an invalidation raced the load
+            return value
+        try:
+            store = redis.register_script(_STORE_SCRIPT)
+            await store(
+                keys=[key, version_key, lock_key],
+                args=[
+                    _NEGATIVE if value is None else value,
+                    self.negative_ttl_seconds if value is None else self.ttl_seconds,
+                    version,
+                    "1" if locked else "0",
+                ],
+            )
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Failed to populate entity cache", namespace=self.namespace, error=str(e))
+        return value
+
+    async def invalidate(self, *entity_ids: uuid.UUID | str) -> None:
+        """Drop cached payloads (including negative entries) for ``entity_ids`` in every worker."""
+        if not entity_ids:
+            return
+        keys = [self.key(entity_id) for entity_id in entity_ids]
+        if self.local is not None:
+            self.local.discard(*keys)
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for key in keys:
+                # Loads that started before this invalidation will not store
+                pipe.incr(f"{key}:version")
+                pipe.expire(f"{key}:version", self.ttl_seconds)
+            if self.local is not None:
+                pipe.publish(
+                    INVALIDATION_CHANNEL,
+                    json.dumps({"namespace": self.namespace, "keys": keys}),
+                )
+            await pipe.execute()
+
+    def stats_dict(self) -> dict[str, Any]:
+        stats = asdict(self.stats)
+        if self.local is not None:
+            stats["local"] = self.local.stats_dict()
+        return stats
+
+
+_caches: dict[str, EntityCache] = {}
+
+
+async def _run(loader: Loader, sessions: Sessions) -> Optional[str]:
+    async with sessions() as session:
+        return await loader(session)
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Return hit/miss counters for every entity cache in this worker."""
+    return {namespace: cache.stats_dict() for namespace, cache in _caches.items()}
+
+
+class InvalidationListener:
+    """Apply other workers' invalidations to this worker's local cache tier."""
+
+    def __init__(self, reconnect_seconds: float = 1.0):
+        self.reconnect_seconds = reconnect_seconds
+        self.live = False
+
+    def _clear_local(self) -> None:
+        for cache in _caches.values():
+            if cache.local is not None:
+                cache.local.clear()
+
+    def apply(self, data: str) -> None:
+        try:
+            message = json.loads(data)
+            cache = _caches[message["namespace"]]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation", data=data[:200])
+            return
+        if cache.local is not None:
+            cache.local.discard(*message["keys"])
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Stay subscribed to the invalidation channel until ``stop`` is set."""
+        while not stop.is_set():
+            pubsub = None
+            try:
+                redis = await get_redis_client()
+                pubsub = redis.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._clear_local()
+                self.live = True
+                while not stop.is_set():
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self.apply(message["data"])
+            except redis_client.RedisError as e:
+                logger.warning("Cache invalidation channel lost, local caches off", error=str(e))
+            finally:
+                self.live = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except redis_client.RedisError:
+                        pass
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.reconnect_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+cache_invalidations = InvalidationListener()
+
+
+def _local() -> Optional[LocalCache]:
+    if settings.local_cache_max_bytes <= 0:
+        return None
+    return LocalCache(
+        ttl_seconds=settings.local_cache_ttl_seconds,
+        max_entries=settings.local_cache_max_entries,
+        max_bytes=settings.local_cache_max_bytes,
+    )
+
+
+tenant_cache = EntityCache(
+    "tenant",
+    ttl_seconds=settings.tenant_cache_ttl_seconds,
+    negative_ttl_seconds=settings.cache_negative_ttl_seconds,
+    local=_local(),
+)
+customer_cache = EntityCache(
+    "customer",
+    ttl_seconds=settings.customer_cache_ttl_seconds,
+    negative_ttl_seconds=settings.cache_negative_ttl_seconds,
+    local=_local(),
+)
+# Label vocabulary per tenant, keyed by tenant id
+label_cache = EntityCache(
+    "labels",
+    ttl_seconds=settings.label_cache_ttl_seconds,
+    negative_ttl_seconds=settings.cache_negative_ttl_seconds,
+    local=_local(),
+)
+
+
+@on_commit("tenants")
+async def invalidate_tenants(changes: list[ChangedRow]) -> None:
+    tenant_ids = {row.id for row in changes}
+    await tenant_cache.invalidate(*tenant_ids)
+    # A tenant's vocabulary may be cached as missing from before it existed
+    await label_cache.invalidate(*tenant_ids)
+
+
+@on_commit("customers")
+async def invalidate_customers(changes: list[ChangedRow]) -> None:
+    await customer_cache.invalidate(*{row.id for row in changes})
+
+
+@on_commit("labels")
+async def invalidate_labels(changes: list[ChangedRow]) -> None:
+    await label_cache.invalidate(*{row.tenant_id for row in changes if row.tenant_id is not None})
+
+
+def thread_status_key(thread_id: uuid.UUID | str) -> str:
+    """Redis key of a thread's cached status (see ``services.threads``)."""
+    return f"{CACHE_PREFIX}:thread_status:{thread_id}"
+
+
+@on_commit("threads")
+async def invalidate_thread_statuses(changes: list[ChangedRow]) -> None:
+    stale = [thread_status_key(row.id) for row in changes if row.op != "insert"]
+    if stale:
+        redis = await get_redis_client()
+        await redis.delete(*stale)
@@ -0,0 +1,286 @@
+"""Redis-backed debounce windows for inbound message bursts.
+
+Every thread with an open window is one member of a sorted set scored by the
+window's due time, so tens of thousands of concurrent windows cost one ZSET
+entry each and no timers. Each new message widens the window by the adaptive
+increment, but a window never stays open longer than ``debounce_max_seconds``
+after its first message. Pollers on any number of workers claim due windows
+in batches with an atomic script; claimed windows are leased until acked so a
+crashed worker's windows are picked up again. A window's ``debounce_end``
+event is written before its lease is acked.
+
+Window state lives in one hash next to the two sorted sets, and the scripts
+name all three in ``KEYS``. The ``{debounce}`` hash tag puts them in the
+same Redis Cluster slot.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Sequence
+
+from ..config import settings
+from ..db.models import EventType
+from ..logging import get_logger
+from .event_writer import event_writer
+from . import redis_client
+from .redis_client import get_redis_client
+
+if TYPE_CHECKING:
+    from redis.commands.core import AsyncScript
+
+logger = get_logger(__name__)
+
+DEBOUNCE_PREFIX = "supportdesk:{debounce}"
+DUE_KEY = f"{DEBOUNCE_PREFIX}:due"
+INFLIGHT_KEY = f"{DEBOUNCE_PREFIX}:inflight"
+# Open windows' state by member: "started_ms|window_ms|count"
+WINDOWS_KEY = f"{DEBOUNCE_PREFIX}:windows"
+
+# KEYS: due zset, windows hash
+# ARGV: member, now_ms, default_ms, increment_ms, max_ms
+# Returns 1 when a new window was opened, 0 when an open one was extended.
+_TOUCH_SCRIPT = """
+local now = tonumber(ARGV[2])
+local max_ms = tonumber(ARGV[5])
+local state = redis.call('HGET', KEYS[2], ARGV[1])
+if not state then
+  redis.call('HSET', KEYS[2], ARGV[1], ARGV[2] .. '|' .. ARGV[3] .. '|1')
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+  return 1
+end
+local started, window, count = string.match(state, '^(%d+)|(%d+)|(%d+)$')
+window = math.min(tonumber(window) + tonumber(ARGV[4]), max_ms)
+redis.call('HSET', KEYS[2], ARGV[1], started .. '|' .. window .. '|' .. (tonumber(count) + 1))
+redis.call('ZADD', KEYS[1], math.min(now + window, tonumber(started) + max_ms), ARGV[1])
+return 0
+"""
+
+# KEYS: due zset, inflight zset, windows hash
+# ARGV: now_ms, batch, lease_ms
+# Moves up to ``batch`` due windows (expired leases first) to the inflight set
+# and returns their tokens: "member|started_ms|count|due_ms".
+_CLAIM_SCRIPT = """
+local now = tonumber(ARGV[1])
+local lease_until = now + tonumber(ARGV[3])
+local out = {}
+local stale = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, tonumber(ARGV[2]))
+for _, token in ipairs(stale) do
+  redis.call('ZADD', KEYS[2], lease_until, token)
+  table.insert(out, token)
+end
+local remaining = tonumber(ARGV[2]) - #out
+if remaining > 0 then
+  local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'WITHSCORES', 'LIMIT', 0, remaining)
+  for i = 1, #due, 2 do
+    local member = due[i]
+    local started, count = due[i + 1], 1
+    local state = redis.call('HGET', KEYS[3], member)
+    if state then
+      started, count = string.match(state, '^(%d+)|%d+|(%d+)$')
+    end
+    redis.call('HDEL', KEYS[3], member)
+    redis.call('ZREM', KEYS[1], member)
+    local token = member .. '|' .. started .. '|' .. count .. '|' .. due[i + 1]
+    redis.call('ZADD', KEYS[2], lease_until, token)
+    table.insert(out, token)
+  end
+end
+return out
+"""
+
+
+def _ms_to_datetime(ms: str) -> datetime:
+    return datetime.fromtimestamp(int(float(ms)) / 1000, tz=timezone.utc)
+
+
+@dataclass(frozen=True)
+class ClosedWindow:
+    """A debounce window whose quiet period has elapsed."""
+
+    tenant_id: uuid.UUID
+    thread_id: uuid.UUID
+    started_at: datetime
+    closed_at: datetime
+    messages: int
+    token: str
+
+    @classmethod
+    def from_token(cls, token: str) -> "ClosedWindow":
+        member, started_ms, count, due_ms = token.split("|")
+        tenant_id, thread_id = member.split(":")
+        return cls(
+            tenant_id=uuid.UUID(tenant_id),
+            thread_id=uuid.UUID(thread_id),
+            started_at=_ms_to_datetime(started_ms),
+            closed_at=_ms_to_datetime(due_ms),
+            messages=int(count),
+            token=token,
+        )
+
+
+WindowHandler = Callable[[list[ClosedWindow]], Awaitable[None]]
+
+
+class DebounceEngine:
+    """Open, extend and close per-thread debounce windows."""
+
+    def __init__(
+        self,
+        default_seconds: float,
+        max_seconds: float,
+        increment_seconds: float,
+        *,
+        lease_seconds: float,
+        claim_batch: int,
+        poll_interval_seconds: float,
+    ):
+        self.default_ms = int(default_seconds * 1000)
+        self.max_ms = int(max_seconds * 1000)
+        self.increment_ms = int(increment_seconds * 1000)
+        self.lease_ms = int(lease_seconds * 1000)
+        self.claim_batch = claim_batch
+        self.poll_interval_seconds = poll_interval_seconds
+        self.handlers: list[WindowHandler] = [record_debounce_end]
+        self._scripts_loaded: Optional[tuple["AsyncScript", "AsyncScript"]] = None
+
+    async def _scripts(self) -> tuple["AsyncScript", "AsyncScript"]:
+        """The touch and claim scripts, registered on first use."""
+        if self._scripts_loaded is None:
+            redis = await get_redis_client()
+            self._scripts_loaded = (redis.register_script(_TOUCH_SCRIPT), redis.register_script(_CLAIM_SCRIPT))
+        return self._scripts_loaded
+
+    async def touch_many(
+        self,
+        threads: Sequence[tuple[uuid.UUID, uuid.UUID]],
+        now: Optional[float] = None,
+    ) -> list[tuple[uuid.UUID, uuid.UUID]]:
+        """Register one inbound message per ``(tenant_id, thread_id)`` entry.
+
+        All entries go to Redis in a single pipeline. Returns the threads for
+        which a new window was opened.
+        """
+        if not threads:
+            return []
+        touch, _ = await self._scripts()
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=False) as pipe:
+            for tenant_id, thread_id in threads:
+                member = f"{tenant_id}:{thread_id}"
+                await touch(
+                    keys=[DUE_KEY, WINDOWS_KEY],
+                    args=[member, now_ms, self.default_ms, self.increment_ms, self.max_ms],
+                    client=pipe,
+                )
+            opened = await pipe.execute()
+        return [thread for thread, new in zip(threads, opened, strict=True) if new]
+
+    async def claim_expired(self, now: Optional[float] = None) -> list[ClosedWindow]:
+        """Atomically claim up to ``claim_batch`` windows that are due."""
+        _, claim = await self._scripts()
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        tokens = await claim(
+            keys=[DUE_KEY, INFLIGHT_KEY, WINDOWS_KEY],
+            args=[now_ms, self.claim_batch, self.lease_ms],
+        )
+        return [ClosedWindow.from_token(token) for token in tokens]
+
+    async def ack(self, windows: Sequence[ClosedWindow]) -> None:
+        """Release the leases of windows whose handlers have completed."""
+        if windows:
+            redis = await get_redis_client()
+            await redis.zrem(INFLIGHT_KEY, *(w.token for w in windows))
+
+    async def open_windows(self) -> int:
+        redis = await get_redis_client()
+        return int(await redis.zcard(DUE_KEY))
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Poll for due windows until ``stop`` is set."""
+        logger.info("Debounce poller started")
+        while not stop.is_set():
+            try:
+                windows = await self.claim_expired()
+                if windows:
+                    for handler in self.handlers:
+                        await handler(windows)
+                    await self.ack(windows)
+                if len(windows) == self.claim_batch:
+                    continue  # backlog: claim the next batch right away
+            except Exception as e:
+                # Claimed windows stay leased and are retried once the lease expires
+                logger.error("Debounce poll failed", error=str(e))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("Debounce poller stopped")
+
+
+def record_debounce_start(
+    threads: Sequence[tuple[uuid.UUID, uuid.UUID]], now: Optional[datetime] = None
+) -> None:
+    """Queue ``debounce_start`` events for newly opened windows."""
+    if not threads:
+        return
+    ts = now or datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "thread_id": thread_id,
+            "type": EventType.debounce_start.value,
+            "meta": None,
+            "ts": ts,
+        }
+        for tenant_id, thread_id in threads
+    ]
+    event_writer.emit_many(rows)
+
+
+async def record_debounce_end(windows: list[ClosedWindow]) -> None:
+    """Write ``debounce_end`` events for closed windows; raises if they are not stored.
+
+    Ids derive from the lease token, so a window retried after a failed
+    write or ack does not get a second event.
+    """
+    rows = [
+        {
+            "id": uuid.uuid5(uuid.NAMESPACE_URL, f"{DEBOUNCE_PREFIX}:end:{w.token}"),
+            "tenant_id": w.tenant_id,
+            "thread_id": w.thread_id,
+            "type": EventType.debounce_end.value,
+            "meta": {
+                "messages": w.messages,
+                "started_at": w.started_at.isoformat(),
+                "duration_ms": int((w.closed_at - w.started_at).total_seconds() * 1000),
+            },
+            "ts": w.closed_at,
+        }
+        for w in windows
+    ]
+    await event_writer.write(rows)
+
+
+debounce_engine = DebounceEngine(
+    settings.debounce_default_seconds,
+    settings.debounce_max_seconds,
+    settings.debounce_adaptive_increment,
+    lease_seconds=settings.debounce_lease_seconds,
+    claim_batch=settings.debounce_claim_batch,
+    poll_interval_seconds=settings.debounce_poll_interval_ms / 1000,
+)
+
+
+async def touch_inbound(threads: Sequence[tuple[uuid.UUID, uuid.UUID]]) -> None:
+    """Feed newly stored inbound messages into the debounce engine."""
+    try:
+        opened = await debounce_engine.touch_many(threads)
+    except redis_client.RedisError as e:
+        logger.error("Debounce touch failed", threads=len(threads), error=str(e))
+        return
+    record_debounce_start(opened)
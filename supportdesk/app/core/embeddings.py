@@ -0,0 +1,170 @@
+"""Text embeddings for semantic search, and the worker that fills them in.
+
+Encoders are pluggable: ``settings.embedding_encoder`` is ``hashing`` for the
+built-in ``HashingEncoder`` or ``package.module:factory``, a callable taking
+the dimensions and returning an object with an async ``encode``. Whatever
+the encoder, vectors must be ``EMBEDDING_DIMENSIONS`` wide.
+
+The worker embeds messages and knowledge-base articles that have no
+embedding yet, newest first, one batch per encoder call. Rows are locked
+with ``SKIP LOCKED`` while a batch is encoded so several workers can share
+the backlog.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Protocol, Sequence
+
+from sqlalchemy import ColumnElement, select, update
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ..config import settings
+from ..db.models import KBArticle, Message
+from ..db.session import get_db_session
+from ..db.types import EMBEDDING_DIMENSIONS
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN = re.compile(r"\w+")
+
+
+class Encoder(Protocol):
+    dimensions: int
+
+    async def encode(self, texts: Sequence[str]) -> list[list[float]]: ...
+
+
+class HashingEncoder:
+    """Deterministic bag-of-features embedding; no model, no network.
+
+    Words and their character trigrams are hashed into ``dimensions`` signed
+    buckets and the result is L2-normalized, so cosine similarity tracks
+    shared vocabulary and tolerates typos. It does not know synonyms; it is
+    meant for tests, development and as a fallback, not for relevance.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> list[tuple[str, float]]:
+        features = []
+        for word in _TOKEN.findall(text.lower()):
+            features.append((word, 1.0))
+            padded = f"<{word}>"
+            features.extend((padded[i : i + 3], 0.3) for i in range(len(padded) - 2))
+        # An all-zero vector has no cosine distance to anything
+        return features or [("", 1.0)]
+
+    def encode_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for feature, weight in self._features(text):
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign * weight
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    async def encode(self, texts: Sequence[str]) -> list[list[float]]:
+        return [self.encode_one(text) for text in texts]
+
+
+def load_encoder(spec: str, dimensions: int = EMBEDDING_DIMENSIONS) -> Encoder:
+    """Build the encoder named by ``spec`` (see module docstring)."""
+    if spec == "hashing":
+        encoder: Encoder = HashingEncoder(dimensions)
+    else:
+        module_name, _, attr = spec.partition(":")
+        if not attr:
+            raise ValueError(f"Encoder must be 'hashing' or 'module:factory', got {spec!r}")
+        encoder = getattr(importlib.import_module(module_name), attr)(dimensions)
+    if encoder.dimensions != dimensions:
+        raise ValueError(f"Encoder {spec!r} produces {encoder.dimensions} dimensions, columns hold {dimensions}")
+    return encoder
+
+
+@lru_cache(maxsize=None)
+def get_encoder() -> Encoder:
+    """The configured encoder, built on first use."""
+    return load_encoder(settings.embedding_encoder)
+
+
+def kb_article_text(title: str, body: str) -> str:
+    return f"{title}\n\n{body}"
+
+
+@dataclass
+class EmbeddingWorkerStats:
+    embedded: int = 0
+    batches: int = 0
+    failures: int = 0
+
+
+class EmbeddingWorker:
+    """Embed rows whose ``embedding`` is still NULL."""
+
+    def __init__(self, *, batch_size: int, poll_interval_seconds: float):
+        self.batch_size = batch_size
+        self.poll_interval_seconds = poll_interval_seconds
+        self.stats = EmbeddingWorkerStats()
+
+    async def _embed_batch(
+        self,
+        model: type[Message] | type[KBArticle],
+        columns: Sequence[InstrumentedAttribute[Any]],
+        to_text: Callable[..., str],
+        pending: Sequence[ColumnElement[bool]],
+    ) -> int:
+        async with get_db_session() as session:
+            stmt = (
+                select(model.id, *columns)
+                .where(model.embedding.is_(None), *pending)
+                .order_by(model.created_at.desc())
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return 0
+            vectors = await get_encoder().encode([to_text(*row[1:]) for row in rows])
+            await session.execute(
+                update(model), [{"id": row.id, "embedding": vector} for row, vector in zip(rows, vectors, strict=True)]
+            )
+        return len(rows)
+
+    async def embed_pending(self) -> int:
+        """Embed one batch of messages and one of articles; returns the rows embedded."""
+        embedded = await self._embed_batch(Message, [Message.text], lambda text: text, [Message.text.is_not(None)])
+        embedded += await self._embed_batch(KBArticle, [KBArticle.title, KBArticle.body], kb_article_text, [])
+        if embedded:
+            self.stats.embedded += embedded
+            self.stats.batches += 1
+        return embedded
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Embed until the backlog is empty, then poll, until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                embedded = await self.embed_pending()
+            except Exception as e:
+                self.stats.failures += 1
+                logger.error("Embedding batch failed", error=str(e))
+                embedded = 0
+            if embedded:
+                logger.info("Embedded rows", rows=embedded)
+                continue
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+embedding_worker = EmbeddingWorker(
+    batch_size=settings.embedding_batch_size,
+    poll_interval_seconds=settings.embedding_poll_interval_seconds,
+)
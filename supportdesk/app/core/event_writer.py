@@ -0,0 +1,175 @@
+"""Buffered, batched writer for the events audit log.
+
+Producers call ``emit``/``emit_many``, which only append to an in-memory
+buffer, so hot paths never wait on an audit insert. A background runner
+flushes the buffer when it reaches ``batch_size`` rows or every
+``flush_interval`` seconds, whichever comes first. The buffer is bounded:
+when the database is unavailable for long enough, the oldest events are
+dropped and counted rather than growing memory without limit. A batch the
+database rejects for its content (integrity or data errors) is split until
+the offending rows are isolated; those are logged, counted and dropped so
+they cannot hold up every event behind them.
+"""
+
+import asyncio
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from ..config import settings
+from ..db.bulk import insert_events
+from ..db.models import EventType
+from ..db.session import get_db_session
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class EventWriterStats:
+    emitted: int = 0
+    written: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    flushes: int = 0
+    failures: int = 0
+
+
+class EventWriter:
+    """Collect event rows in memory and insert them in batches."""
+
+    def __init__(self, *, batch_size: int, flush_interval_seconds: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_buffer = max_buffer
+        self.stats = EventWriterStats()
+        self._buffer: list[dict[str, Any]] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def emit(
+        self,
+        tenant_id: uuid.UUID,
+        thread_id: uuid.UUID,
+        type: EventType,
+        meta: Optional[dict[str, Any]] = None,
+        ts: Optional[datetime] = None,
+    ) -> None:
+        """Queue one event; never blocks."""
+        self.emit_many(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "tenant_id": tenant_id,
+                    "thread_id": thread_id,
+                    "type": type.value,
+                    "meta": meta,
+                    "ts": ts or datetime.now(timezone.utc),
+                }
+            ]
+        )
+
+    def emit_many(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Queue ready-made event rows; never blocks."""
+        before = len(self._buffer)
+        self._buffer.extend(rows)
+        self.stats.emitted += len(self._buffer) - before
+        self._trim()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def write(self, rows: list[dict[str, Any]]) -> None:
+        """Queue ``rows`` and flush now, for callers that acknowledge work once its events are stored.
+
+        Rows whose ``id`` is still buffered from an earlier attempt are not
+        queued again. Raises ``RuntimeError`` if any of ``rows`` are still
+        buffered after the flush.
+        """
+        buffered = {row["id"] for row in self._buffer}
+        self.emit_many(row for row in rows if row["id"] not in buffered)
+        await self.flush()
+        ids = {row["id"] for row in rows}
+        pending = sum(row["id"] in ids for row in self._buffer)
+        if pending:
+            raise RuntimeError(f"{pending} events are not written yet")
+
+    def _trim(self) -> None:
+        overflow = len(self._buffer) - self.max_buffer
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.stats.dropped += overflow
+            logger.warning("Event buffer full, dropped oldest events", dropped=overflow)
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        async with self._flush_lock:
+            written = 0
+            while self._buffer:
+                batch = self._buffer[: self.batch_size]
+                del self._buffer[: len(batch)]
+                # Chunks still to insert, last one first
+                pending = [batch]
+                while pending:
+                    chunk = pending.pop()
+                    try:
+                        async with get_db_session() as session:
+                            await insert_events(session, chunk)
+                    except (IntegrityError, DataError) as e:
+                        if len(chunk) > 1:
+                            middle = len(chunk) // 2
+                            pending += [chunk[middle:], chunk[:middle]]
+                            continue
+                        self.stats.rejected += 1
+                        logger.error(
+                            "Event rejected by the database, dropped",
+                            event_id=str(chunk[0].get("id")),
+                            type=chunk[0].get("type"),
+                            error=str(e.orig or e),
+                        )
+                        continue
+                    except Exception as e:
+                        # Put what is left back in front; later events keep their order
+                        unwritten = [row for rows in (chunk, *reversed(pending)) for row in rows]
+                        self._buffer[:0] = unwritten
+                        self._trim()
+                        self.stats.failures += 1
+                        logger.error("Event flush failed", rows=len(unwritten), error=str(e))
+                        return written
+                    written += len(chunk)
+                    self.stats.written += len(chunk)
+                    self.stats.flushes += 1
+            return written
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Flush on size or interval until ``stop`` is set, then flush once more."""
+        stopping = asyncio.ensure_future(stop.wait())
+        try:
+            while not stop.is_set():
+                wakeup = asyncio.ensure_future(self._wakeup.wait())
+                await asyncio.wait(
+                    [wakeup, stopping],
+                    timeout=self.flush_interval_seconds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                wakeup.cancel()
+                self._wakeup.clear()
+                await self.flush()
+        finally:
+            stopping.cancel()
+        await self.flush()
+
+    def stats_dict(self) -> dict[str, int]:
+        return {**asdict(self.stats), "buffered": len(self._buffer)}
+
+
+event_writer = EventWriter(
+    batch_size=settings.event_writer_batch_size,
+    flush_interval_seconds=settings.event_writer_flush_interval_ms / 1000,
+    max_buffer=settings.event_writer_max_buffer,
+)
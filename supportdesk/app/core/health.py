@@ -0,0 +1,117 @@
+"""Background dependency checks backing the readiness probe.
+
+Probes read the latest report instead of touching Postgres and Redis
+themselves, so probe traffic costs one ``SELECT 1`` and one ``PING`` per
+interval per process, whatever the probe rate. Besides reachability the
+report carries check latency and connection pool saturation.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..db.pool import pool_status
+from ..db.session import get_engine
+from ..logging import get_logger
+from .redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class HealthReport:
+    checks: dict[str, dict[str, Any]] = field(default_factory=dict)
+    checked_at: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(check["status"] != "error" for check in self.checks.values())
+
+    def age_seconds(self) -> float:
+        return time.time() - self.checked_at
+
+
+class HealthChecker:
+    """Refresh a ``HealthReport`` every ``interval_seconds``."""
+
+    def __init__(self, *, interval_seconds: float, timeout_seconds: float, pool_saturation_warn: float):
+        self.interval_seconds = interval_seconds
+        self.timeout_seconds = timeout_seconds
+        self.pool_saturation_warn = pool_saturation_warn
+        self.report: Optional[HealthReport] = None
+        self._last_timeouts = 0
+
+    async def _timed(self, name: str, probe: Callable[[], Awaitable[None]]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout_seconds)
+        except Exception as e:
+            logger.error("Health check failed", check=name, error=str(e) or type(e).__name__)
+            return {"status": "error", "error": str(e) or type(e).__name__}
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+    async def _ping_database(self) -> None:
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _ping_redis(self) -> None:
+        redis = await get_redis_client()
+        await redis.ping()
+
+    def _pool(self) -> dict[str, Any]:
+        status = pool_status(get_engine().pool)
+        capacity = status.get("size", 0) + max(status.get("max_overflow", 0), 0)
+        saturation = status.get("in_use", 0) / capacity if capacity else 0.0
+        timeouts = status.get("timeouts", 0)
+        new_timeouts, self._last_timeouts = timeouts - self._last_timeouts, timeouts
+        degraded = saturation >= self.pool_saturation_warn or new_timeouts > 0
+        return {
+            "status": "degraded" if degraded else "ok",
+            "in_use": status.get("in_use"),
+            "capacity": capacity,
+            "saturation": round(saturation, 3),
+            "timeouts_since_last_check": new_timeouts,
+            "wait_seconds_max": status.get("wait_seconds_max"),
+        }
+
+    async def refresh(self) -> HealthReport:
+        # Pool occupancy first, before the database probe checks a connection out
+        pool = self._pool()
+        database, redis = await asyncio.gather(
+            self._timed("database", self._ping_database),
+            self._timed("redis", self._ping_redis),
+        )
+        self.report = HealthReport(
+            checks={"database": database, "redis": redis, "db_pool": pool},
+            checked_at=time.time(),
+        )
+        return self.report
+
+    async def current(self) -> HealthReport:
+        """The latest report, checking now if there is none or it went stale."""
+        if self.report is None or self.report.age_seconds() > 3 * self.interval_seconds:
+            return await self.refresh()
+        return self.report
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Refresh every ``interval_seconds`` until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Health checker failed", error=str(e))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+health_checker = HealthChecker(
+    interval_seconds=settings.health_check_interval_seconds,
+    timeout_seconds=settings.health_check_timeout_seconds,
+    pool_saturation_warn=settings.health_pool_saturation_warn,
+)
@@ -0,0 +1,98 @@
+"""Bounded in-process LRU cache with per-entry TTL.
+
+Used as the first tier in front of Redis for entities every request touches.
+Each cache is bounded both by entry count and by the approximate memory its
+keys and values occupy; least recently used entries are evicted first.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+# Rough per-entry overhead of the OrderedDict slot and the entry tuple
+_ENTRY_OVERHEAD_BYTES = 120
+
+
+@dataclass
+class LocalCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class LocalCache:
+    """LRU of string payloads, bounded by ``max_entries`` and ``max_bytes``."""
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = LocalCacheStats()
+        self.bytes = 0
+        # Bumped on every invalidation; loads started before a bump must not
+        # store what they read, it may predate the invalidated write
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[str, float, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: str, value: str, *, generation: Optional[int] = None) -> None:
+        """Store ``value``, unless invalidated since ``generation`` was read."""
+        if generation is not None and generation != self.generation:
+            return
+        size = sys.getsizeof(key) + sys.getsizeof(value) + _ENTRY_OVERHEAD_BYTES
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def discard(self, *keys: str) -> None:
+        self.generation += 1
+        for key in keys:
+            if key in self._entries:
+                self._remove(key)
+                self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def stats_dict(self) -> dict[str, float]:
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,410 @@
+"""In-process metrics rendered in the Prometheus text format.
+
+``MetricsMiddleware`` records request latency per route template, status and
+tenant. Engine-wide cursor hooks time every SQL statement, labelled by verb
+and table, and add it to the current request's query counter, so each request
+also records how many statements it ran and how long it waited on them.
+
+Metrics are per process: each worker serves its own ``/metrics`` and the
+scraper aggregates. Recording happens on the event loop thread, so series are
+plain lists updated without locks. Every metric caps the number of label sets
+it keeps; anything beyond folds into an ``other`` series, and only the first
+``metrics_max_tenant_labels`` tenants seen get a label of their own.
+"""
+
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+from urllib.parse import parse_qs
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from .query_budget import current_query_counter
+
+OTHER = "other"
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = tuple[str, ...]
+# Counters hold ints, histograms bucket counts followed by a float sum
+Series = list[float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.max_series = settings.metrics_max_series
+        self._series: dict[Labels, Series] = {}
+
+    def _get(self, labels: Labels) -> Series:
+        series = self._series.get(labels)
+        if series is None:
+            if len(self._series) >= self.max_series:
+                labels = (OTHER,) * len(self.labelnames)
+                series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = self._new_series()
+        return series
+
+    @abstractmethod
+    def _new_series(self) -> Series:
+        """A zeroed series for one label set."""
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Exposition lines for every series."""
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._samples()
+
+    def clear(self) -> None:
+        self._series.clear()
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def _new_series(self) -> Series:
+        return [0]
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        self._get(labels)[0] += amount
+
+    def _samples(self) -> Iterable[str]:
+        for labels, (value,) in list(self._series.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], buckets: Sequence[float]):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_series(self) -> Series:
+        # One counter per bucket plus +Inf (not cumulative), then sum and count
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def observe(self, labels: Labels, value: float) -> None:
+        series = self._get(labels)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def _samples(self) -> Iterable[str]:
+        names = self.labelnames + ("le",)
+        for labels, series in list(self._series.items()):
+            cumulative: float = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series[:-2], strict=True):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                yield f"{self.name}_bucket{_format_labels(names, labels + (le,))} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(series[-2])}"
+            yield f"{self.name}_count{label_text} {series[-1]}"
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    """Metrics of this process plus collectors rendered on scrape."""
+
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+
+    def register(self, metric: M) -> M:
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[str]]) -> Callable[[], Iterable[str]]:
+        """Register ``func`` to render extra lines (gauges of live state) on scrape."""
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            lines.extend(collect())
+        return "\n".join(lines) + "\n"
+
+    def clear(self) -> None:
+        for metric in self._metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+http_request_duration = registry.register(
+    Histogram(
+        "supportdesk_http_request_duration_seconds",
+        "HTTP request latency until the last body chunk is sent",
+        ("method", "route", "status", "tenant"),
+        HTTP_BUCKETS,
+    )
+)
+http_request_queries = registry.register(
+    Histogram(
+        "supportdesk_http_request_queries",
+        "SQL statements run per HTTP request",
+        ("method", "route"),
+        QUERY_COUNT_BUCKETS,
+    )
+)
+http_request_db_duration = registry.register(
+    Histogram(
+        "supportdesk_http_request_db_seconds",
+        "Time an HTTP request spent waiting on SQL statements",
+        ("method", "route"),
+        HTTP_BUCKETS,
+    )
+)
+db_query_duration = registry.register(
+    Histogram(
+        "supportdesk_db_query_duration_seconds",
+        "SQL statement latency by verb and table",
+        ("statement",),
+        QUERY_BUCKETS,
+    )
+)
+db_query_errors = registry.register(
+    Counter("supportdesk_db_query_errors_total", "SQL statements that raised", ("statement",))
+)
+ingest_unknown_tenant_messages = registry.register(
+    Counter(
+        "supportdesk_ingest_unknown_tenant_messages_total",
+        "Webhook messages dropped because their tenant does not exist",
+    )
+)
+
+
+class TenantLabels:
+    """Hand out tenant label values, giving only the first ``limit`` tenants their own."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._seen: set[str] = set()
+
+    def label(self, tenant_id: Optional[str]) -> str:
+        if not tenant_id:
+            return "none"
+        if tenant_id in self._seen:
+            return tenant_id
+        if len(self._seen) < self.limit:
+            self._seen.add(tenant_id)
+            return tenant_id
+        return OTHER
+
+
+tenant_labels = TenantLabels(settings.metrics_max_tenant_labels)
+
+_VERBS = frozenset(
+    {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "TRUNCATE", "BEGIN", "COMMIT", "ROLLBACK",
+     "SAVEPOINT", "RELEASE", "CREATE", "ALTER", "DROP", "SET", "SHOW", "LOCK", "VACUUM", "ANALYZE"}
+)
+_TABLE_PATTERNS = {
+    "SELECT": re.compile(r"\bFROM\s+([\w.\"]+)", re.IGNORECASE),
+    "INSERT": re.compile(r"^\s*INSERT\s+INTO\s+([\w.\"]+)", re.IGNORECASE),
+    "UPDATE": re.compile(r"^\s*UPDATE\s+([\w.\"]+)", re.IGNORECASE),
+    "DELETE": re.compile(r"^\s*DELETE\s+FROM\s+([\w.\"]+)", re.IGNORECASE),
+    "COPY": re.compile(r"^\s*COPY\s+([\w.\"]+)", re.IGNORECASE),
+    "TRUNCATE": re.compile(r"^\s*TRUNCATE\s+(?:TABLE\s+)?([\w.\"]+)", re.IGNORECASE),
+}
+
+
+@lru_cache(maxsize=2048)
+def statement_label(statement: str) -> str:
+    """Reduce SQL to ``"VERB table"`` (e.g. ``"SELECT threads"``) for labelling."""
+    match = re.match(r"\s*([A-Za-z]+)", statement)
+    verb = match[1].upper() if match else ""
+    if verb not in _VERBS:
+        return "OTHER"
+    pattern = _TABLE_PATTERNS.get(verb)
+    table = pattern.search(statement) if pattern else None
+    if table is None:
+        return verb
+    name = table[1].replace('"', "").rsplit(".", 1)[-1]
+    return f"{verb} {name}"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    db_query_duration.observe((statement_label(statement),), elapsed)
+    counter = current_query_counter()
+    if counter is not None:
+        counter.db_seconds += elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _record_query_error(context: ExceptionContext) -> None:
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+    if context.statement:
+        db_query_errors.inc((statement_label(context.statement),))
+
+
+def _tenant_id(scope: Scope) -> Optional[str]:
+    tenant_id = scope.get("path_params", {}).get("tenant_id")
+    if tenant_id is None and b"tenant_id=" in scope.get("query_string", b""):
+        tenant_id = parse_qs(scope["query_string"].decode("latin-1")).get("tenant_id", [None])[0]
+    if tenant_id is None:
+        return None
+    try:
+        # Only well-formed ids may take one of the bounded tenant label slots
+        return str(uuid.UUID(str(tenant_id)))
+    except ValueError:
+        return None
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency and SQL usage per HTTP request.
+
+    Routes are labelled by their path template (``/threads/{thread_id}``), and
+    requests no route matched by ``unmatched``, so raw paths never become
+    labels. Must sit inside ``QueryCountMiddleware`` to see the query counter.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", None)
+            method = scope["method"]
+            tenant = tenant_labels.label(_tenant_id(scope) if route else None)
+            route = route or "unmatched"
+            http_request_duration.observe((method, route, str(status), tenant), elapsed)
+            counter = current_query_counter()
+            if counter is not None:
+                http_request_queries.observe((method, route), counter.count)
+                http_request_db_duration.observe((method, route), counter.db_seconds)
+
+
+def _lines(name: str, type: str, help: str, samples: Iterable[tuple[str, float]]) -> Iterable[str]:
+    yield f"# HELP {name} {help}"
+    yield f"# TYPE {name} {type}"
+    for labels, value in samples:
+        yield f"{name}{labels} {_format_value(value)}"
+
+
+@registry.collector
+def _pool_metrics() -> Iterable[str]:
+    from ..db.pool import WAIT_BUCKETS, pool_status
+    from ..db.session import get_engine
+
+    engine = get_engine()
+    status = pool_status(engine.pool)
+    for key in ("size", "in_use", "idle", "overflow"):
+        if key in status:
+            yield from _lines(f"supportdesk_db_pool_{key}", "gauge", f"Connection pool {key}", [("", status[key])])
+    stats = getattr(engine.pool, "stats", None)
+    if stats is None:
+        return
+    for key in ("connects", "checkouts", "checkins", "invalidations", "timeouts"):
+        yield from _lines(
+            f"supportdesk_db_pool_{key}_total", "counter", f"Connection pool {key}", [("", getattr(stats, key))]
+        )
+    name = "supportdesk_db_pool_wait_seconds"
+    yield f"# HELP {name} Time checkouts waited for a connection"
+    yield f"# TYPE {name} histogram"
+    cumulative = 0
+    for bound, n in zip(WAIT_BUCKETS + (float("inf"),), stats.wait_buckets, strict=True):
+        cumulative += n
+        le = "+Inf" if bound == float("inf") else _format_value(bound)
+        yield f'{name}_bucket{{le="{le}"}} {cumulative}'
+    yield f"{name}_sum {_format_value(stats.wait_seconds_total)}"
+    yield f"{name}_count {stats.wait_count}"
+
+
+@registry.collector
+def _cache_metrics() -> Iterable[str]:
+    from .cache import cache_stats
+
+    stats = cache_stats()
+    for key in ("hits", "negative_hits", "misses", "loads", "errors"):
+        yield from _lines(
+            f"supportdesk_cache_{key}_total",
+            "counter",
+            f"Entity cache {key.replace('_', ' ')}",
+            [(_format_labels(("namespace",), (ns,)), counters[key]) for ns, counters in stats.items()],
+        )
+    local = {ns: counters["local"] for ns, counters in stats.items() if "local" in counters}
+    for key in ("hits", "misses", "evictions", "expirations", "invalidations"):
+        yield from _lines(
+            f"supportdesk_local_cache_{key}_total",
+            "counter",
+            f"In-process cache tier {key}",
+            [(_format_labels(("namespace",), (ns,)), counters[key]) for ns, counters in local.items()],
+        )
+    for key in ("entries", "bytes"):
+        yield from _lines(
+            f"supportdesk_local_cache_{key}",
+            "gauge",
+            f"In-process cache tier {key}",
+            [(_format_labels(("namespace",), (ns,)), counters[key]) for ns, counters in local.items()],
+        )
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -0,0 +1,112 @@
+"""Per-request SQL statement counting and query budgets.
+
+``QueryCountMiddleware`` starts a counter for every HTTP request and an
+engine-wide ``before_cursor_execute`` listener increments it for each
+statement the request runs. Routes declare how many statements they may
+issue with ``Depends(query_budget(n))``; going over budget is logged, and
+raises when ``query_budget_strict`` is on (the test suite enables it), so an
+N+1 regression fails tests instead of slowly reaching production. Strict mode
+checks before the response starts, so the client gets a 500 rather than a
+normal response; statements a streamed body runs later can only raise after
+the response has begun.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request ran more SQL statements than its route allows."""
+
+
+@dataclass
+class QueryCounter:
+    count: int = 0
+    budget: Optional[int] = None
+    db_seconds: float = 0.0
+    statements: list[str] = field(default_factory=list)
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    counter = _current.get()
+    if counter is not None:
+        counter.count += 1
+        if settings.query_budget_strict:
+            counter.statements.append(statement)
+
+
+def current_query_counter() -> Optional[QueryCounter]:
+    return _current.get()
+
+
+def current_query_count() -> Optional[int]:
+    counter = _current.get()
+    return counter.count if counter is not None else None
+
+
+def query_budget(max_queries: int) -> Callable[[], Awaitable[None]]:
+    """Dependency declaring the most statements a route may run per request."""
+
+    async def set_budget() -> None:
+        counter = _current.get()
+        if counter is not None:
+            counter.budget = max_queries
+
+    return set_budget
+
+
+def check_budget(counter: QueryCounter, path: str) -> None:
+    if counter.budget is None or counter.count <= counter.budget:
+        return
+    logger.warning("Query budget exceeded", path=path, queries=counter.count, budget=counter.budget)
+    if settings.query_budget_strict:
+        statements = "\n".join(counter.statements)
+        raise QueryBudgetExceeded(
+            f"{path} ran {counter.count} queries, budget is {counter.budget}:\n{statements}"
+        )
+
+
+class QueryCountMiddleware:
+    """ASGI middleware that counts SQL statements per HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        counter = QueryCounter()
+        checked_at: Optional[int] = None
+
+        async def send_checked(message: Message) -> None:
+            nonlocal checked_at
+            if message["type"] == "http.response.start" and settings.query_budget_strict:
+                checked_at = counter.count
+                check_budget(counter, scope["path"])
+            await send(message)
+
+        token = _current.set(counter)
+        try:
+            await self.app(scope, receive, send_checked)
+        finally:
+            _current.reset(token)
+        # Again for statements run after the response started, or the only check when not strict
+        if checked_at is None or counter.count > checked_at:
+            check_budget(counter, scope["path"])
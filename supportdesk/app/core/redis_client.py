@@ -1,21 +1,41 @@
-"""Redis client configuration."""
+"""Redis client configuration.
 
-import redis.asyncio as redis
+redis-py is imported on first use: importing the package takes about a
+tenth of a second (it pulls in its JWT and cryptography support), which
+tests and scripts that never touch Redis should not pay. Its exceptions are
+exposed here lazily; callers write ``except redis_client.RedisError``, an
+attribute that is only looked up while an exception is being handled.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
 
 from ..config import settings
 from ..logging import get_logger
 
+if TYPE_CHECKING:
+    import redis.asyncio as redis
+
 logger = get_logger(__name__)
 
 # Global Redis client instance
-_redis_client: redis.Redis = None
+_redis_client: Optional["redis.Redis"] = None
+
+
+def __getattr__(name: str) -> Any:
+    if name in ("RedisError", "ResponseError"):
+        from redis import exceptions
+
+        return getattr(exceptions, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-async def get_redis_client() -> redis.Redis:
+async def get_redis_client() -> "redis.Redis":
     """Get Redis client instance."""
     global _redis_client
-    
+
     if _redis_client is None:
+        import redis.asyncio as redis
+
         _redis_client = redis.from_url(
             settings.redis_url,
             encoding="utf-8",
@@ -25,15 +45,15 @@ async def get_redis_client() -> redis.Redis:
             retry_on_timeout=True,
         )
         logger.info("Redis client initialized", redis_url=settings.redis_url)
-    
+
     return _redis_client
 
 
 async def close_redis_client() -> None:
     """Close Redis client connection."""
     global _redis_client
-    
+
     if _redis_client:
-        await _redis_client.close()
+        await _redis_client.aclose()
         _redis_client = None
         logger.info("Redis client closed")
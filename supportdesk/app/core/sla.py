@@ -0,0 +1,239 @@
+"""SLA deadline scheduler for acknowledgement and urgent-response timers.
+
+Deadlines live in an in-process timing wheel (O(1) arm/cancel, one check
+per tick regardless of how many threads are open) and are checkpointed to a
+Redis sorted set so they survive restarts. A timer fires only if its Redis
+entry still holds the deadline it was armed with and can be removed, which
+makes firing exactly-once across workers and lets any process cancel a
+deadline with a single ZREM. A wheel entry left behind by a cancel on
+another worker then never fires for a later re-arm. Deadlines whose owning
+worker died are picked up by every worker's periodic sweep once they are
+overdue by more than the grace period.
+"""
+
+import asyncio
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from enum import Enum
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Sequence
+
+from ..config import settings
+from ..db.models import EventType
+from ..logging import get_logger
+from .event_writer import event_writer
+from . import redis_client
+from .redis_client import get_redis_client
+from .timing_wheel import TimingWheel
+
+if TYPE_CHECKING:
+    from redis.commands.core import AsyncScript
+
+logger = get_logger(__name__)
+
+DEADLINES_KEY = "supportdesk:sla:deadlines"
+
+# KEYS: deadlines zset
+# ARGV: member, deadline_ms pairs
+# Removes each member whose stored deadline is still the one given and
+# returns the removed members.
+_CLAIM_SCRIPT = """
+local out = {}
+for i = 1, #ARGV, 2 do
+  local score = redis.call('ZSCORE', KEYS[1], ARGV[i])
+  if score and tonumber(score) == tonumber(ARGV[i + 1]) then
+    redis.call('ZREM', KEYS[1], ARGV[i])
+    table.insert(out, ARGV[i])
+  end
+end
+return out
+"""
+
+
+class SlaKind(str, Enum):
+    ack = "ack"
+    urgent = "urgent"
+
+
+Breach = tuple[SlaKind, uuid.UUID, uuid.UUID, int]  # kind, tenant_id, thread_id, deadline_ms
+BreachHandler = Callable[[list[Breach]], Awaitable[None]]
+
+
+def _member(kind: SlaKind, tenant_id: uuid.UUID, thread_id: uuid.UUID) -> str:
+    return f"{kind.value}|{tenant_id}|{thread_id}"
+
+
+def _parse_member(member: str) -> tuple[SlaKind, uuid.UUID, uuid.UUID]:
+    kind, tenant_id, thread_id = member.split("|")
+    return SlaKind(kind), uuid.UUID(tenant_id), uuid.UUID(thread_id)
+
+
+class SlaScheduler:
+    """Arm, cancel and fire per-thread SLA deadlines."""
+
+    def __init__(
+        self,
+        deadlines: dict[SlaKind, float],
+        *,
+        tick_ms: int,
+        sweep_interval_seconds: float,
+        orphan_grace_seconds: float,
+        sweep_batch: int = 1000,
+    ):
+        self.deadlines_ms = {kind: int(seconds * 1000) for kind, seconds in deadlines.items()}
+        self.wheel = TimingWheel(tick_ms=tick_ms, start_ms=int(time.time() * 1000))
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self.orphan_grace_ms = int(orphan_grace_seconds * 1000)
+        self.sweep_batch = sweep_batch
+        self.handlers: list[BreachHandler] = [record_breaches]
+        self._claim_script: Optional["AsyncScript"] = None
+
+    async def arm_many(self, threads: Sequence[tuple[uuid.UUID, uuid.UUID]], now: Optional[float] = None) -> None:
+        """Start every SLA timer for threads that received an inbound message.
+
+        Timers that are already armed keep their earlier deadline.
+        """
+        if not threads:
+            return
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        members = {}
+        for tenant_id, thread_id in set(threads):
+            for kind, offset_ms in self.deadlines_ms.items():
+                members[_member(kind, tenant_id, thread_id)] = now_ms + offset_ms
+
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(DEADLINES_KEY, members, nx=True)
+            pipe.zmscore(DEADLINES_KEY, list(members))
+            _, stored = await pipe.execute()
+        # Follow Redis: a deadline armed elsewhere, or re-armed after a cancel
+        # this worker did not see, replaces whatever the wheel holds
+        for member, deadline in zip(members, stored, strict=True):
+            if deadline is not None and self.wheel.deadline(member) != int(deadline):
+                self.wheel.schedule(member, int(deadline))
+
+    async def cancel_many(self, threads: Sequence[tuple[uuid.UUID, uuid.UUID]]) -> None:
+        """Stop every SLA timer for threads that received an outbound message."""
+        if not threads:
+            return
+        members = [
+            _member(kind, tenant_id, thread_id)
+            for tenant_id, thread_id in set(threads)
+            for kind in self.deadlines_ms
+        ]
+        redis = await get_redis_client()
+        await redis.zrem(DEADLINES_KEY, *members)
+        for member in members:
+            self.wheel.cancel(member)
+
+    async def _claim(self, expired: Sequence[tuple[str, int]]) -> list[str]:
+        """Remove expired deadlines from Redis; only the ones actually removed may fire.
+
+        A member whose stored deadline differs was cancelled and re-armed
+        since this timer was scheduled, so it stays.
+        """
+        if self._claim_script is None:
+            redis = await get_redis_client()
+            self._claim_script = redis.register_script(_CLAIM_SCRIPT)
+        args = [value for member, deadline_ms in expired for value in (member, deadline_ms)]
+        claimed: list[str] = await self._claim_script(keys=[DEADLINES_KEY], args=args)
+        return claimed
+
+    async def _fire(self, expired: Sequence[tuple[str, int]]) -> None:
+        claimed = set(await self._claim(expired))
+        breaches = [
+            (*_parse_member(member), deadline_ms)
+            for member, deadline_ms in expired
+            if member in claimed
+        ]
+        if not breaches:
+            return
+        for handler in self.handlers:
+            try:
+                await handler(breaches)
+            except Exception as e:
+                logger.error("SLA breach handler failed", handler=handler.__qualname__, error=str(e))
+
+    async def sweep_orphans(self, now: Optional[float] = None) -> int:
+        """Fire overdue deadlines armed by workers that are gone."""
+        now_ms = int((now if now is not None else time.time()) * 1000)
+        redis = await get_redis_client()
+        overdue = await redis.zrangebyscore(
+            DEADLINES_KEY,
+            "-inf",
+            now_ms - self.orphan_grace_ms,
+            start=0,
+            num=self.sweep_batch,
+            withscores=True,
+        )
+        if overdue:
+            await self._fire([(member, int(score)) for member, score in overdue])
+        return len(overdue)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Advance the wheel every tick and sweep for orphans until ``stop`` is set."""
+        logger.info("SLA scheduler started")
+        loop = asyncio.get_running_loop()
+        next_sweep = loop.time()
+        tick_seconds = self.wheel.tick_ms / 1000
+        while not stop.is_set():
+            try:
+                expired = self.wheel.advance(int(time.time() * 1000))
+                if expired:
+                    await self._fire([(str(member), deadline_ms) for member, deadline_ms in expired])
+                if loop.time() >= next_sweep:
+                    next_sweep = loop.time() + self.sweep_interval_seconds
+                    await self.sweep_orphans()
+            except Exception as e:
+                logger.error("SLA scheduler tick failed", error=str(e))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+        logger.info("SLA scheduler stopped", armed=len(self.wheel))
+
+
+async def record_breaches(breaches: list[Breach]) -> None:
+    """Queue one ``sla_breached`` event per breached deadline, with the SLA kind in ``meta``."""
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "thread_id": thread_id,
+            "type": EventType.sla_breached.value,
+            "meta": {"kind": kind.value, "deadline": datetime.fromtimestamp(deadline_ms / 1000, tz=timezone.utc).isoformat()},
+            "ts": datetime.now(timezone.utc),
+        }
+        for kind, tenant_id, thread_id, deadline_ms in breaches
+    ]
+    event_writer.emit_many(rows)
+
+    counts: dict[str, int] = defaultdict(int)
+    for kind, *_ in breaches:
+        counts[kind.value] += 1
+    logger.info("SLA deadlines breached", **counts)
+
+
+sla_scheduler = SlaScheduler(
+    {
+        SlaKind.ack: settings.ack_deadline_seconds,
+        SlaKind.urgent: settings.urgent_response_seconds,
+    },
+    tick_ms=settings.sla_tick_ms,
+    sweep_interval_seconds=settings.sla_sweep_interval_seconds,
+    orphan_grace_seconds=settings.sla_orphan_grace_seconds,
+)
+
+
+async def track_sla(
+    inbound: Sequence[tuple[uuid.UUID, uuid.UUID]],
+    outbound: Sequence[tuple[uuid.UUID, uuid.UUID]],
+) -> None:
+    """Arm deadlines for threads awaiting a reply and cancel them for answered ones."""
+    answered = set(outbound)
+    try:
+        await sla_scheduler.cancel_many(list(answered))
+        await sla_scheduler.arm_many([t for t in inbound if t not in answered])
+    except redis_client.RedisError as e:
+        logger.error("SLA tracking failed", inbound=len(inbound), outbound=len(outbound), error=str(e))
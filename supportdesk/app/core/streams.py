@@ -0,0 +1,125 @@
+"""Redis Stream producer and consumer-group helpers."""
+
+import asyncio
+import os
+import socket
+from typing import Any, Awaitable, Callable
+
+from ..logging import get_logger
+from . import redis_client
+from .redis_client import get_redis_client
+
+logger = get_logger(__name__)
+
+StreamEntry = tuple[str, dict[str, str]]
+
+# Returns the ids of entries that can never be processed, mapped to the reason;
+# they are moved to the dead-letter stream. Raising leaves the whole batch
+# pending so it is retried after ``claim_idle_ms``.
+BatchHandler = Callable[[list[StreamEntry]], Awaitable[dict[str, str]]]
+
+
+def consumer_name() -> str:
+    """Stable-per-process consumer name within a group."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class StreamConsumer:
+    """Drain a Redis Stream in batches as a member of a consumer group."""
+
+    def __init__(
+        self,
+        stream: str,
+        group: str,
+        handler: BatchHandler,
+        *,
+        batch_size: int,
+        block_ms: int,
+        claim_idle_ms: int,
+    ):
+        self.stream = stream
+        self.group = group
+        self.handler = handler
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.consumer = consumer_name()
+        self.dead_letter_stream = f"{stream}:dead"
+
+    async def ensure_group(self) -> None:
+        redis = await get_redis_client()
+        try:
+            await redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except redis_client.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Consume until ``stop`` is set."""
+        await self.ensure_group()
+        logger.info("Stream consumer started", stream=self.stream, consumer=self.consumer)
+        loop = asyncio.get_running_loop()
+        claim_cursor, next_claim = "0-0", 0.0
+        while not stop.is_set():
+            try:
+                # Entries left pending by crashed consumers or failed batches come
+                # first; the pending list is rescanned once per idle period.
+                entries: list[StreamEntry] = []
+                if claim_cursor != "0-0" or loop.time() >= next_claim:
+                    claim_cursor, entries = await self._claim_stale(claim_cursor)
+                    if claim_cursor == "0-0":
+                        next_claim = loop.time() + self.claim_idle_ms / 1000
+                if not entries:
+                    entries = await self._read_new()
+                if entries:
+                    await self._process(entries)
+            except redis_client.RedisError as e:
+                logger.error("Stream consumer Redis error", stream=self.stream, error=str(e))
+                await asyncio.sleep(1)
+        logger.info("Stream consumer stopped", stream=self.stream, consumer=self.consumer)
+
+    async def _claim_stale(self, cursor: str) -> tuple[str, list[StreamEntry]]:
+        redis = await get_redis_client()
+        next_cursor, entries, *_ = await redis.xautoclaim(
+            self.stream,
+            self.group,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            start_id=cursor,
+            count=self.batch_size,
+        )
+        return next_cursor, [(entry_id, fields) for entry_id, fields in entries if fields]
+
+    async def _read_new(self) -> list[StreamEntry]:
+        redis = await get_redis_client()
+        response = await redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=self.block_ms,
+        )
+        return [entry for _, entries in response for entry in entries]
+
+    async def _process(self, entries: list[StreamEntry]) -> None:
+        try:
+            dead = await self.handler(entries)
+        except Exception as e:
+            logger.error(
+                "Stream batch failed; left pending for retry",
+                stream=self.stream,
+                size=len(entries),
+                error=str(e),
+            )
+            return
+
+        redis = await get_redis_client()
+        async with redis.pipeline(transaction=True) as pipe:
+            fields_by_id = dict(entries)
+            for entry_id, reason in dead.items():
+                fields: dict[Any, Any] = {**fields_by_id[entry_id], "error": reason, "source_id": entry_id}
+                pipe.xadd(self.dead_letter_stream, fields)
+            pipe.xack(self.stream, self.group, *fields_by_id)
+            await pipe.execute()
+        if dead:
+            logger.warning("Dead-lettered stream entries", stream=self.stream, count=len(dead))
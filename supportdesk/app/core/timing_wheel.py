@@ -0,0 +1,99 @@
+"""Hierarchical timing wheel."""
+
+from typing import Hashable, Optional
+
+
+class TimingWheel:
+    """Hierarchical timing wheel with O(1) schedule and cancel.
+
+    Level 0 has one slot per tick; each higher level has slots that span a
+    full revolution of the level below and is cascaded down as time reaches
+    it. Deadlines beyond the top level wait in an overflow bucket. ``advance``
+    costs O(elapsed ticks + expired timers); an empty wheel jumps ahead.
+    """
+
+    def __init__(self, tick_ms: int = 100, slots: int = 256, levels: int = 4, start_ms: int = 0):
+        self.tick_ms = tick_ms
+        self.slots = slots
+        self.levels = levels
+        self._tick = start_ms // tick_ms
+        self._wheels: list[list[dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: dict[Hashable, int] = {}
+        self._due: dict[Hashable, int] = {}
+        # key -> the bucket currently holding it, for O(1) cancel
+        self._where: dict[Hashable, dict[Hashable, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, deadline_ms: int) -> None:
+        """Arm (or re-arm) ``key`` to expire at ``deadline_ms``."""
+        self.cancel(key)
+        self._place(key, deadline_ms)
+
+    def deadline(self, key: Hashable) -> Optional[int]:
+        """The deadline ``key`` is armed with, or None."""
+        bucket = self._where.get(key)
+        return None if bucket is None else bucket[key]
+
+    def cancel(self, key: Hashable) -> Optional[int]:
+        """Disarm ``key``; returns its deadline if it was armed."""
+        bucket = self._where.pop(key, None)
+        if bucket is None:
+            return None
+        return bucket.pop(key)
+
+    def advance(self, now_ms: int) -> list[tuple[Hashable, int]]:
+        """Move time forward to ``now_ms`` and return the expired ``(key, deadline_ms)``."""
+        target = now_ms // self.tick_ms
+        expired: list[tuple[Hashable, int]] = []
+        if len(self._due) == len(self._where):
+            self._tick = max(self._tick, target)
+        while self._tick < target:
+            self._tick += 1
+            self._cascade()
+            bucket = self._wheels[0][self._tick % self.slots]
+            if bucket:
+                expired.extend(bucket.items())
+                bucket.clear()
+        # Timers armed in the past, or cascaded down exactly at their deadline
+        expired.extend(self._due.items())
+        self._due.clear()
+        for key, _ in expired:
+            self._where.pop(key, None)
+        return expired
+
+    def _place(self, key: Hashable, deadline_ms: int) -> None:
+        deadline_tick = -(-deadline_ms // self.tick_ms)  # never fire early
+        delta = deadline_tick - self._tick
+        if delta <= 0:
+            bucket = self._due
+        else:
+            bucket = self._overflow
+            for level in range(self.levels):
+                if delta < self.slots ** (level + 1):
+                    bucket = self._wheels[level][(deadline_tick // self.slots**level) % self.slots]
+                    break
+        bucket[key] = deadline_ms
+        self._where[key] = bucket
+
+    def _cascade(self) -> None:
+        """Redistribute higher-level slots whose span starts at the current tick."""
+        span = self.slots ** self.levels
+        if self._tick % span == 0 and self._overflow:
+            self._reinsert(self._overflow)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots**level
+            if self._tick % span == 0:
+                self._reinsert(self._wheels[level][(self._tick // span) % self.slots])
+
+    def _reinsert(self, bucket: dict[Hashable, int]) -> None:
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, deadline_ms in entries:
+            self._place(key, deadline_ms)
@@ -0,0 +1,69 @@
+"""Background worker process.
+
+Run with ``python -m supportdesk.app.core.worker``. Every runner is a
+coroutine taking a stop event; scale out by starting more processes.
+"""
+
+import asyncio
+import signal
+from typing import Any, Callable, Coroutine
+
+from ..db import counting  # noqa: F401  registers the commit hook that drops cached totals
+from ..db.partitions import event_partitions
+from ..db.session import dispose_engine
+from ..logging import configure_logging, flush_logging, get_logger
+from ..services.ingest import ingest_consumer
+from .debounce import debounce_engine
+from .embeddings import embedding_worker
+from .event_writer import event_writer
+from .redis_client import close_redis_client
+from .sla import sla_scheduler
+
+logger = get_logger(__name__)
+
+Runner = Callable[[asyncio.Event], Coroutine[Any, Any, None]]
+
+
+def runners() -> list[Runner]:
+    """Long-running loops hosted by each worker process."""
+    return [
+        ingest_consumer().run,
+        debounce_engine.run,
+        sla_scheduler.run,
+        event_writer.run,
+        event_partitions.run,
+        embedding_worker.run,
+    ]
+
+
+async def run_worker() -> None:
+    """Run all runners until SIGINT/SIGTERM, then shut down cleanly."""
+    configure_logging()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info("Starting SupportDesk worker")
+    tasks = [asyncio.create_task(runner(stop)) for runner in runners()]
+    try:
+        done, _ = await asyncio.wait(
+            [asyncio.create_task(stop.wait()), *tasks],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in done:
+            if task in tasks and task.exception():
+                logger.error("Worker runner crashed", error=str(task.exception()))
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        # Runners may have queued events after the writer's last flush
+        await event_writer.flush()
+        await close_redis_client()
+        await dispose_engine()
+        logger.info("SupportDesk worker stopped")
+        flush_logging()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
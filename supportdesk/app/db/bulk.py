@@ -0,0 +1,223 @@
+"""Bulk writers for high-volume tables.
+
+Small batches go through a multi-row ``INSERT ... ON CONFLICT DO NOTHING``.
+Large ones are streamed with asyncpg's binary COPY into a per-connection
+temporary staging table and merged with a single ``INSERT ... SELECT ... ON
+CONFLICT DO NOTHING``, which avoids statement compilation, bind parameter
+limits and per-row round trips. Merged rows are sorted by the conflict key
+so concurrent writers take index locks in the same order.
+
+COPY runs on the raw asyncpg connection, so its errors do not pass through
+SQLAlchemy. Rejected rows (SQLSTATE classes 22 and 23) are re-raised as
+``DataError`` and ``IntegrityError``, the same as on the ``INSERT`` path.
+"""
+
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from sqlalchemy import JSON, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.elements import KeyedColumnElement
+
+from ..config import settings
+from .base import AnyRow, Base
+from .listeners import ChangedRow, record_changes
+from .models import Event, Message
+
+MESSAGE_COLUMNS = (
+    "id", "tenant_id", "thread_id", "platform_message_id", "direction", "text", "media", "language", "sent_at"
+)
+EVENT_COLUMNS = ("id", "tenant_id", "thread_id", "type", "meta", "ts")
+MESSAGE_CONFLICT_KEY = ("tenant_id", "platform_message_id")
+EVENT_CONFLICT_KEY = ("id", "ts")
+
+# SQLSTATE class of a COPY error -> the exception the INSERT path would raise
+_COPY_ERRORS = {"22": DataError, "23": IntegrityError}
+
+
+@dataclass
+class BulkResult:
+    """Outcome of a bulk insert."""
+
+    inserted: int = 0
+    duplicates: int = 0
+    # RETURNING rows for the inserted messages, when requested; they also carry id and tenant_id
+    rows: list[AnyRow] = field(default_factory=list)
+
+
+def _chunks(rows: Sequence[dict[str, Any]], size: int) -> Iterator[Sequence[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _records(
+    columns: Sequence[KeyedColumnElement[Any]],
+    rows: Iterable[dict[str, Any]],
+    defaults: Optional[dict[str, Callable[[], Any]]] = None,
+) -> list[tuple[Any, ...]]:
+    """Turn row dicts into COPY records in ``columns`` order.
+
+    COPY bypasses both ORM and server defaults for listed columns, so missing
+    values are filled from ``defaults``; asyncpg expects JSON already encoded.
+    """
+    defaults = {"id": uuid.uuid4, **(defaults or {})}
+    encode = [isinstance(c.type, JSON) for c in columns]
+    records = []
+    for row in rows:
+        values: list[Any] = []
+        for col, is_json in zip(columns, encode, strict=True):
+            value = row.get(col.key)
+            if value is None and col.key in defaults:
+                value = defaults[col.key]()
+            elif value is not None and is_json:
+                value = json.dumps(value)
+            values.append(value)
+        records.append(tuple(values))
+    return records
+
+
+async def _driver_connection(session: AsyncSession) -> Any:
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _copy_records(
+    session: AsyncSession, table_name: str, columns: Sequence[str], records: list[tuple[Any, ...]]
+) -> None:
+    driver = await _driver_connection(session)
+    try:
+        await driver.copy_records_to_table(table_name, records=records, columns=list(columns))
+    except Exception as e:
+        error = _COPY_ERRORS.get(str(getattr(e, "sqlstate", ""))[:2])
+        if error is None:
+            raise
+        raise error(f"COPY {table_name}", None, e) from e
+
+
+async def insert_messages(
+    session: AsyncSession,
+    rows: Sequence[dict[str, Any]],
+    *,
+    returning: Sequence[InstrumentedAttribute[Any]] = (),
+) -> BulkResult:
+    """Insert messages, skipping ones whose platform id is already stored.
+
+    Duplicates within ``rows`` count as duplicates too. Nothing is committed;
+    the caller owns the transaction, and its commit hooks see the inserted
+    messages.
+    """
+    result = BulkResult()
+    names = {c.key for c in returning}
+    tracked = [*returning, *(c for c in (Message.id, Message.tenant_id) if c.key not in names)]
+    for chunk in _chunks(rows, settings.bulk_copy_chunk_rows):
+        if len(chunk) < settings.bulk_copy_min_rows:
+            inserted = await _insert_messages_values(session, chunk, tracked)
+        else:
+            inserted = await _insert_messages_copy(session, chunk, tracked)
+        record_changes(session, (ChangedRow("messages", row.id, row.tenant_id, "insert") for row in inserted))
+        result.inserted += len(inserted)
+        result.duplicates += len(chunk) - len(inserted)
+        if returning:
+            result.rows.extend(inserted)
+    return result
+
+
+async def _insert_messages_values(
+    session: AsyncSession, rows: Sequence[dict[str, Any]], returning: Sequence[InstrumentedAttribute[Any]]
+) -> list[AnyRow]:
+    values = [{name: row.get(name) for name in MESSAGE_COLUMNS} for row in rows]
+    for value in values:
+        if value["id"] is None:
+            value["id"] = uuid.uuid4()
+    return await _insert_values(session, Message, values, MESSAGE_CONFLICT_KEY, returning)
+
+
+async def _insert_messages_copy(
+    session: AsyncSession, rows: Sequence[dict[str, Any]], returning: Sequence[InstrumentedAttribute[Any]]
+) -> list[AnyRow]:
+    columns = [Message.__table__.c[name] for name in MESSAGE_COLUMNS]
+    return await _copy_merge(
+        session, Message, MESSAGE_COLUMNS, _records(columns, rows), MESSAGE_CONFLICT_KEY, returning
+    )
+
+
+async def _insert_values(
+    session: AsyncSession,
+    model: type[Base],
+    values: list[dict[str, Any]],
+    conflict_key: Sequence[str],
+    returning: Sequence[InstrumentedAttribute[Any]],
+) -> list[AnyRow]:
+    values.sort(key=lambda v: tuple(str(v[name]) for name in conflict_key))
+    stmt = (
+        insert(model)
+        .values(values)
+        .on_conflict_do_nothing(index_elements=list(conflict_key))
+        .returning(*returning)
+    )
+    return list((await session.execute(stmt)).all())
+
+
+async def _copy_merge(
+    session: AsyncSession,
+    model: type[Base],
+    columns: Sequence[str],
+    records: list[tuple[Any, ...]],
+    conflict_key: Sequence[str],
+    returning: Sequence[InstrumentedAttribute[Any]],
+) -> list[AnyRow]:
+    stage_name = f"_stage_{model.__tablename__}"
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {stage_name} "
+            f"(LIKE {model.__tablename__} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+    )
+    await _copy_records(session, stage_name, columns, records)
+
+    stage = table(stage_name, *(column(name) for name in columns))
+    stmt = (
+        insert(model)
+        .from_select(list(columns), select(*stage.c).order_by(*(stage.c[name] for name in conflict_key)))
+        .on_conflict_do_nothing(index_elements=list(conflict_key))
+        .returning(*returning)
+    )
+    inserted = list((await session.execute(stmt)).all())
+    # Staging rows would otherwise linger until commit and be merged again
+    await session.execute(text(f"TRUNCATE {stage_name}"))
+    return inserted
+
+
+async def insert_events(session: AsyncSession, rows: Sequence[dict[str, Any]]) -> int:
+    """Append events, skipping ones whose ``(id, ts)`` is already stored.
+
+    Rows without an ``id`` or ``ts`` are given one in place, so a retried row
+    is recognised as stored. Returns the number of rows inserted.
+    """
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        if row.get("id") is None:
+            row["id"] = uuid.uuid4()
+        if row.get("ts") is None:
+            row["ts"] = now
+    columns = [Event.__table__.c[name] for name in EVENT_COLUMNS]
+    returning = [Event.id, Event.tenant_id]
+    inserted = 0
+    for chunk in _chunks(rows, settings.bulk_copy_chunk_rows):
+        if len(chunk) < settings.bulk_copy_min_rows:
+            values = [{name: row.get(name) for name in EVENT_COLUMNS} for row in chunk]
+            written = await _insert_values(session, Event, values, EVENT_CONFLICT_KEY, returning)
+        else:
+            written = await _copy_merge(
+                session, Event, EVENT_COLUMNS, _records(columns, chunk), EVENT_CONFLICT_KEY, returning
+            )
+        record_changes(session, (ChangedRow("events", row.id, row.tenant_id, "insert") for row in written))
+        inserted += len(written)
+    return inserted
@@ -0,0 +1,171 @@
+"""Total-count strategies for paginated list endpoints."""
+
+import json
+import uuid
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..core import redis_client
+from ..core.redis_client import get_redis_client
+from ..logging import get_logger
+from ..schemas.common import CountStrategy
+from .base import AnySelect
+from .listeners import ChangedRow, on_commit
+from .replicas import REPLICA_INFO_KEY
+from .session import get_sessionmaker
+
+logger = get_logger(__name__)
+
+COUNT_CACHE_PREFIX = "supportdesk:counts"
+
+# KEYS: totals hash, version
+# ARGV: field, total, ttl_seconds, version seen before counting ("" for none)
+# The TTL is set once per hash so entries cannot outlive it by being refreshed.
+_STORE_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[4] then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if redis.call('TTL', KEYS[1]) < 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+return 1
+"""
+
+
+def _cache_key(table: str, tenant_id: Optional[uuid.UUID]) -> str:
+    return f"{COUNT_CACHE_PREFIX}:{table}:{tenant_id or 'all'}"
+
+
+def _version_key(key: str) -> str:
+    return f"{key}:version"
+
+
+async def _drop(keys: set[str]) -> None:
+    redis = await get_redis_client()
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.delete(*keys)
+        for key in keys:
+            pipe.incr(_version_key(key))
+            pipe.expire(_version_key(key), settings.count_cache_ttl_seconds)
+        await pipe.execute()
+
+
+async def count_total(
+    db: AsyncSession,
+    stmt: AnySelect,
+    strategy: CountStrategy,
+    *,
+    table: str,
+    tenant_id: Optional[uuid.UUID] = None,
+    filters: Optional[dict[str, object]] = None,
+) -> Optional[int]:
+    """Compute the total number of rows matched by ``stmt`` using ``strategy``.
+
+    ``tenant_id`` and ``filters`` identify the cached entry for
+    ``CountStrategy.cached``; they must describe every filter applied to
+    ``stmt``. Returns ``None`` for ``CountStrategy.none``.
+    """
+    if strategy is CountStrategy.none:
+        return None
+    if strategy is CountStrategy.estimated and db.get_bind().dialect.name == "postgresql":
+        return await _estimated_count(db, stmt, table)
+    if strategy is CountStrategy.cached:
+        return await _cached_count(db, stmt, table, tenant_id, filters or {})
+    return await _exact_count(db, stmt)
+
+
+async def _exact_count(db: AsyncSession, stmt: AnySelect) -> int:
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    result = await db.execute(count_stmt)
+    return result.scalar() or 0
+
+
+async def _estimated_count(db: AsyncSession, stmt: AnySelect, table: str) -> int:
+    if stmt.whereclause is None:
+        result = await db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+            {"table": table},
+        )
+        estimate: Optional[int] = result.scalar()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if estimate is not None and estimate >= 0:
+            return estimate
+
+    compiled = stmt.order_by(None).compile(
+        dialect=db.get_bind().dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    conn = await db.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan: Any = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _cached_count(
+    db: AsyncSession,
+    stmt: AnySelect,
+    table: str,
+    tenant_id: Optional[uuid.UUID],
+    filters: dict[str, object],
+) -> int:
+    key = _cache_key(table, tenant_id)
+    field = "&".join(f"{k}={v}" for k, v in sorted(filters.items()) if v is not None) or "-"
+
+    try:
+        redis = await get_redis_client()
+        # The version moves on every invalidation; a count that straddles one is not stored
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hget(key, field)
+            pipe.get(_version_key(key))
+            cached, version = await pipe.execute()
+        if cached is not None:
+            return int(cached)
+    except redis_client.RedisError as e:
+        logger.warning("Count cache unavailable", table=table, error=str(e))
+        return await _exact_count(db, stmt)
+
+    if REPLICA_INFO_KEY in db.info:
+        # A lagging replica could cache a total from before a write whose
+        # commit already invalidated this entry, so misses count on the primary
+        async with get_sessionmaker()() as primary:
+            total = await _exact_count(primary, stmt)
+    else:
+        total = await _exact_count(db, stmt)
+    try:
+        store = redis.register_script(_STORE_SCRIPT)
+        await store(
+            keys=[key, _version_key(key)],
+            args=[field, total, settings.count_cache_ttl_seconds, version or ""],
+        )
+    except redis_client.RedisError as e:
+        logger.warning("Failed to cache count", table=table, error=str(e))
+    return total
+
+
+COUNTED_TABLES = ("customers", "tenants", "threads", "messages", "events")
+
+
+@on_commit(*COUNTED_TABLES)
+async def invalidate_counts(changes: list[ChangedRow]) -> None:
+    """Drop cached totals for every tenant (and the unscoped listing) touched by a write."""
+    keys = set()
+    for row in changes:
+        keys.add(_cache_key(row.table, row.tenant_id))
+        keys.add(_cache_key(row.table, None))
+    await _drop(keys)
+
+
+async def drop_cached_counts(table: str, tenant_ids: Iterable[uuid.UUID]) -> None:
+    """Drop cached totals of ``table`` for ``tenant_ids`` and the unscoped listing.
+
+    Writes through a session reach ``invalidate_counts`` when they commit;
+    loaders that bypass it, like a raw COPY, call this once they are done.
+    """
+    keys = {_cache_key(table, None), *(_cache_key(table, tenant_id) for tenant_id in tenant_ids)}
+    await _drop(keys)
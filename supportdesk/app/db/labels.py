@@ -0,0 +1,45 @@
+"""Thread label filters and counts."""
+
+import json
+import uuid
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Boolean, ColumnElement, SQLColumnExpression, String, and_, cast, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import ThreadLabelCount
+
+
+def labels_contain(column: SQLColumnExpression[Any], labels: Sequence[str], dialect: str) -> ColumnElement[bool]:
+    """Match rows whose JSON array ``column`` holds every one of ``labels``.
+
+    On Postgres this is JSONB containment (``labels @> '["refund"]'``), which
+    the ``jsonb_path_ops`` GIN index serves; other dialects (SQLite in tests)
+    look each label up with ``json_each``.
+    """
+    labels = sorted(set(labels))
+    if dialect == "postgresql":
+        # A string cast rather than a JSONB bind so the estimated count's
+        # literal-bound EXPLAIN can render it
+        return column.op("@>", return_type=Boolean)(cast(literal(json.dumps(labels), String), JSONB))
+    conditions = []
+    for label in labels:
+        elements = func.json_each(column).table_valued("value")
+        conditions.append(exists(select(1).select_from(elements).where(elements.c.value == label)))
+    return and_(*conditions)
+
+
+async def label_counts(
+    session: AsyncSession, tenant_id: uuid.UUID, status: Optional[str] = None
+) -> dict[str, dict[str, int]]:
+    """``{label: {status: count}}`` for a tenant's threads, read from the counts table."""
+    stmt = select(ThreadLabelCount.label, ThreadLabelCount.status, ThreadLabelCount.count).where(
+        ThreadLabelCount.tenant_id == tenant_id, ThreadLabelCount.count > 0
+    )
+    if status is not None:
+        stmt = stmt.where(ThreadLabelCount.status == status)
+    counts: dict[str, dict[str, int]] = {}
+    for label, row_status, count in await session.execute(stmt.order_by(ThreadLabelCount.label)):
+        counts.setdefault(label, {})[row_status] = count
+    return counts
@@ -0,0 +1,103 @@
+"""ORM change tracking and post-commit hooks.
+
+Flushed inserts, updates and deletes are recorded on the session and handed
+to async hooks (cache invalidation and the like) once the transaction has
+committed, so hooks never observe changes that were rolled back.
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, UOWTransaction
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+_CHANGES_KEY = "supportdesk_changes"
+
+
+@dataclass(frozen=True)
+class ChangedRow:
+    """A row touched by a committed flush."""
+
+    table: str
+    id: uuid.UUID
+    tenant_id: Optional[uuid.UUID]
+    op: str  # "insert", "update" or "delete"
+
+
+CommitHook = Callable[[list[ChangedRow]], Awaitable[None]]
+
+_hooks: dict[str, list[CommitHook]] = defaultdict(list)
+
+
+def on_commit(*tables: str) -> Callable[[CommitHook], CommitHook]:
+    """Register an async hook called with the committed changes to ``tables``."""
+
+    def decorator(hook: CommitHook) -> CommitHook:
+        for table in tables:
+            _hooks[table].append(hook)
+        return hook
+
+    return decorator
+
+
+def _changed_row(obj: Any, op: str) -> Optional[ChangedRow]:
+    table = getattr(obj, "__tablename__", None)
+    if table is None or table not in _hooks:
+        return None
+    tenant_id = obj.id if table == "tenants" else getattr(obj, "tenant_id", None)
+    return ChangedRow(table=table, id=obj.id, tenant_id=tenant_id, op=op)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session: Session, flush_context: UOWTransaction) -> None:
+    changes = session.info.setdefault(_CHANGES_KEY, [])
+    for objects, op in (
+        (session.new, "insert"),
+        (session.dirty, "update"),
+        (session.deleted, "delete"),
+    ):
+        for obj in objects:
+            row = _changed_row(obj, op)
+            if row is not None:
+                changes.append(row)
+
+
+def record_changes(session: AsyncSession, rows: Iterable[ChangedRow]) -> None:
+    """Hand rows written with Core statements to the commit hooks.
+
+    ``after_flush`` only sees ORM objects, so bulk inserts and upserts call
+    this; their rows are then dropped on rollback like flushed ones.
+    """
+    changes = session.sync_session.info.setdefault(_CHANGES_KEY, [])
+    changes.extend(row for row in rows if row.table in _hooks)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop(_CHANGES_KEY, None)
+
+
+async def run_commit_hooks(session: AsyncSession) -> None:
+    """Run registered hooks for changes committed through ``session``."""
+    changes = session.sync_session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+
+    by_hook: dict[CommitHook, list[ChangedRow]] = defaultdict(list)
+    for row in changes:
+        for hook in _hooks[row.table]:
+            by_hook[hook].append(row)
+
+    for hook, rows in by_hook.items():
+        try:
+            await hook(rows)
+        except Exception as e:
+            # The data is committed; a failed hook must not fail the request
+            logger.error("Commit hook failed", hook=hook.__qualname__, error=str(e))
@@ -0,0 +1,85 @@
+"""thread labels GIN index and label counts
+
+Revision ID: 0e65ea5ae781
+Revises: 359c447c837e
+Create Date: 2026-10-18 17:20:41.302118+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0e65ea5ae781"
+down_revision = "359c447c837e"
+branch_labels = None
+depends_on = None
+
+
+# Labels are visited in order so concurrent writers lock count rows in the
+# same order and cannot deadlock each other.
+COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION threads_label_counts() RETURNS trigger AS $$
+DECLARE
+    lbl text;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND jsonb_typeof(OLD.labels) = 'array' THEN
+        FOR lbl IN SELECT DISTINCT value FROM jsonb_array_elements_text(OLD.labels) ORDER BY 1 LOOP
+            UPDATE thread_label_counts SET count = count - 1
+            WHERE tenant_id = OLD.tenant_id AND label = lbl AND status = OLD.status;
+        END LOOP;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND jsonb_typeof(NEW.labels) = 'array' THEN
+        FOR lbl IN SELECT DISTINCT value FROM jsonb_array_elements_text(NEW.labels) ORDER BY 1 LOOP
+            INSERT INTO thread_label_counts (tenant_id, label, status, count)
+            VALUES (NEW.tenant_id, lbl, NEW.status, 1)
+            ON CONFLICT (tenant_id, label, status)
+            DO UPDATE SET count = thread_label_counts.count + 1;
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.create_table('thread_label_counts',
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('label', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('tenant_id', 'label', 'status')
+    )
+    op.execute(COUNT_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER threads_label_counts AFTER INSERT OR DELETE ON threads "
+        "FOR EACH ROW EXECUTE FUNCTION threads_label_counts()"
+    )
+    op.execute(
+        "CREATE TRIGGER threads_label_counts_update AFTER UPDATE OF labels, status, tenant_id ON threads "
+        "FOR EACH ROW WHEN (OLD.labels IS DISTINCT FROM NEW.labels OR OLD.status IS DISTINCT FROM NEW.status "
+        "OR OLD.tenant_id IS DISTINCT FROM NEW.tenant_id) EXECUTE FUNCTION threads_label_counts()"
+    )
+    # CREATE TRIGGER locks out thread writes until this transaction commits,
+    # so the backfill and the triggers see exactly the same rows
+    op.execute(
+        "INSERT INTO thread_label_counts (tenant_id, label, status, count) "
+        "SELECT t.tenant_id, l.label, t.status, count(*) FROM threads t "
+        "CROSS JOIN LATERAL (SELECT DISTINCT value AS label FROM jsonb_array_elements_text(t.labels)) l "
+        "WHERE jsonb_typeof(t.labels) = 'array' "
+        "GROUP BY t.tenant_id, l.label, t.status"
+    )
+
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('ix_threads_labels', 'threads', ['labels'], unique=False, postgresql_using='gin', postgresql_ops={'labels': 'jsonb_path_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_threads_labels', table_name='threads', postgresql_concurrently=True, if_exists=True)
+    op.execute("DROP TRIGGER IF EXISTS threads_label_counts_update ON threads")
+    op.execute("DROP TRIGGER IF EXISTS threads_label_counts ON threads")
+    op.execute("DROP FUNCTION IF EXISTS threads_label_counts()")
+    op.drop_table('thread_label_counts')
@@ -0,0 +1,29 @@
+"""keyset pagination indexes
+
+Revision ID: 167dd3cdb2b5
+Revises: 9313649660af
+Create Date: 2026-10-18 09:12:41.204113+00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "167dd3cdb2b5"
+down_revision = "9313649660af"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('ix_customers_tenant_id_created_at_id', 'customers', ['tenant_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_customers_created_at_id', 'customers', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tenants_created_at_id', 'tenants', ['created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tenants_created_at_id', table_name='tenants', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_customers_created_at_id', table_name='customers', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_customers_tenant_id_created_at_id', table_name='customers', postgresql_concurrently=True, if_exists=True)
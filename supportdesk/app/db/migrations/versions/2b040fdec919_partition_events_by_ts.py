@@ -0,0 +1,91 @@
+"""partition events by ts
+
+Revision ID: 2b040fdec919
+Revises: 167dd3cdb2b5
+Create Date: 2026-10-18 16:05:37.518202+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "2b040fdec919"
+down_revision = "167dd3cdb2b5"
+branch_labels = None
+depends_on = None
+
+COLUMNS = "tenant_id, thread_id, type, meta, ts, id"
+
+
+def _event_columns() -> list[sa.schema.SchemaItem]:
+    return [
+        sa.Column('tenant_id', sa.UUID(), nullable=False),
+        sa.Column('thread_id', sa.UUID(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('meta', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('ts', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['thread_id'], ['threads.id'], ondelete='CASCADE'),
+    ]
+
+
+def upgrade() -> None:
+    op.rename_table('events', 'events_unpartitioned')
+    op.execute("ALTER INDEX events_pkey RENAME TO events_unpartitioned_pkey")
+
+    # The partition key must be part of every unique constraint
+    op.create_table(
+        'events',
+        *_event_columns(),
+        sa.PrimaryKeyConstraint('id', 'ts'),
+        postgresql_partition_by='RANGE (ts)',
+    )
+
+    # One UTC month per partition, from the oldest existing event to two
+    # months ahead; the worker keeps creating them from there on.
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            month timestamp := date_trunc('month', coalesce(
+                (SELECT min(ts) FROM events_unpartitioned), now()) AT TIME ZONE 'UTC');
+            last_month timestamp := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '2 months';
+        BEGIN
+            WHILE month <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF events FOR VALUES FROM (%L) TO (%L)',
+                    'events_p' || to_char(month, 'YYYYMM'),
+                    month AT TIME ZONE 'UTC',
+                    (month + interval '1 month') AT TIME ZONE 'UTC'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM events_unpartitioned")
+    op.drop_table('events_unpartitioned')
+
+    # Indexes are built after the copy; on the parent they cascade to every partition
+    op.create_index('ix_events_tenant_id_ts', 'events', ['tenant_id', 'ts'], unique=False)
+    op.create_index('ix_events_thread_id_ts', 'events', ['thread_id', 'ts'], unique=False)
+
+
+def downgrade() -> None:
+    # Partitions that were already detached are left in place as plain tables
+    op.create_table(
+        'events_unpartitioned',
+        *_event_columns(),
+        sa.PrimaryKeyConstraint('id', name='events_unpartitioned_pkey'),
+    )
+    op.execute(f"INSERT INTO events_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM events")
+    op.drop_table('events')
+
+    op.rename_table('events_unpartitioned', 'events')
+    op.execute("ALTER INDEX events_unpartitioned_pkey RENAME TO events_pkey")
+    op.create_index(op.f('ix_events_tenant_id'), 'events', ['tenant_id'], unique=False)
+    op.create_index(op.f('ix_events_thread_id'), 'events', ['thread_id'], unique=False)
@@ -0,0 +1,29 @@
+"""thread and message listing indexes
+
+Revision ID: 359c447c837e
+Revises: 2b040fdec919
+Create Date: 2026-10-18 16:48:12.730511+00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "359c447c837e"
+down_revision = "2b040fdec919"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('ix_threads_tenant_id_created_at_id', 'threads', ['tenant_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_messages_tenant_id_created_at_id', 'messages', ['tenant_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_messages_thread_id_created_at_id', 'messages', ['thread_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_thread_id_created_at_id', table_name='messages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_messages_tenant_id_created_at_id', table_name='messages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_threads_tenant_id_created_at_id', table_name='threads', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,24 @@
+"""message platform sent_at
+
+Revision ID: 4c9e1f7a2b60
+Revises: d27b5e9a4c13
+Create Date: 2026-10-18 21:14:07.518734+00:00
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4c9e1f7a2b60"
+down_revision = "d27b5e9a4c13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without a default: a catalog-only change, no table rewrite
+    op.add_column("messages", sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("messages", "sent_at")
@@ -0,0 +1,56 @@
+"""message embeddings and knowledge-base articles
+
+Revision ID: 6c0d8e3b1f27
+Revises: a41f7c2d9e58
+Create Date: 2026-10-18 19:12:04.561893+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from supportdesk.app.db.types import Vector
+
+# revision identifiers, used by Alembic.
+revision = "6c0d8e3b1f27"
+down_revision = "a41f7c2d9e58"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table('kb_articles',
+    sa.Column('tenant_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('url', sa.String(length=2048), nullable=True),
+    sa.Column('embedding', Vector(384), nullable=True),
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_kb_articles_tenant_id'), 'kb_articles', ['tenant_id'], unique=False)
+    op.create_index('ix_kb_articles_embedding_pending', 'kb_articles', ['created_at'], unique=False, postgresql_where=sa.text('embedding IS NULL'))
+    op.create_index('ix_kb_articles_embedding_hnsw', 'kb_articles', ['embedding'], unique=False, postgresql_using='hnsw', postgresql_with={'m': 16, 'ef_construction': 64}, postgresql_ops={'embedding': 'vector_cosine_ops'})
+    # Nullable without a default: no table rewrite
+    op.add_column('messages', sa.Column('embedding', Vector(384), nullable=True))
+
+    # Built concurrently so large tables stay writable during the migration.
+    # NULL embeddings are not indexed, so the HNSW build is quick here and the
+    # index grows as the embedding worker works through the backlog.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_messages_embedding_pending', 'messages', ['created_at'], unique=False, postgresql_where=sa.text('embedding IS NULL AND text IS NOT NULL'), postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_messages_embedding_hnsw', 'messages', ['embedding'], unique=False, postgresql_using='hnsw', postgresql_with={'m': 16, 'ef_construction': 64}, postgresql_ops={'embedding': 'vector_cosine_ops'}, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_embedding_hnsw', table_name='messages', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_messages_embedding_pending', table_name='messages', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('messages', 'embedding')
+    op.drop_index('ix_kb_articles_embedding_hnsw', table_name='kb_articles')
+    op.drop_index('ix_kb_articles_embedding_pending', table_name='kb_articles')
+    op.drop_index(op.f('ix_kb_articles_tenant_id'), table_name='kb_articles')
+    op.drop_table('kb_articles')
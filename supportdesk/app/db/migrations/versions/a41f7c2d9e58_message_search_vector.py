@@ -0,0 +1,62 @@
+"""message full-text search vector
+
+Revision ID: a41f7c2d9e58
+Revises: 0e65ea5ae781
+Create Date: 2026-10-18 18:05:37.914260+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "a41f7c2d9e58"
+down_revision = "0e65ea5ae781"
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of Message.search_vector's expression at this revision
+SEARCH_VECTOR = """to_tsvector(CASE lower(left(language, 2))
+    WHEN 'ar' THEN 'arabic'::regconfig
+    WHEN 'da' THEN 'danish'::regconfig
+    WHEN 'de' THEN 'german'::regconfig
+    WHEN 'en' THEN 'english'::regconfig
+    WHEN 'es' THEN 'spanish'::regconfig
+    WHEN 'fi' THEN 'finnish'::regconfig
+    WHEN 'fr' THEN 'french'::regconfig
+    WHEN 'hu' THEN 'hungarian'::regconfig
+    WHEN 'id' THEN 'indonesian'::regconfig
+    WHEN 'it' THEN 'italian'::regconfig
+    WHEN 'nl' THEN 'dutch'::regconfig
+    WHEN 'no' THEN 'norwegian'::regconfig
+    WHEN 'pt' THEN 'portuguese'::regconfig
+    WHEN 'ro' THEN 'romanian'::regconfig
+    WHEN 'ru' THEN 'russian'::regconfig
+    WHEN 'sv' THEN 'swedish'::regconfig
+    WHEN 'tr' THEN 'turkish'::regconfig
+    ELSE 'simple'::regconfig END, coalesce(text, ''))"""
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites messages under an ACCESS
+    # EXCLUSIVE lock; run this in a maintenance window on large tenants
+    op.add_column(
+        'messages',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # Built concurrently so large tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        op.create_index('ix_messages_search_vector', 'messages', ['search_vector'], unique=False, postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_messages_search_vector', table_name='messages', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('messages', 'search_vector')
@@ -0,0 +1,54 @@
+"""unique customer platform identity
+
+Revision ID: d27b5e9a4c13
+Revises: 6c0d8e3b1f27
+Create Date: 2026-10-18 20:03:51.208734+00:00
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d27b5e9a4c13"
+down_revision = "6c0d8e3b1f27"
+branch_labels = None
+depends_on = None
+
+
+# The oldest customer of each identity survives; threads of the others move to it
+REPOINT_THREADS = """
+WITH ranked AS (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY tenant_id, platform, platform_user_id ORDER BY created_at, id
+    ) AS survivor_id
+    FROM customers
+)
+UPDATE threads t SET customer_id = r.survivor_id
+FROM ranked r
+WHERE t.customer_id = r.id AND r.id <> r.survivor_id
+"""
+
+DELETE_DUPLICATES = """
+DELETE FROM customers c
+USING customers survivor
+WHERE survivor.tenant_id = c.tenant_id
+  AND survivor.platform = c.platform
+  AND survivor.platform_user_id = c.platform_user_id
+  AND (survivor.created_at, survivor.id) < (c.created_at, c.id)
+"""
+
+
+def upgrade() -> None:
+    # Writers are held off until commit so no new duplicate can slip in
+    # between the cleanup and the index build. Customers are small next to
+    # messages, and reads carry on throughout.
+    op.execute("LOCK TABLE customers IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(REPOINT_THREADS)
+    op.execute(DELETE_DUPLICATES)
+    op.create_unique_constraint('uq_customer_platform_user', 'customers', ['tenant_id', 'platform', 'platform_user_id'])
+    # Covered by the constraint's leading tenant_id
+    op.drop_index('ix_customers_tenant_id', table_name='customers')
+
+
+def downgrade() -> None:
+    op.create_index('ix_customers_tenant_id', 'customers', ['tenant_id'], unique=False)
+    op.drop_constraint('uq_customer_platform_user', 'customers', type_='unique')
@@ -6,6 +6,8 @@ from .message import Message, MessageDirection
 from .tenant import Tenant
 from .thread import Thread, ThreadChannel, ThreadStatus
 from .label import Label
+from .thread_label_count import ThreadLabelCount
+from .kb_article import KBArticle
 
 __all__ = [
     "Tenant",
@@ -18,4 +20,6 @@ __all__ = [
     "Event",
     "EventType",
     "Label",
+    "ThreadLabelCount",
+    "KBArticle",
 ]
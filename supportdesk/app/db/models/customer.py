@@ -3,7 +3,7 @@
 import uuid
 from typing import Optional
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,7 +19,6 @@ class Customer(Base, UUIDMixin, TimestampMixin):
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     platform: Mapped[str] = mapped_column(String(50), nullable=False)
     platform_user_id: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -27,7 +26,15 @@ class Customer(Base, UUIDMixin, TimestampMixin):
     email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Relationships
-    tenant = relationship("Tenant", lazy="select")
+    tenant = relationship("Tenant", lazy="raise_on_sql")
+
+    __table_args__ = (
+        # One customer per platform identity; also serves tenant_id lookups
+        UniqueConstraint("tenant_id", "platform", "platform_user_id", name="uq_customer_platform_user"),
+        # Keyset pagination: newest-first listing, per tenant and across tenants
+        Index("ix_customers_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_customers_created_at_id", "created_at", "id"),
+    )
 
     def __repr__(self) -> str:
         return f"<Customer(id={self.id}, platform={self.platform}, platform_user_id={self.platform_user_id})>"
@@ -2,9 +2,9 @@
 
 import uuid
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String
 from sqlalchemy import JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -21,6 +21,7 @@ class EventType(str, Enum):
     clarify_sent = "clarify_sent"
     needs_review_created = "needs_review_created"
     urgent_flagged = "urgent_flagged"
+    sla_breached = "sla_breached"
 
 
 class Event(Base, UUIDMixin):
@@ -32,25 +33,30 @@ class Event(Base, UUIDMixin):
         UUID(as_uuid=True),
         ForeignKey("tenants.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     thread_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("threads.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     type: Mapped[EventType] = mapped_column(String(50), nullable=False)
-    meta: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    meta: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
 
-    # Single timestamp as per spec
+    # Single timestamp as per spec; also the partition key, so part of the primary key
     ts: Mapped[DateTime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), primary_key=True, nullable=False
     )
 
     # Relationships
-    tenant = relationship("Tenant", lazy="select")
-    thread = relationship("Thread", lazy="select")
+    tenant = relationship("Tenant", lazy="raise_on_sql")
+    thread = relationship("Thread", lazy="raise_on_sql")
+
+    __table_args__ = (
+        Index("ix_events_tenant_id_ts", "tenant_id", "ts"),
+        Index("ix_events_thread_id_ts", "thread_id", "ts"),
+        # Monthly partitions are managed by db/partitions.py
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
 
     def __repr__(self) -> str:
         return f"<Event(id={self.id}, type={self.type}, thread_id={self.thread_id})>"
@@ -0,0 +1,52 @@
+"""Knowledge-base article model."""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index, String, Text
+from sqlalchemy import text as sql_text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from ..base import Base, TimestampMixin, UUIDMixin
+from ..types import EMBEDDING_DIMENSIONS, Vector
+
+
+class KBArticle(Base, UUIDMixin, TimestampMixin):
+    """Tenant FAQ / help-center article, searchable by meaning.
+
+    ``embedding`` covers title and body; clear it when either changes so the
+    embedding worker picks the article up again.
+    """
+
+    __tablename__ = "kb_articles"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    url: Mapped[Optional[str]] = mapped_column(String(2048), nullable=True)
+    embedding: Mapped[Optional[list[float]]] = mapped_column(
+        Vector(EMBEDDING_DIMENSIONS), nullable=True, deferred=True
+    )
+
+    tenant = relationship("Tenant", lazy="raise_on_sql")
+
+    __table_args__ = (
+        Index(
+            "ix_kb_articles_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            info={"postgresql_only": True},
+        ),
+        Index("ix_kb_articles_embedding_pending", "created_at", postgresql_where=sql_text("embedding IS NULL")),
+    )
+
+    def __repr__(self) -> str:
+        return f"<KBArticle(id={self.id}, title={self.title})>"
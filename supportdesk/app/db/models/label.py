@@ -28,7 +28,7 @@ class Label(Base, UUIDMixin, TimestampMixin):
     name: Mapped[str] = mapped_column(String(64), nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
-    tenant = relationship("Tenant", lazy="select")
+    tenant = relationship("Tenant", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "name", name="uq_label_name_per_tenant"),
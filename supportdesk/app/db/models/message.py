@@ -1,15 +1,18 @@
 """Message model."""
 
 import uuid
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy import text as sql_text
 from sqlalchemy import JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..base import Base, TimestampMixin, UUIDMixin
+from ..types import EMBEDDING_DIMENSIONS, Vector
 
 
 class MessageDirection(str, Enum):
@@ -17,6 +20,35 @@ class MessageDirection(str, Enum):
     outbound = "outbound"
 
 
+# Text search configuration by the ISO 639-1 prefix of ``Message.language``;
+# other or missing languages are indexed unstemmed with ``simple``
+SEARCH_CONFIGS = {
+    "ar": "arabic",
+    "da": "danish",
+    "de": "german",
+    "en": "english",
+    "es": "spanish",
+    "fi": "finnish",
+    "fr": "french",
+    "hu": "hungarian",
+    "id": "indonesian",
+    "it": "italian",
+    "nl": "dutch",
+    "no": "norwegian",
+    "pt": "portuguese",
+    "ro": "romanian",
+    "ru": "russian",
+    "sv": "swedish",
+    "tr": "turkish",
+}
+
+
+def search_config_sql(language: str) -> str:
+    """SQL picking the regconfig for the language code in column ``language``."""
+    whens = " ".join(f"WHEN '{code}' THEN '{config}'::regconfig" for code, config in SEARCH_CONFIGS.items())
+    return f"CASE lower(left({language}, 2)) {whens} ELSE 'simple'::regconfig END"
+
+
 class Message(Base, UUIDMixin, TimestampMixin):
     """Message entity for threads."""
 
@@ -38,17 +70,50 @@ class Message(Base, UUIDMixin, TimestampMixin):
     platform_message_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     direction: Mapped[MessageDirection] = mapped_column(String(10), nullable=False)
     text: Mapped[Optional[str]] = mapped_column(String, nullable=True)
-    media: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    media: Mapped[Optional[dict[str, Any]]] = mapped_column(JSON, nullable=True)
     language: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    # When the platform says it was sent; created_at is when it was stored
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Filled in by the embedding worker; deferred so listings never load it
+    embedding: Mapped[Optional[list[float]]] = mapped_column(
+        Vector(EMBEDDING_DIMENSIONS), nullable=True, deferred=True
+    )
 
     # Relationships
-    tenant = relationship("Tenant", lazy="select")
-    thread = relationship("Thread", lazy="select")
+    tenant = relationship("Tenant", lazy="raise_on_sql")
+    thread = relationship("Thread", lazy="raise_on_sql")
 
     __table_args__ = (
         # Uniqueness per tenant + platform_message_id; platform uniqueness is implied by source systems
         UniqueConstraint("tenant_id", "platform_message_id", name="uq_message_platform_msg_per_tenant"),
+        # Keyset pagination: newest-first listing per tenant and per thread
+        Index("ix_messages_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        Index("ix_messages_thread_id_created_at_id", "thread_id", "created_at", "id"),
+        # Generated by Postgres and left unmapped, so the ORM never writes,
+        # returns or loads it; queried through db.search
+        Column(
+            "search_vector",
+            TSVECTOR,
+            Computed(f"to_tsvector({search_config_sql('language')}, coalesce(text, ''))", persisted=True),
+            info={"postgresql_only": True},
+        ),
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_messages_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            info={"postgresql_only": True},
+        ),
+        # Embedding worker backlog: newest unembedded messages first
+        Index(
+            "ix_messages_embedding_pending",
+            "created_at",
+            postgresql_where=sql_text("embedding IS NULL AND text IS NOT NULL"),
+        ),
     )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     def __repr__(self) -> str:
         return f"<Message(id={self.id}, direction={self.direction}, thread_id={self.thread_id})>"
@@ -1,6 +1,6 @@
 """Tenant model."""
 
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..base import Base, TimestampMixin, UUIDMixin
@@ -12,6 +12,11 @@ class Tenant(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "tenants"
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    
+
+    __table_args__ = (
+        # Keyset pagination: newest-first listing
+        Index("ix_tenants_created_at_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<Tenant(id={self.id}, name={self.name})>"
@@ -4,9 +4,9 @@ import uuid
 from enum import Enum
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy import JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..base import Base, TimestampMixin, UUIDMixin
@@ -44,14 +44,23 @@ class Thread(Base, UUIDMixin, TimestampMixin):
         index=True,
     )
     status: Mapped[ThreadStatus] = mapped_column(String(10), default=ThreadStatus.open, nullable=False)
-    labels: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list)
+    labels: Mapped[Optional[List[str]]] = mapped_column(JSON().with_variant(JSONB(), "postgresql"), default=list)
 
     # Relationships
-    tenant = relationship("Tenant", lazy="select")
-    customer = relationship("Customer", lazy="select")
+    tenant = relationship("Tenant", lazy="raise_on_sql")
+    customer = relationship("Customer", lazy="raise_on_sql")
 
     __table_args__ = (
         UniqueConstraint("tenant_id", "channel", "platform_thread_id", name="uq_thread_platform"),
+        # Keyset pagination: newest-first listing per tenant
+        Index("ix_threads_tenant_id_created_at_id", "tenant_id", "created_at", "id"),
+        # Label containment filters (labels @> '["refund"]')
+        Index(
+            "ix_threads_labels",
+            "labels",
+            postgresql_using="gin",
+            postgresql_ops={"labels": "jsonb_path_ops"},
+        ),
     )
 
     def __repr__(self) -> str:
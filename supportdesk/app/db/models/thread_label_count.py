@@ -0,0 +1,32 @@
+"""Per-tenant thread counts by label and status."""
+
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..base import Base
+
+
+class ThreadLabelCount(Base):
+    """Number of a tenant's threads carrying ``label`` in each ``status``.
+
+    Maintained incrementally by the ``threads_label_counts`` trigger on
+    ``threads``; never written by the application.
+    """
+
+    __tablename__ = "thread_label_counts"
+
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Thread labels are free-form, not limited to the vocabulary's 64 characters
+    label: Mapped[str] = mapped_column(Text, primary_key=True)
+    status: Mapped[str] = mapped_column(String(10), primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<ThreadLabelCount(label={self.label}, status={self.status}, count={self.count})>"
@@ -0,0 +1,50 @@
+"""Keyset (cursor) pagination helpers for list queries."""
+
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from ..schemas.common import PaginationParams, encode_cursor
+from .base import AnySelect
+
+
+def schema_columns(model: type, schema: type[BaseModel]) -> list[InstrumentedAttribute[Any]]:
+    """The mapped columns behind every field of ``schema``, for column-only selects."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def paginate(
+    stmt: AnySelect,
+    created_at: InstrumentedAttribute[Any],
+    id_: InstrumentedAttribute[Any],
+    pagination: PaginationParams,
+) -> AnySelect:
+    """Order newest first and page by cursor, or by OFFSET when no cursor is given.
+
+    One extra row is fetched so callers can tell whether another page exists
+    without counting; pass the rows to ``split_page``. Raises ``ValueError``
+    for a malformed cursor.
+    """
+    stmt = stmt.order_by(created_at.desc(), id_.desc())
+    position = pagination.keyset()
+    if position is not None:
+        stmt = stmt.where(tuple_(created_at, id_) < position)
+    else:
+        stmt = stmt.offset(pagination.skip)
+    return stmt.limit(pagination.limit + 1)
+
+
+def split_page(
+    rows: Sequence[Any], limit: int, created_at: str = "created_at"
+) -> tuple[Sequence[Any], bool, str | None]:
+    """Trim the look-ahead row and build the cursor for the next page.
+
+    ``created_at`` names the timestamp attribute the page was ordered by.
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(getattr(rows[-1], created_at), rows[-1].id) if has_more and rows else None
+    return rows, has_more, next_cursor
@@ -0,0 +1,141 @@
+"""Monthly range partitions for time-series tables.
+
+Partitions are named ``{table}_pYYYYMM`` and cover one calendar month of
+``ts`` in UTC. A maintainer creates partitions ahead of time and detaches the
+ones that fell out of retention; detached tables are kept for archiving and
+can be dropped by hand. Rows outside every partition land in
+``{table}_default``, which should stay empty.
+"""
+
+import asyncio
+import re
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..logging import get_logger
+from .session import get_db_session
+
+logger = get_logger(__name__)
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+async def _list_partitions(session: AsyncSession, table: str) -> dict[str, date]:
+    """Monthly partitions currently attached to ``table``, by name."""
+    rows = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    partitions = {}
+    for (name,) in rows:
+        match = pattern.match(name)
+        if match:
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return partitions
+
+
+async def _try_lock(session: AsyncSession, table: str) -> bool:
+    """Serialize maintenance across workers for the current transaction."""
+    return bool(
+        await session.scalar(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"supportdesk:partitions:{table}"},
+        )
+    )
+
+
+async def ensure_partitions(
+    session: AsyncSession, table: str, *, months_ahead: int, now: Optional[datetime] = None
+) -> list[str]:
+    """Create the partitions for this month and the next ``months_ahead``."""
+    current = month_start((now or datetime.now(timezone.utc)).date())
+    existing = await _list_partitions(session, table)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(table, month)
+        if name in existing:
+            continue
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00+00') TO ('{add_months(month, 1).isoformat()} 00:00+00')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def detach_partitions(
+    session: AsyncSession, table: str, *, retention_months: int, now: Optional[datetime] = None
+) -> list[str]:
+    """Detach partitions whose whole month is older than ``retention_months``."""
+    cutoff = add_months(month_start((now or datetime.now(timezone.utc)).date()), -retention_months)
+    detached = []
+    for name, month in sorted((await _list_partitions(session, table)).items(), key=lambda kv: kv[1]):
+        if add_months(month, 1) <= cutoff:
+            await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            detached.append(name)
+    return detached
+
+
+class PartitionMaintainer:
+    """Periodically keep a partitioned table's partitions in shape."""
+
+    def __init__(self, table: str, *, months_ahead: int, retention_months: int, interval_seconds: float):
+        self.table = table
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval_seconds = interval_seconds
+
+    async def maintain(self) -> None:
+        async with get_db_session() as session:
+            if not await _try_lock(session, self.table):
+                return
+            created = await ensure_partitions(session, self.table, months_ahead=self.months_ahead)
+            detached = []
+            if self.retention_months > 0:
+                detached = await detach_partitions(
+                    session, self.table, retention_months=self.retention_months
+                )
+        if created or detached:
+            logger.info("Maintained partitions", table=self.table, created=created, detached=detached)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Maintain partitions every ``interval_seconds`` until ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                await self.maintain()
+            except Exception as e:
+                logger.error("Partition maintenance failed", table=self.table, error=str(e))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+event_partitions = PartitionMaintainer(
+    "events",
+    months_ahead=settings.events_partition_months_ahead,
+    retention_months=settings.events_retention_months,
+    interval_seconds=settings.events_partition_check_seconds,
+)
@@ -0,0 +1,255 @@
+"""Read replica routing.
+
+Read-only endpoints take their session from ``read_session``, which picks a
+replica from ``database_replica_urls`` by round robin or fewest checked-out
+connections. A background check measures each replica's replay lag; replicas
+that are down or lag more than ``db_replica_max_lag_seconds`` are skipped, and
+reads fall back to the primary when none is usable (or none is configured).
+
+Replicas are unusable until their first successful check, so a process that
+never runs the checker always reads from the primary.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Mapping, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import settings
+from ..logging import get_logger
+from .session import get_engine, get_sessionmaker, make_engine
+
+logger = get_logger(__name__)
+
+# ``session.info`` key naming the replica a read session is bound to
+REPLICA_INFO_KEY = "supportdesk_replica"
+
+PRIMARY_LSN_QUERY = text("SELECT CAST(pg_current_wal_lsn() AS text)")
+
+# Replay lag in seconds. A replica that has replayed up to the primary's WAL
+# position, read just before, is current even if the primary has been idle
+# since its last transaction. Its own receive position is no reference: a
+# replica whose WAL receiver disconnected has replayed all it received too.
+LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_replay_lsn() >= CAST(CAST(:primary_lsn AS text) AS pg_lsn) THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    sessionmaker: async_sessionmaker[AsyncSession]
+    healthy: bool = False
+    lag_seconds: Optional[float] = None
+    checked_at: Optional[float] = None
+    error: Optional[str] = None
+
+    def in_use(self) -> int:
+        pool = self.engine.pool
+        return pool.checkedout() if isinstance(pool, QueuePool) else 0
+
+
+class ReplicaSet:
+    """Pick a usable replica per read and keep replica health up to date."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        selection: str,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+    ):
+        if selection not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica selection {selection!r}")
+        self.selection = selection
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.replicas = []
+        for url in urls:
+            engine = make_engine(url)
+            self.replicas.append(
+                Replica(
+                    name=make_url(url).render_as_string(hide_password=True),
+                    engine=engine,
+                    sessionmaker=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+                )
+            )
+        self._turn = itertools.count()
+
+    def usable(self) -> list[Replica]:
+        return [
+            r
+            for r in self.replicas
+            if r.healthy and r.lag_seconds is not None and r.lag_seconds <= self.max_lag_seconds
+        ]
+
+    def choose(self) -> Optional[Replica]:
+        """The replica to serve the next read, or ``None`` to use the primary."""
+        usable = self.usable()
+        if not usable:
+            return None
+        if self.selection == "least_connections":
+            return min(usable, key=Replica.in_use)
+        return usable[next(self._turn) % len(usable)]
+
+    def mark_down(self, replica: Replica, error: BaseException) -> None:
+        """Stop routing to ``replica`` until its next successful check."""
+        if replica.healthy:
+            logger.warning("Replica unavailable, reading from primary", replica=replica.name, error=str(error))
+        replica.healthy = False
+        replica.error = str(error)
+
+    async def primary_lsn(self) -> Optional[str]:
+        """The primary's current WAL position, or ``None`` if it cannot be read."""
+        try:
+            async with get_engine().connect() as conn:
+                lsn: Optional[str] = await conn.scalar(PRIMARY_LSN_QUERY)
+                return lsn
+        except (DBAPIError, OSError) as e:
+            logger.warning("Primary WAL position unavailable", error=str(e))
+            return None
+
+    async def check(self, replica: Replica, primary_lsn: Optional[str] = None) -> None:
+        """Measure ``replica``'s lag behind ``primary_lsn``.
+
+        Without a primary position the lag is the age of the last replayed
+        transaction, which overstates it while the primary is idle.
+        """
+        try:
+            async with replica.engine.connect() as conn:
+                lag = float(await conn.scalar(LAG_QUERY, {"primary_lsn": primary_lsn}))
+        except (DBAPIError, OSError) as e:
+            self.mark_down(replica, e)
+        else:
+            if lag > self.max_lag_seconds and (replica.lag_seconds or 0) <= self.max_lag_seconds:
+                logger.warning("Replica lagging, reading from primary", replica=replica.name, lag_seconds=lag)
+            replica.healthy = True
+            replica.lag_seconds = lag
+            replica.error = None
+        replica.checked_at = time.time()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Check every replica each ``check_interval_seconds`` until ``stop`` is set."""
+        while not stop.is_set():
+            primary_lsn = await self.primary_lsn()
+            await asyncio.gather(*(self.check(r, primary_lsn) for r in self.replicas))
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.check_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> list[dict[str, Any]]:
+        usable = self.usable()
+        return [
+            {
+                "name": r.name,
+                "usable": r in usable,
+                "healthy": r.healthy,
+                "lag_seconds": r.lag_seconds,
+                "checked_at": r.checked_at,
+                "in_use": r.in_use(),
+                "error": r.error,
+            }
+            for r in self.replicas
+        ]
+
+
+replica_set = ReplicaSet(
+    [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()],
+    selection=settings.db_replica_selection,
+    max_lag_seconds=settings.db_replica_max_lag_seconds,
+    check_interval_seconds=settings.db_replica_check_interval_seconds,
+)
+
+
+@asynccontextmanager
+async def read_session(*, primary: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only work on a replica, or the primary when ``primary`` or none is usable.
+
+    Nothing is committed; the transaction is rolled back on close. A replica
+    session names its replica in ``session.info[REPLICA_INFO_KEY]``.
+    """
+    session: Optional[AsyncSession] = None
+    replica = None if primary else replica_set.choose()
+    if replica is not None:
+        session = replica.sessionmaker()
+        try:
+            # Check a connection out now so a dead replica falls back instead of failing the request
+            await session.connection()
+            session.info[REPLICA_INFO_KEY] = replica.name
+        except (DBAPIError, OSError) as e:
+            await session.close()
+            replica_set.mark_down(replica, e)
+            session = None
+    if session is None:
+        session = get_sessionmaker()()
+    async with session:
+        yield session
+
+
+# Read-your-writes: a successful write stamps the client with a cookie, and
+# reads carrying a recent stamp (or the header) go to the primary.
+WROTE_AT_COOKIE = "supportdesk_wrote_at"
+READ_PRIMARY_HEADER = "x-read-your-writes"
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def wants_primary(headers: Mapping[str, str], cookies: Mapping[str, str], now: Optional[float] = None) -> bool:
+    """Whether this request must see the client's own recent writes."""
+    if headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true", "yes"):
+        return True
+    if settings.read_your_writes_seconds <= 0:
+        return False
+    try:
+        wrote_at = float(cookies[WROTE_AT_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    return (now or time.time()) - wrote_at < settings.read_your_writes_seconds
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware stamping clients whose write requests succeeded."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in _SAFE_METHODS
+            or settings.read_your_writes_seconds <= 0
+            or not replica_set.replicas
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                cookie = (
+                    f"{WROTE_AT_COOKIE}={time.time():.3f}; Max-Age={settings.read_your_writes_seconds}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", cookie.encode())]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
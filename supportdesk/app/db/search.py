@@ -0,0 +1,121 @@
+"""Full-text search over message text.
+
+On Postgres messages are matched against the generated ``search_vector``
+column (GIN indexed), ranked with ``ts_rank`` and paged by ``(rank, id)``
+keyset. Other dialects (SQLite in tests) fall back to a case-insensitive
+substring match of every search term, with every rank 0.
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import (
+    Float,
+    String,
+    and_,
+    cast,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from ..schemas.common import decode_cursor
+from .base import AnySelect
+from .models import Message
+from .models.message import SEARCH_CONFIGS, search_config_sql
+
+# Snippets: up to two fragments around the matched words, highlighted with <mark>
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2"
+
+search_vector = Message.__table__.c.search_vector
+
+
+def query_config(language: Optional[str]) -> str:
+    """The text search configuration for a query in ``language``."""
+    return SEARCH_CONFIGS.get((language or "")[:2].lower(), "simple")
+
+
+def search_position(cursor: str) -> tuple[float, uuid.UUID]:
+    """The ``(rank, id)`` encoded in a search ``next_cursor``.
+
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    values = decode_cursor(cursor)
+    if len(values) != 2:
+        raise ValueError("Invalid cursor")
+    try:
+        return float(values[0]), uuid.UUID(values[1])
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def search_messages(
+    tenant_id: uuid.UUID,
+    query: str,
+    dialect: str,
+    *,
+    language: str,
+    limit: int,
+    position: Optional[tuple[float, uuid.UUID]] = None,
+    thread_id: Optional[uuid.UUID] = None,
+) -> AnySelect:
+    """Best matches first, as ``(Message, rank, snippet)`` rows.
+
+    The query is parsed with ``websearch_to_tsquery`` (quoted phrases, ``or``,
+    ``-term``) in the configuration for ``language`` and OR-ed with the
+    unstemmed ``simple`` parse, so messages indexed under another language
+    still match on exact words. ``position`` is the ``(rank, id)`` of the last
+    row of the previous page. One extra row is fetched, as with ``paginate``.
+    """
+    if dialect != "postgresql":
+        return _search_fallback(tenant_id, query, limit=limit, position=position, thread_id=thread_id)
+
+    tsquery = func.websearch_to_tsquery(literal(query_config(language), REGCONFIG), query).op("||")(
+        func.websearch_to_tsquery(literal("simple", REGCONFIG), query)
+    )
+    rank = func.ts_rank(search_vector, tsquery).label("rank")
+
+    page = select(Message.id, rank).where(Message.tenant_id == tenant_id, search_vector.op("@@")(tsquery))
+    if thread_id is not None:
+        page = page.where(Message.thread_id == thread_id)
+    if position is not None:
+        page = page.where(tuple_(func.ts_rank(search_vector, tsquery), Message.id) < position)
+    ranked = page.order_by(rank.desc(), Message.id.desc()).limit(limit + 1).subquery()
+
+    # Headlines are built in the outer select, so only for the rows on the page
+    # rather than for every match the sort had to look at
+    snippet = func.ts_headline(
+        literal_column(search_config_sql("messages.language"), REGCONFIG),
+        func.coalesce(Message.text, ""),
+        tsquery,
+        HEADLINE_OPTIONS,
+    )
+    return (
+        select(Message, ranked.c.rank, snippet.label("snippet"))
+        .join(ranked, Message.id == ranked.c.id)
+        .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+    )
+
+
+def _search_fallback(
+    tenant_id: uuid.UUID,
+    query: str,
+    *,
+    limit: int,
+    position: Optional[tuple[float, uuid.UUID]],
+    thread_id: Optional[uuid.UUID],
+) -> AnySelect:
+    terms = [term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") for term in query.split()]
+    stmt = select(Message, literal(0.0, Float).label("rank"), cast(Message.text, String).label("snippet")).where(
+        Message.tenant_id == tenant_id,
+        and_(true(), *(Message.text.ilike(f"%{term}%", escape="\\") for term in terms)),
+    )
+    if thread_id is not None:
+        stmt = stmt.where(Message.thread_id == thread_id)
+    if position is not None:
+        stmt = stmt.where(Message.id < position[1])
+    return stmt.order_by(Message.id.desc()).limit(limit + 1)
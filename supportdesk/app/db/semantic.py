@@ -0,0 +1,79 @@
+"""Tenant-filtered nearest-neighbour search over embedding columns.
+
+On Postgres the ``ORDER BY embedding <=> :query LIMIT k`` query is served by
+the HNSW index. ``hnsw.ef_search`` bounds the candidates visited per query;
+``hnsw.iterative_scan`` (pgvector >= 0.8) keeps scanning when the tenant
+filter rejects most of them, which would otherwise return fewer than ``k``
+rows for small tenants. Older pgvector reserves the ``hnsw`` prefix without
+that setting and rejects it, so it is only set when the installed extension
+is new enough. Other dialects (SQLite in tests) rank every embedded row of
+the tenant in Python.
+"""
+
+import math
+import uuid
+from typing import Any, Sequence
+
+from sqlalchemy import ColumnElement, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+
+# Evaluated in the same statement as the settings, so checking costs no round trip
+_ITERATIVE_SCAN_SUPPORTED: ColumnElement[bool] = literal_column(
+    "string_to_array((SELECT extversion FROM pg_extension WHERE extname = 'vector'), '.')::int[]"
+    " >= ARRAY[0, 8]"
+)
+
+
+def cosine_distance(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b, strict=True))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return 1.0 - dot / norm if norm else 1.0
+
+
+async def nearest(
+    session: AsyncSession,
+    model: type[Any],
+    tenant_id: uuid.UUID,
+    vector: Sequence[float],
+    limit: int,
+    *criteria: Any,
+    options: Sequence[Any] = (),
+) -> list[tuple[Any, float]]:
+    """The ``limit`` rows of ``model`` closest to ``vector``, as ``(row, distance)``.
+
+    ``criteria`` further filter the tenant's rows; ``options`` are loader
+    options for the returned rows.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        stmt = (
+            select(model, model.embedding)
+            .options(*options)
+            .where(model.tenant_id == tenant_id, model.embedding.is_not(None), *criteria)
+        )
+        scored = [(row, cosine_distance(embedding, vector)) for row, embedding in await session.execute(stmt)]
+        return sorted(scored, key=lambda hit: hit[1])[:limit]
+
+    config: list[ColumnElement[Any]] = [func.set_config("hnsw.ef_search", str(max(settings.vector_ef_search, limit)), True)]
+    if settings.vector_iterative_scan:
+        config.append(
+            case(
+                (
+                    _ITERATIVE_SCAN_SUPPORTED,
+                    func.set_config("hnsw.iterative_scan", settings.vector_iterative_scan, True),
+                )
+            )
+        )
+    await session.execute(select(*config))
+
+    distance = model.embedding.cosine_distance(vector).label("distance")
+    stmt = (
+        select(model, distance)
+        .options(*options)
+        .where(model.tenant_id == tenant_id, model.embedding.is_not(None), *criteria)
+        .order_by(distance)
+        .limit(limit)
+    )
+    # relaxed_order may return neighbours slightly out of order
+    return sorted(((row, distance) for row, distance in await session.execute(stmt)), key=lambda hit: hit[1])
@@ -1,35 +1,71 @@
-"""Database session management."""
+"""Database session management.
+
+The primary's engine is created on first use rather than at import, so
+importing the app (tests, scripts, workers) does not load the asyncpg
+dialect. The API creates it in its lifespan and disposes of it on shutdown.
+"""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from ..config import settings
+from .listeners import run_commit_hooks
+from .pool import InstrumentedPool
+
+
+def make_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured, instrumented pool."""
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=settings.db_pool_use_lifo,
+    )
+
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def get_engine() -> AsyncEngine:
+    """The primary's engine, created on first use."""
+    global _engine
+    if _engine is None:
+        _engine = make_engine(settings.database_url)
+    return _engine
+
+
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Session factory bound to the primary."""
+    global _sessionmaker
+    if _sessionmaker is None:
+        _sessionmaker = async_sessionmaker(get_engine(), class_=AsyncSession, expire_on_commit=False)
+    return _sessionmaker
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
 
-# Create session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+async def dispose_engine() -> None:
+    """Close the primary's connections; the next use creates a new engine."""
+    global _engine, _sessionmaker
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = _sessionmaker = None
 
 
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get database session context manager."""
-    async with AsyncSessionLocal() as session:
+    async with get_sessionmaker()() as session:
         try:
             yield session
             await session.commit()
+            await run_commit_hooks(session)
         except Exception:
             await session.rollback()
             raise
@@ -0,0 +1,49 @@
+"""Column types not provided by SQLAlchemy itself."""
+
+from typing import Any, Callable, Optional, Sequence
+
+from sqlalchemy import ColumnElement, Float
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import UserDefinedType
+
+
+class Vector(UserDefinedType[list[float]]):
+    """pgvector ``vector(n)``, exchanged in its text form ``[x,y,...]``.
+
+    The text form needs no driver codec: asyncpg falls back to text for types
+    it does not know, and SQLite (tests) stores the same string.
+    """
+
+    cache_ok = True
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return f"VECTOR({self.dimensions})"
+
+    def bind_processor(self, dialect: Dialect) -> Callable[[Optional[Sequence[float]]], Optional[str]]:
+        def process(value: Optional[Sequence[float]]) -> Optional[str]:
+            if value is None:
+                return None
+            return "[" + ",".join(repr(float(x)) for x in value) + "]"
+
+        return process
+
+    def result_processor(self, dialect: Dialect, coltype: object) -> Callable[[Optional[str]], Optional[list[float]]]:
+        def process(value: Optional[str]) -> Optional[list[float]]:
+            if value is None:
+                return None
+            return [float(x) for x in value.strip("[]").split(",")] if value != "[]" else []
+
+        return process
+
+    class comparator_factory(UserDefinedType.Comparator[list[float]]):
+        def cosine_distance(self, other: Sequence[float]) -> ColumnElement[float]:
+            """``<=>``: 1 - cosine similarity; served by ``vector_cosine_ops`` indexes."""
+            return self.expr.op("<=>", return_type=Float)(other)
+
+
+# Width of every stored embedding. Encoders must produce vectors of this size;
+# changing it takes a migration and re-embedding every row.
+EMBEDDING_DIMENSIONS = 384
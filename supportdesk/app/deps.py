@@ -1,12 +1,14 @@
 """FastAPI dependencies."""
 
-from typing import AsyncGenerator
+from functools import partial
+from typing import AsyncContextManager, AsyncGenerator, Callable
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from .core.redis_client import get_redis_client
-from .db.session import get_db_session
+from .db.replicas import read_session, wants_primary
+from .db.session import get_db_session, get_sessionmaker
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -15,6 +17,25 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session on a replica, or on the primary when the client needs its own writes."""
+    async with read_session(primary=wants_primary(request.headers, request.cookies)) as session:
+        yield session
+
+
+def get_read_sessions(request: Request) -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Open read sessions routed like ``get_read_db``, for streamed bodies that outlive the request."""
+    return partial(read_session, primary=wants_primary(request.headers, request.cookies))
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Primary's session factory for work that is shared between requests.
+
+    Cache loads use it, since other requests may wait on them.
+    """
+    return get_sessionmaker()
+
+
 async def get_redis():
     """Get Redis client dependency."""
     return await get_redis_client()
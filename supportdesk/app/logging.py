@@ -1,14 +1,208 @@
-"""Structured logging configuration."""
+"""Structured logging configuration.
 
+By default structlog writes each JSON line to stdout on the calling thread.
+With ``log_queue_enabled`` lines are rendered on the caller but only appended
+to a bounded in-memory ring buffer; a daemon thread drains it to stdout, so a
+slow or blocked stdout never stalls the event loop. When the buffer is full,
+``log_queue_overflow`` decides what is lost: the incoming line
+(``drop_newest``) or the oldest buffered one (``drop_oldest``). Warnings and
+errors always evict the oldest line rather than being dropped. Lost lines are
+counted and reported by the writer thread.
+
+Hot-path INFO events can be sampled (``log_sample_rates``) or capped per
+second (``log_rate_limits``); both only ever drop lines below WARNING.
+"""
+
+import atexit
 import logging
+import random
 import sys
-from typing import Any, Dict
+import threading
+import time
+from collections import deque
+from typing import IO, Any, Dict, Optional
 
 import structlog
 from pythonjsonlogger import jsonlogger
 
 from .config import settings
 
+# structlog method names at WARNING or above; these are never sampled or dropped
+_IMPORTANT = frozenset({"warn", "warning", "err", "error", "exception", "critical", "fatal", "failure"})
+
+
+def _parse_event_map(spec: str) -> dict[str, float]:
+    """Parse ``"Event one=0.01,Event two=0.5"`` into ``{event: value}``."""
+    parsed = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        event, _, value = item.rpartition("=")
+        parsed[event.strip()] = float(value)
+    return parsed
+
+
+class SampleEvents:
+    """Processor keeping only a fraction of selected sub-WARNING events.
+
+    Kept lines carry ``sample_rate`` so counts can be scaled back up.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = rates
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        rate = self.rates.get(event_dict.get("event", ""))
+        if rate is None or method_name in _IMPORTANT:
+            return event_dict
+        if random.random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class RateLimitEvents:
+    """Processor capping selected sub-WARNING events to N lines per second."""
+
+    def __init__(self, limits: dict[str, float]):
+        self.limits = limits
+        # event -> [tokens, last refill]
+        self._buckets: dict[str, list[float]] = {}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+        event = event_dict.get("event", "")
+        limit = self.limits.get(event)
+        if limit is None or method_name in _IMPORTANT:
+            return event_dict
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(event, [limit, now])
+        bucket[0] = min(limit, bucket[0] + (now - bucket[1]) * limit)
+        bucket[1] = now
+        if bucket[0] < 1:
+            raise structlog.DropEvent
+        bucket[0] -= 1
+        return event_dict
+
+
+class QueuedWriter:
+    """Bounded ring buffer of log lines drained to ``stream`` by a daemon thread.
+
+    ``deque`` appends and pops are atomic, so callers never take a lock; the
+    thread is woken only when it is not already awake.
+    """
+
+    def __init__(self, stream: IO[str], *, max_lines: int, overflow: str, flush_interval: float = 0.05):
+        if overflow not in ("drop_newest", "drop_oldest"):
+            raise ValueError(f"Unknown log queue overflow policy {overflow!r}")
+        self.stream = stream
+        self.max_lines = max_lines
+        self.drop_newest = overflow == "drop_newest"
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._lines: deque[str] = deque()
+        self._wakeup = threading.Event()
+        # Only drainers take it, never callers of write()
+        self._drain_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._drain_forever, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: str, important: bool = False) -> None:
+        if len(self._lines) >= self.max_lines:
+            if self.drop_newest and not important:
+                self.dropped += 1
+                return
+            try:
+                self._lines.popleft()
+                self.dropped += 1
+            except IndexError:
+                pass
+        self._lines.append(line)
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def _drain(self) -> None:
+        with self._drain_lock:
+            self._drain_locked()
+
+    def _drain_locked(self) -> None:
+        lines = []
+        try:
+            while True:
+                lines.append(self._lines.popleft())
+        except IndexError:
+            pass
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            lines.append(f'{{"event": "Log lines dropped", "level": "warning", "dropped": {dropped}}}')
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def _drain_forever(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self._drain()
+            except Exception:
+                # Nowhere left to report a broken stdout; keep the loop alive
+                pass
+
+    def flush(self) -> None:
+        """Write out everything buffered so far from the calling thread."""
+        self._drain()
+
+    def close(self) -> None:
+        """Write out everything buffered and stop the thread."""
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        self._drain()
+
+
+class QueuedLogger:
+    """structlog logger that hands rendered lines to a ``QueuedWriter``."""
+
+    def __init__(self, writer: QueuedWriter):
+        self._writer = writer
+
+    def _write(self, message: str) -> None:
+        self._writer.write(message)
+
+    def _write_important(self, message: str) -> None:
+        self._writer.write(message, important=True)
+
+    msg = log = debug = info = _write
+    warn = warning = err = error = exception = critical = fatal = failure = _write_important
+
+
+class QueuedLoggerFactory:
+    def __init__(self, writer: QueuedWriter):
+        self._logger = QueuedLogger(writer)
+
+    def __call__(self, *args: Any) -> QueuedLogger:
+        return self._logger
+
+
+_writer: Optional[QueuedWriter] = None
+
+
+def _queued_writer() -> QueuedWriter:
+    global _writer
+    if _writer is None:
+        _writer = QueuedWriter(
+            sys.stdout,
+            max_lines=settings.log_queue_size,
+            overflow=settings.log_queue_overflow,
+        )
+        atexit.register(_writer.close)
+    return _writer
+
+
+def flush_logging() -> None:
+    """Write out queued log lines now (no-op in sync mode)."""
+    if _writer is not None:
+        _writer.flush()
+
 
 def configure_logging() -> None:
     """Configure structured logging with JSON output."""
@@ -20,18 +214,31 @@ def configure_logging() -> None:
         level=getattr(logging, settings.log_level.upper()),
     )
 
+    processors: list[Any] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+    ]
+    # Drop sampled-out events before paying for timestamps and rendering
+    if settings.log_sample_rates:
+        processors.append(SampleEvents(_parse_event_map(settings.log_sample_rates)))
+    if settings.log_rate_limits:
+        processors.append(RateLimitEvents(_parse_event_map(settings.log_rate_limits)))
+    processors += [
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.JSONRenderer(),
+    ]
+
     # Configure structlog
     structlog.configure(
-        processors=[
-            structlog.contextvars.merge_contextvars,
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso", utc=True),
-            structlog.processors.JSONRenderer(),
-        ],
+        processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, settings.log_level.upper())
         ),
-        logger_factory=structlog.WriteLoggerFactory(),
+        logger_factory=(
+            QueuedLoggerFactory(_queued_writer())
+            if settings.log_queue_enabled
+            else structlog.WriteLoggerFactory()
+        ),
         cache_logger_on_first_use=True,
     )
 
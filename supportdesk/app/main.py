@@ -1,13 +1,30 @@
 """Main FastAPI application."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from .logging import configure_logging, get_logger
+from .core.cache import cache_invalidations
+from .core.health import health_checker
+from .core.metrics import MetricsMiddleware
+from .core.query_budget import QueryCountMiddleware
+from .core.redis_client import close_redis_client, get_redis_client
+from .db.replicas import ReadYourWritesMiddleware, replica_set
+from .db.session import dispose_engine, get_engine
+from .logging import configure_logging, flush_logging, get_logger
 from .routers.customers import router as customers_router
+from .routers.events import router as events_router
+from .routers.exports import router as exports_router
 from .routers.health import router as health_router
+from .routers.internal import router as internal_router
+from .routers.kb import router as kb_router
+from .routers.labels import router as labels_router
+from .routers.messages import router as messages_router
+from .routers.metrics import router as metrics_router
 from .routers.tenants import router as tenants_router
+from .routers.threads import router as threads_router
+from .routers.webhooks import router as webhooks_router
 
 
 @asynccontextmanager
@@ -17,11 +34,27 @@ async def lifespan(app: FastAPI):
     configure_logging()
     logger = get_logger(__name__)
     logger.info("Starting SupportDesk API")
+    # Created here rather than at import; neither connects until first used
+    get_engine()
+    await get_redis_client()
+    stop = asyncio.Event()
+    replica_checks = asyncio.create_task(replica_set.run(stop)) if replica_set.replicas else None
+    invalidations = asyncio.create_task(cache_invalidations.run(stop))
+    health_checks = asyncio.create_task(health_checker.run(stop))
     
     yield
     
     # Shutdown
     logger.info("Shutting down SupportDesk API")
+    stop.set()
+    await invalidations
+    await health_checks
+    if replica_checks is not None:
+        await replica_checks
+        await replica_set.dispose()
+    await close_redis_client()
+    await dispose_engine()
+    flush_logging()
 
 
 app = FastAPI(
@@ -30,6 +63,10 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
 )
+# Added first so it runs inside QueryCountMiddleware and sees the query counter
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryCountMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 
 
 @app.get("/")
@@ -46,3 +83,12 @@ async def root():
 app.include_router(health_router)
 app.include_router(tenants_router)
 app.include_router(customers_router)
+app.include_router(labels_router)
+app.include_router(threads_router)
+app.include_router(messages_router)
+app.include_router(kb_router)
+app.include_router(events_router)
+app.include_router(exports_router)
+app.include_router(webhooks_router)
+app.include_router(internal_router)
+app.include_router(metrics_router)
@@ -3,96 +3,112 @@
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from ..core.cache import customer_cache
+from ..core.query_budget import query_budget
+from ..db.counting import count_total
 from ..db.models import Customer
-from ..deps import get_db
+from ..db.pagination import paginate, schema_columns, split_page
+from ..deps import get_read_db, get_session_factory
 from ..logging import get_logger
-from ..schemas.common import PaginatedResponse, PaginationParams
+from ..schemas.common import PaginatedResponse, PaginationParams, dump_page
 from ..schemas.customer import CustomerResponse
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 logger = get_logger(__name__)
 
 
-@router.get("", response_model=PaginatedResponse)
+@router.get("", response_model=PaginatedResponse[CustomerResponse], dependencies=[Depends(query_budget(3))])
 async def list_customers(
     tenant_id: Optional[uuid.UUID] = Query(None, description="Filter by tenant ID"),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
-) -> PaginatedResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """List customers with optional filtering by tenant and platform."""
     
     # Build base query
     base_stmt = select(Customer)
-    count_stmt = select(func.count(Customer.id))
     
     # Apply filters
     if tenant_id:
         base_stmt = base_stmt.where(Customer.tenant_id == tenant_id)
-        count_stmt = count_stmt.where(Customer.tenant_id == tenant_id)
     
     if platform:
         base_stmt = base_stmt.where(Customer.platform == platform)
-        count_stmt = count_stmt.where(Customer.platform == platform)
+    
+    try:
+        # Plain columns: rows are validated straight into the response, no ORM objects
+        stmt = paginate(
+            base_stmt.with_only_columns(*schema_columns(Customer, CustomerResponse)),
+            Customer.created_at,
+            Customer.id,
+            pagination,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
     
     # Get total count
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    total = await count_total(
+        db,
+        base_stmt,
+        pagination.count,
+        table="customers",
+        tenant_id=tenant_id,
+        filters={"platform": platform},
+    )
     
     # Get paginated results
-    stmt = (
-        base_stmt
-        .order_by(Customer.created_at.desc())
-        .offset(pagination.skip)
-        .limit(pagination.limit)
-    )
     result = await db.execute(stmt)
-    customers = result.scalars().all()
-    
-    customer_responses = [CustomerResponse.model_validate(customer) for customer in customers]
+    customers, has_more, next_cursor = split_page(result.all(), pagination.limit)
     
     logger.info(
         "Listed customers",
         total=total,
-        returned=len(customer_responses),
+        returned=len(customers),
         tenant_id=str(tenant_id) if tenant_id else None,
         platform=platform,
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor is not None,
+        count=pagination.count.value,
     )
     
-    return PaginatedResponse.create(
-        items=customer_responses,
+    payload = dump_page(
+        CustomerResponse,
+        items=customers,
         total=total,
         skip=pagination.skip,
         limit=pagination.limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=pagination.count,
     )
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/{customer_id}", response_model=CustomerResponse)
+@router.get("/{customer_id}", response_model=CustomerResponse, dependencies=[Depends(query_budget(1))])
 async def get_customer(
     customer_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-) -> CustomerResponse:
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> Response:
     """Get a specific customer by ID."""
     
-    stmt = select(Customer).where(Customer.id == customer_id)
-    result = await db.execute(stmt)
-    customer = result.scalar_one_or_none()
+    async def load_customer(db: AsyncSession) -> str | None:
+        stmt = select(Customer).where(Customer.id == customer_id)
+        result = await db.execute(stmt)
+        customer = result.scalar_one_or_none()
+        return CustomerResponse.model_validate(customer).model_dump_json() if customer else None
+    
+    payload = await customer_cache.get_or_load(customer_id, load_customer, sessions)
     
-    if not customer:
+    if payload is None:
         logger.warning("Customer not found", customer_id=str(customer_id))
         raise HTTPException(status_code=404, detail="Customer not found")
     
-    logger.info(
-        "Retrieved customer",
-        customer_id=str(customer_id),
-        platform=customer.platform,
-        platform_user_id=customer.platform_user_id,
-    )
+    logger.info("Retrieved customer", customer_id=str(customer_id))
     
-    return CustomerResponse.model_validate(customer)
+    return Response(content=payload, media_type="application/json")
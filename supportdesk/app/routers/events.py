@@ -0,0 +1,101 @@
+"""Event router with read-only operations."""
+
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from ..core.query_budget import query_budget
+from ..db.counting import count_total
+from ..db.models import Event, EventType
+from ..db.pagination import paginate, split_page
+from ..deps import get_read_db
+from ..logging import get_logger
+from ..schemas.common import PaginatedResponse, PaginationParams
+from ..schemas.event import EventResponse
+
+router = APIRouter(prefix="/events", tags=["events"])
+logger = get_logger(__name__)
+
+
+@router.get("", response_model=PaginatedResponse[EventResponse], dependencies=[Depends(query_budget(3))])
+async def list_events(
+    tenant_id: Optional[uuid.UUID] = Query(None, description="Filter by tenant ID"),
+    thread_id: Optional[uuid.UUID] = Query(None, description="Filter by thread ID"),
+    type: Optional[EventType] = Query(None, description="Filter by event type"),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaginatedResponse[EventResponse]:
+    """List events with their thread summary, newest first."""
+    
+    base_stmt = select(Event)
+    if tenant_id:
+        base_stmt = base_stmt.where(Event.tenant_id == tenant_id)
+    if thread_id:
+        base_stmt = base_stmt.where(Event.thread_id == thread_id)
+    if type:
+        base_stmt = base_stmt.where(Event.type == type.value)
+    
+    try:
+        # Events are ordered by ts, which is also their partition key
+        stmt = paginate(base_stmt.options(joinedload(Event.thread)), Event.ts, Event.id, pagination)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    
+    total = await count_total(
+        db,
+        base_stmt,
+        pagination.count,
+        table="events",
+        tenant_id=tenant_id,
+        filters={"thread_id": thread_id, "type": type},
+    )
+    
+    result = await db.execute(stmt)
+    events, has_more, next_cursor = split_page(result.scalars().all(), pagination.limit, "ts")
+    
+    event_responses = [EventResponse.model_validate(event) for event in events]
+    
+    logger.info(
+        "Listed events",
+        total=total,
+        returned=len(event_responses),
+        tenant_id=str(tenant_id) if tenant_id else None,
+        thread_id=str(thread_id) if thread_id else None,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=pagination.cursor is not None,
+        count=pagination.count.value,
+    )
+    
+    return PaginatedResponse.create(
+        items=event_responses,
+        total=total,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=pagination.count,
+    )
+
+
+@router.get("/{event_id}", response_model=EventResponse, dependencies=[Depends(query_budget(1))])
+async def get_event(
+    event_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+) -> EventResponse:
+    """Get a specific event by ID, with its thread summary."""
+    
+    stmt = select(Event).options(joinedload(Event.thread)).where(Event.id == event_id)
+    event = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if event is None:
+        logger.warning("Event not found", event_id=str(event_id))
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    logger.info("Retrieved event", event_id=str(event_id))
+    
+    return EventResponse.model_validate(event)
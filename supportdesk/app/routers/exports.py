@@ -0,0 +1,51 @@
+"""Streaming exports of tenant conversations."""
+
+import uuid
+from typing import AsyncContextManager, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..db.models import Tenant
+from ..deps import get_read_db, get_read_sessions
+from ..logging import get_logger
+from ..services.export import MEDIA_TYPES, ExportFormat, ExportKind, accepts_gzip, stream_export
+
+router = APIRouter(prefix="/tenants", tags=["exports"])
+logger = get_logger(__name__)
+
+
+@router.get("/{tenant_id}/export/{kind}")
+async def export_tenant(
+    tenant_id: uuid.UUID,
+    kind: ExportKind,
+    request: Request,
+    format: ExportFormat = Query(ExportFormat.ndjson, description="Output format"),
+    db: AsyncSession = Depends(get_read_db),
+    sessions: Callable[[], AsyncContextManager[AsyncSession]] = Depends(get_read_sessions),
+) -> StreamingResponse:
+    """Stream all of a tenant's threads or messages as NDJSON or CSV, read from a replica.
+
+    The body is gzip-encoded when the client accepts it.
+    """
+    exists = await db.scalar(select(Tenant.id).where(Tenant.id == tenant_id))
+    if exists is None:
+        logger.warning("Tenant not found", tenant_id=str(tenant_id))
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    compress = accepts_gzip(request.headers.get("accept-encoding", ""))
+    extension = "csv" if format is ExportFormat.csv else "ndjson"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{tenant_id}-{kind.value}.{extension}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        stream_export(sessions, tenant_id, kind, format, compress=compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
@@ -1,50 +1,53 @@
-"""Health check router."""
+"""Health check router.
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+``/livez`` touches nothing and only shows the process is serving requests.
+``/readyz`` and ``/healthz`` answer from the background health checker's
+latest report.
+"""
 
-from ..deps import get_db, get_redis
+from typing import Any
+
+from fastapi import APIRouter, HTTPException
+
+from ..core.health import health_checker
 from ..logging import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
 
 
+@router.get("/livez")
+async def livez() -> dict[str, str]:
+    """Liveness probe; no dependency checks."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz() -> dict[str, Any]:
+    """Readiness probe with dependency latency and pool saturation."""
+    report = await health_checker.current()
+    body = {
+        "status": "ok" if report.ok else "error",
+        "checked_at": report.checked_at,
+        "age_seconds": round(report.age_seconds(), 3),
+        "checks": report.checks,
+    }
+    if not report.ok:
+        raise HTTPException(status_code=503, detail=body)
+    return body
+
+
 @router.get("/healthz")
-async def healthz(
-    db: AsyncSession = Depends(get_db),
-    redis = Depends(get_redis),
-):
+async def healthz() -> dict[str, Any]:
     """Health check endpoint with database and Redis connectivity."""
+    report = await health_checker.current()
     health_status = {
-        "status": "ok",
+        "status": "ok" if report.ok else "error",
         "checks": {
-            "database": "unknown",
-            "redis": "unknown",
-        }
+            "database": report.checks["database"]["status"],
+            "redis": report.checks["redis"]["status"],
+        },
     }
-    
-    # Check database connectivity
-    try:
-        result = await db.execute(text("SELECT 1"))
-        result.scalar()
-        health_status["checks"]["database"] = "ok"
-    except Exception as e:
-        logger.error("Database health check failed", error=str(e))
-        health_status["checks"]["database"] = "error"
-        health_status["status"] = "error"
-    
-    # Check Redis connectivity
-    try:
-        await redis.ping()
-        health_status["checks"]["redis"] = "ok"
-    except Exception as e:
-        logger.error("Redis health check failed", error=str(e))
-        health_status["checks"]["redis"] = "error"
-        health_status["status"] = "error"
-    
     if health_status["status"] == "error":
         raise HTTPException(status_code=503, detail=health_status)
-    
     return health_status
@@ -0,0 +1,54 @@
+"""Internal operational endpoints (not part of the public API).
+
+They require ``Authorization: Bearer <internal_api_token>`` and do not exist
+while that setting is unset.
+"""
+
+import hmac
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from ..config import settings
+from ..core.cache import cache_stats
+from ..db.pool import pool_status
+from ..db.replicas import replica_set
+from ..db.session import get_engine
+
+
+
+async def _require_token(authorization: Optional[str] = Header(None)) -> None:
+    expected = settings.internal_api_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401, detail="Invalid internal API token", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(_require_token)],
+)
+
+
+@router.get("/cache")
+async def get_cache_stats() -> dict[str, dict[str, Any]]:
+    """Hit/miss counters of the entity caches in this worker."""
+    return cache_stats()
+
+
+@router.get("/db/pool")
+async def get_pool_status() -> dict[str, Any]:
+    """Connection pool occupancy, checkout waits and timeouts in this worker."""
+    return pool_status(get_engine().pool)
+
+
+@router.get("/db/replicas")
+async def get_replica_status() -> dict[str, Any]:
+    """Health, replay lag and connections in use of each read replica."""
+    return {"selection": replica_set.selection, "replicas": replica_set.status()}
@@ -0,0 +1,37 @@
+"""Knowledge-base router with read-only operations."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.embeddings import get_encoder
+from ..core.query_budget import query_budget
+from ..db.models import KBArticle
+from ..db.semantic import nearest
+from ..deps import get_read_db
+from ..logging import get_logger
+from ..schemas.kb import KBArticleHit, KBArticleResponse
+
+router = APIRouter(prefix="/kb", tags=["kb"])
+logger = get_logger(__name__)
+
+
+@router.get("/search", response_model=list[KBArticleHit], dependencies=[Depends(query_budget(2))])
+async def search_articles(
+    tenant_id: uuid.UUID = Query(..., description="Tenant to search"),
+    q: str = Query(..., min_length=1, max_length=2000, description="Question or text to match"),
+    limit: int = Query(5, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[KBArticleHit]:
+    """Knowledge-base articles nearest in meaning to ``q``, closest first."""
+
+    (vector,) = await get_encoder().encode([q])
+    hits = await nearest(db, KBArticle, tenant_id, vector, limit)
+
+    logger.info("Searched knowledge base", tenant_id=str(tenant_id), returned=len(hits), limit=limit)
+
+    return [
+        KBArticleHit(**KBArticleResponse.model_validate(article).model_dump(), distance=distance)
+        for article, distance in hits
+    ]
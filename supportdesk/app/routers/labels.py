@@ -0,0 +1,75 @@
+"""Tenant label vocabulary router."""
+
+import uuid
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.cache import label_cache
+from ..core.query_budget import query_budget
+from ..db.labels import label_counts
+from ..db.models import Label, Tenant
+from ..db.models.thread import ThreadStatus
+from ..deps import get_read_db, get_session_factory
+from ..logging import get_logger
+from ..schemas.label import LabelCount, LabelCountsResponse, LabelResponse
+
+router = APIRouter(prefix="/tenants", tags=["labels"])
+logger = get_logger(__name__)
+
+_labels_adapter = TypeAdapter(list[LabelResponse])
+
+
+@router.get("/{tenant_id}/labels", response_model=list[LabelResponse], dependencies=[Depends(query_budget(2))])
+async def list_labels(
+    tenant_id: uuid.UUID,
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> Response:
+    """Get a tenant's label vocabulary, ordered by name."""
+
+    async def load_labels(db: AsyncSession) -> str | None:
+        exists = await db.scalar(select(Tenant.id).where(Tenant.id == tenant_id))
+        if exists is None:
+            return None
+        labels = (
+            await db.scalars(select(Label).where(Label.tenant_id == tenant_id).order_by(Label.name))
+        ).all()
+        return _labels_adapter.dump_json(_labels_adapter.validate_python(labels, from_attributes=True)).decode()
+
+    payload = await label_cache.get_or_load(tenant_id, load_labels, sessions)
+
+    if payload is None:
+        logger.warning("Tenant not found", tenant_id=str(tenant_id))
+        raise HTTPException(status_code=404, detail="Tenant not found")
+
+    logger.info("Retrieved labels", tenant_id=str(tenant_id))
+
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get(
+    "/{tenant_id}/labels/counts",
+    response_model=LabelCountsResponse,
+    dependencies=[Depends(query_budget(1))],
+)
+async def get_label_counts(
+    tenant_id: uuid.UUID,
+    status: Optional[ThreadStatus] = Query(None, description="Only count threads in this status"),
+    db: AsyncSession = Depends(get_read_db),
+) -> LabelCountsResponse:
+    """Thread counts per label and status, from the incrementally maintained counts table."""
+    counts = await label_counts(db, tenant_id, status.value if status else None)
+
+    logger.info("Retrieved label counts", tenant_id=str(tenant_id), labels=len(counts))
+
+    return LabelCountsResponse(
+        tenant_id=tenant_id,
+        labels=[
+            LabelCount(label=label, counts=by_status, total=sum(by_status.values()))
+            for label, by_status in counts.items()
+        ],
+    )
@@ -0,0 +1,202 @@
+"""Message router with read-only operations."""
+
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from ..config import settings
+from ..core.embeddings import get_encoder
+from ..core.query_budget import query_budget
+from ..db.counting import count_total
+from ..db.models import Message, MessageDirection
+from ..db.pagination import paginate, split_page
+from ..db.search import search_messages, search_position
+from ..db.semantic import nearest
+from ..deps import get_read_db
+from ..logging import get_logger
+from ..schemas.common import (
+    CountStrategy,
+    PaginatedResponse,
+    PaginationParams,
+    encode_cursor,
+)
+from ..schemas.message import MessageResponse, MessageSearchHit, MessageSimilarHit
+
+router = APIRouter(prefix="/messages", tags=["messages"])
+logger = get_logger(__name__)
+
+
+@router.get("", response_model=PaginatedResponse[MessageResponse], dependencies=[Depends(query_budget(3))])
+async def list_messages(
+    tenant_id: Optional[uuid.UUID] = Query(None, description="Filter by tenant ID"),
+    thread_id: Optional[uuid.UUID] = Query(None, description="Filter by thread ID"),
+    direction: Optional[MessageDirection] = Query(None, description="Filter by direction"),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaginatedResponse[MessageResponse]:
+    """List messages with their thread summary, newest first."""
+    
+    base_stmt = select(Message)
+    if tenant_id:
+        base_stmt = base_stmt.where(Message.tenant_id == tenant_id)
+    if thread_id:
+        base_stmt = base_stmt.where(Message.thread_id == thread_id)
+    if direction:
+        base_stmt = base_stmt.where(Message.direction == direction.value)
+    
+    try:
+        stmt = paginate(
+            base_stmt.options(joinedload(Message.thread)), Message.created_at, Message.id, pagination
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    
+    total = await count_total(
+        db,
+        base_stmt,
+        pagination.count,
+        table="messages",
+        tenant_id=tenant_id,
+        filters={"thread_id": thread_id, "direction": direction},
+    )
+    
+    result = await db.execute(stmt)
+    messages, has_more, next_cursor = split_page(result.scalars().all(), pagination.limit)
+    
+    message_responses = [MessageResponse.model_validate(message) for message in messages]
+    
+    logger.info(
+        "Listed messages",
+        total=total,
+        returned=len(message_responses),
+        tenant_id=str(tenant_id) if tenant_id else None,
+        thread_id=str(thread_id) if thread_id else None,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=pagination.cursor is not None,
+        count=pagination.count.value,
+    )
+    
+    return PaginatedResponse.create(
+        items=message_responses,
+        total=total,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=pagination.count,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PaginatedResponse[MessageSearchHit],
+    dependencies=[Depends(query_budget(1))],
+)
+async def search(
+    tenant_id: uuid.UUID = Query(..., description="Tenant to search"),
+    q: str = Query(..., min_length=1, max_length=256, description="Search terms; quoted phrases, or, -term"),
+    lang: Optional[str] = Query(None, max_length=10, description="Language of the search terms"),
+    thread_id: Optional[uuid.UUID] = Query(None, description="Only search this thread"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaginatedResponse[MessageSearchHit]:
+    """Full-text search over a tenant's messages, best matches first."""
+
+    try:
+        position = search_position(cursor) if cursor is not None else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+    stmt = search_messages(
+        tenant_id,
+        q,
+        db.get_bind().dialect.name,
+        language=lang or settings.search_default_language,
+        limit=limit,
+        position=position,
+        thread_id=thread_id,
+    ).options(joinedload(Message.thread))
+    rows = (await db.execute(stmt)).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(rows[-1].rank, rows[-1].Message.id) if has_more else None
+    hits = [
+        MessageSearchHit(**MessageResponse.model_validate(message).model_dump(), rank=rank, snippet=snippet)
+        for message, rank, snippet in rows
+    ]
+
+    logger.info(
+        "Searched messages",
+        tenant_id=str(tenant_id),
+        thread_id=str(thread_id) if thread_id else None,
+        returned=len(hits),
+        limit=limit,
+        cursor=cursor is not None,
+    )
+
+    return PaginatedResponse.create(
+        items=hits,
+        total=None,
+        limit=limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=CountStrategy.none,
+    )
+
+
+@router.get(
+    "/similar",
+    response_model=list[MessageSimilarHit],
+    dependencies=[Depends(query_budget(2))],
+)
+async def similar(
+    tenant_id: uuid.UUID = Query(..., description="Tenant to search"),
+    q: str = Query(..., min_length=1, max_length=2000, description="Text to find similar messages to"),
+    thread_id: Optional[uuid.UUID] = Query(None, description="Only search this thread"),
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+) -> list[MessageSimilarHit]:
+    """Nearest messages by embedding, closest first; unembedded messages are not found."""
+
+    (vector,) = await get_encoder().encode([q])
+    criteria = [Message.thread_id == thread_id] if thread_id else []
+    hits = await nearest(db, Message, tenant_id, vector, limit, *criteria, options=[joinedload(Message.thread)])
+
+    logger.info(
+        "Searched similar messages",
+        tenant_id=str(tenant_id),
+        thread_id=str(thread_id) if thread_id else None,
+        returned=len(hits),
+        limit=limit,
+    )
+
+    return [
+        MessageSimilarHit(**MessageResponse.model_validate(message).model_dump(), distance=distance)
+        for message, distance in hits
+    ]
+
+
+@router.get("/{message_id}", response_model=MessageResponse, dependencies=[Depends(query_budget(1))])
+async def get_message(
+    message_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+) -> MessageResponse:
+    """Get a specific message by ID, with its thread summary."""
+    
+    stmt = select(Message).options(joinedload(Message.thread)).where(Message.id == message_id)
+    message = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if message is None:
+        logger.warning("Message not found", message_id=str(message_id))
+        raise HTTPException(status_code=404, detail="Message not found")
+    
+    logger.info("Retrieved message", message_id=str(message_id))
+    
+    return MessageResponse.model_validate(message)
@@ -0,0 +1,14 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..core.metrics import render_metrics
+
+router = APIRouter(tags=["metrics"], include_in_schema=False)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Metrics of this worker in the Prometheus text exposition format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
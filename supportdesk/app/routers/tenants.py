@@ -3,75 +3,92 @@
 import uuid
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from ..core.cache import tenant_cache
+from ..core.query_budget import query_budget
+from ..db.counting import count_total
 from ..db.models import Tenant
-from ..deps import get_db
+from ..db.pagination import paginate, schema_columns, split_page
+from ..deps import get_read_db, get_session_factory
 from ..logging import get_logger
-from ..schemas.common import PaginatedResponse, PaginationParams
+from ..schemas.common import PaginatedResponse, PaginationParams, dump_page
 from ..schemas.tenant import TenantResponse
 
 router = APIRouter(prefix="/tenants", tags=["tenants"])
 logger = get_logger(__name__)
 
 
-@router.get("", response_model=PaginatedResponse)
+@router.get("", response_model=PaginatedResponse[TenantResponse], dependencies=[Depends(query_budget(3))])
 async def list_tenants(
     pagination: PaginationParams = Depends(),
-    db: AsyncSession = Depends(get_db),
-) -> PaginatedResponse:
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
     """List all tenants with pagination."""
     
+    base_stmt = select(Tenant)
+    try:
+        # Plain columns: rows are validated straight into the response, no ORM objects
+        stmt = paginate(
+            base_stmt.with_only_columns(*schema_columns(Tenant, TenantResponse)),
+            Tenant.created_at,
+            Tenant.id,
+            pagination,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    
     # Get total count
-    count_stmt = select(func.count(Tenant.id))
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
+    total = await count_total(db, base_stmt, pagination.count, table="tenants")
     
     # Get paginated results
-    stmt = (
-        select(Tenant)
-        .order_by(Tenant.created_at.desc())
-        .offset(pagination.skip)
-        .limit(pagination.limit)
-    )
     result = await db.execute(stmt)
-    tenants = result.scalars().all()
-    
-    tenant_responses = [TenantResponse.model_validate(tenant) for tenant in tenants]
+    tenants, has_more, next_cursor = split_page(result.all(), pagination.limit)
     
     logger.info(
         "Listed tenants",
         total=total,
-        returned=len(tenant_responses),
+        returned=len(tenants),
         skip=pagination.skip,
         limit=pagination.limit,
+        cursor=pagination.cursor is not None,
+        count=pagination.count.value,
     )
     
-    return PaginatedResponse.create(
-        items=tenant_responses,
+    payload = dump_page(
+        TenantResponse,
+        items=tenants,
         total=total,
         skip=pagination.skip,
         limit=pagination.limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=pagination.count,
     )
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/{tenant_id}", response_model=TenantResponse)
+@router.get("/{tenant_id}", response_model=TenantResponse, dependencies=[Depends(query_budget(1))])
 async def get_tenant(
     tenant_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
-) -> TenantResponse:
+    sessions: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> Response:
     """Get a specific tenant by ID."""
     
-    stmt = select(Tenant).where(Tenant.id == tenant_id)
-    result = await db.execute(stmt)
-    tenant = result.scalar_one_or_none()
+    async def load_tenant(db: AsyncSession) -> str | None:
+        stmt = select(Tenant).where(Tenant.id == tenant_id)
+        result = await db.execute(stmt)
+        tenant = result.scalar_one_or_none()
+        return TenantResponse.model_validate(tenant).model_dump_json() if tenant else None
+    
+    payload = await tenant_cache.get_or_load(tenant_id, load_tenant, sessions)
     
-    if not tenant:
+    if payload is None:
         logger.warning("Tenant not found", tenant_id=str(tenant_id))
         raise HTTPException(status_code=404, detail="Tenant not found")
     
-    logger.info("Retrieved tenant", tenant_id=str(tenant_id), tenant_name=tenant.name)
+    logger.info("Retrieved tenant", tenant_id=str(tenant_id))
     
-    return TenantResponse.model_validate(tenant)
+    return Response(content=payload, media_type="application/json")
@@ -0,0 +1,108 @@
+"""Thread router with read-only operations."""
+
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from ..core.query_budget import query_budget
+from ..db.counting import count_total
+from ..db.labels import labels_contain
+from ..db.models import Thread
+from ..db.models.thread import ThreadChannel, ThreadStatus
+from ..db.pagination import paginate, split_page
+from ..deps import get_read_db
+from ..logging import get_logger
+from ..schemas.common import PaginatedResponse, PaginationParams
+from ..schemas.thread import ThreadResponse
+
+router = APIRouter(prefix="/threads", tags=["threads"])
+logger = get_logger(__name__)
+
+
+@router.get("", response_model=PaginatedResponse[ThreadResponse], dependencies=[Depends(query_budget(3))])
+async def list_threads(
+    tenant_id: Optional[uuid.UUID] = Query(None, description="Filter by tenant ID"),
+    status: Optional[ThreadStatus] = Query(None, description="Filter by status"),
+    channel: Optional[ThreadChannel] = Query(None, description="Filter by channel"),
+    label: Optional[list[str]] = Query(None, description="Only threads carrying every given label"),
+    pagination: PaginationParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+) -> PaginatedResponse[ThreadResponse]:
+    """List threads with their customer, optionally filtered by tenant, status, channel and labels."""
+    
+    base_stmt = select(Thread)
+    if tenant_id:
+        base_stmt = base_stmt.where(Thread.tenant_id == tenant_id)
+    if status:
+        base_stmt = base_stmt.where(Thread.status == status.value)
+    if channel:
+        base_stmt = base_stmt.where(Thread.channel == channel.value)
+    if label:
+        base_stmt = base_stmt.where(labels_contain(Thread.labels, label, db.get_bind().dialect.name))
+    
+    try:
+        # The customer comes from the same query, not one lazy load per row
+        stmt = paginate(
+            base_stmt.options(joinedload(Thread.customer)), Thread.created_at, Thread.id, pagination
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    
+    total = await count_total(
+        db,
+        base_stmt,
+        pagination.count,
+        table="threads",
+        tenant_id=tenant_id,
+        filters={"status": status, "channel": channel, "labels": ",".join(sorted(set(label))) if label else None},
+    )
+    
+    result = await db.execute(stmt)
+    threads, has_more, next_cursor = split_page(result.scalars().all(), pagination.limit)
+    
+    thread_responses = [ThreadResponse.model_validate(thread) for thread in threads]
+    
+    logger.info(
+        "Listed threads",
+        total=total,
+        returned=len(thread_responses),
+        tenant_id=str(tenant_id) if tenant_id else None,
+        labels=label,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=pagination.cursor is not None,
+        count=pagination.count.value,
+    )
+    
+    return PaginatedResponse.create(
+        items=thread_responses,
+        total=total,
+        skip=pagination.skip,
+        limit=pagination.limit,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        count=pagination.count,
+    )
+
+
+@router.get("/{thread_id}", response_model=ThreadResponse, dependencies=[Depends(query_budget(1))])
+async def get_thread(
+    thread_id: uuid.UUID,
+    db: AsyncSession = Depends(get_read_db),
+) -> ThreadResponse:
+    """Get a specific thread by ID, with its customer."""
+    
+    stmt = select(Thread).options(joinedload(Thread.customer)).where(Thread.id == thread_id)
+    thread = (await db.execute(stmt)).scalar_one_or_none()
+    
+    if thread is None:
+        logger.warning("Thread not found", thread_id=str(thread_id))
+        raise HTTPException(status_code=404, detail="Thread not found")
+    
+    logger.info("Retrieved thread", thread_id=str(thread_id))
+    
+    return ThreadResponse.model_validate(thread)
@@ -0,0 +1,80 @@
+"""Platform webhook endpoints.
+
+Requests are verified and queued on a Redis Stream; parsing and persistence
+happen in the ingestion worker so the platforms get their 200 immediately,
+whatever the state of Postgres.
+"""
+
+import hashlib
+import hmac
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from ..config import settings
+from ..core import redis_client
+from ..db.models.thread import ThreadChannel
+from ..logging import get_logger
+from ..services.ingest import enqueue_webhook
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+logger = get_logger(__name__)
+
+
+def _verify_token(channel: ThreadChannel) -> Optional[str]:
+    return {
+        ThreadChannel.wa: settings.whatsapp_webhook_verify_token,
+        ThreadChannel.ig: settings.instagram_webhook_verify_token,
+        ThreadChannel.fb: settings.facebook_webhook_verify_token,
+    }[channel]
+
+
+def _signature_valid(body: bytes, signature: Optional[str]) -> bool:
+    """Check Meta's ``X-Hub-Signature-256`` header against the app secret."""
+    if not settings.facebook_app_secret:
+        # Unsigned webhooks are only accepted for local development
+        return settings.debug
+    if not signature:
+        return False
+    expected = hmac.new(settings.facebook_app_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+@router.get("/{tenant_id}/{channel}", response_class=PlainTextResponse)
+async def verify_webhook(
+    tenant_id: uuid.UUID,
+    channel: ThreadChannel,
+    mode: str = Query(..., alias="hub.mode"),
+    token: str = Query(..., alias="hub.verify_token"),
+    challenge: str = Query(..., alias="hub.challenge"),
+) -> str:
+    """Answer the platform's subscription handshake."""
+    expected = _verify_token(channel)
+    if mode != "subscribe" or not expected or not hmac.compare_digest(token, expected):
+        logger.warning("Webhook verification failed", tenant_id=str(tenant_id), channel=channel.value)
+        raise HTTPException(status_code=403, detail="Verification failed")
+    return challenge
+
+
+@router.post("/{tenant_id}/{channel}")
+async def receive_webhook(
+    tenant_id: uuid.UUID,
+    channel: ThreadChannel,
+    request: Request,
+) -> dict[str, str]:
+    """Verify and enqueue a webhook delivery."""
+    body = await request.body()
+    if not _signature_valid(body, request.headers.get("x-hub-signature-256")):
+        logger.warning("Webhook signature rejected", tenant_id=str(tenant_id), channel=channel.value)
+        raise HTTPException(status_code=403, detail="Invalid signature")
+
+    try:
+        await enqueue_webhook(tenant_id, channel, body)
+    except redis_client.RedisError as e:
+        # A non-2xx makes the platform redeliver later, so nothing is lost
+        logger.error("Failed to enqueue webhook", channel=channel.value, error=str(e))
+        raise HTTPException(status_code=503, detail="Ingestion unavailable") from e
+
+    return {"status": "accepted"}
@@ -1,10 +1,16 @@
 """Common Pydantic schemas and base classes."""
 
+import base64
+import json
 import uuid
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Generic, Optional, Sequence, TypeVar, Unpack
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from sqlalchemy import Row
+from typing_extensions import TypedDict
 
 
 class BaseSchema(BaseModel):
@@ -30,40 +36,164 @@ class UUIDSchema(BaseSchema):
     id: uuid.UUID
 
 
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset position values into an opaque, URL-safe cursor."""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else str(value) for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor``.
+
+    Raises ``ValueError`` for anything that was not issued by this API.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class CountStrategy(str, Enum):
+    """How the ``total`` of a paginated response is computed."""
+
+    exact = "exact"  # COUNT(*) on every request
+    cached = "cached"  # COUNT(*) cached in Redis per tenant + filter
+    estimated = "estimated"  # planner estimate (pg_class.reltuples / EXPLAIN rows)
+    none = "none"  # no total; rely on has_more
+
+
 class PaginationParams(BaseModel):
-    """Common pagination parameters."""
+    """Common pagination parameters.
+
+    ``skip`` pages with OFFSET; ``cursor`` (the ``next_cursor`` of a previous
+    page) seeks on ``(created_at, id)`` instead and takes precedence over
+    ``skip``, so deep pages cost the same as the first one. ``count`` picks
+    how ``total`` is computed.
+    """
 
-    skip: int = 0
-    limit: int = 100
+    skip: int = Field(0, ge=0)
+    limit: int = Field(100, ge=1, le=1000)
+    cursor: Optional[str] = None
+    count: CountStrategy = CountStrategy.exact
 
     model_config = ConfigDict(
         validate_assignment=True,
         extra="forbid",
     )
 
+    def keyset(self) -> Optional[tuple[datetime, uuid.UUID]]:
+        """Return the ``(created_at, id)`` position encoded in ``cursor``."""
+        if self.cursor is None:
+            return None
+        values = decode_cursor(self.cursor)
+        if len(values) != 2:
+            raise ValueError("Invalid cursor")
+        try:
+            return datetime.fromisoformat(values[0]), uuid.UUID(values[1])
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
 
-class PaginatedResponse(BaseSchema):
+
+ItemT = TypeVar("ItemT")
+
+
+class PaginatedResponse(BaseSchema, Generic[ItemT]):
     """Generic paginated response wrapper."""
 
-    items: list
-    total: int
+    items: list[ItemT]
+    total: Optional[int]
     skip: int
     limit: int
     has_more: bool
+    next_cursor: Optional[str] = None
+    count: CountStrategy = CountStrategy.exact
 
     @classmethod
     def create(
         cls,
-        items: list,
-        total: int,
+        items: list[ItemT],
+        total: Optional[int],
         skip: int = 0,
         limit: int = 100,
-    ) -> "PaginatedResponse":
-        """Create paginated response."""
+        has_more: Optional[bool] = None,
+        next_cursor: Optional[str] = None,
+        count: CountStrategy = CountStrategy.exact,
+    ) -> "PaginatedResponse[ItemT]":
+        """Create paginated response.
+
+        ``total`` is ``None`` for ``CountStrategy.none`` and approximate for
+        ``CountStrategy.estimated``; ``has_more`` should then be passed
+        explicitly rather than derived from it.
+        """
+        has_more = _has_more(items, total, skip, has_more)
         return cls(
             items=items,
             total=total,
             skip=skip,
             limit=limit,
-            has_more=(skip + len(items)) < total,
+            has_more=has_more,
+            next_cursor=next_cursor,
+            count=count,
         )
+
+
+def _has_more(items: Sequence[Any], total: Optional[int], skip: int, has_more: Optional[bool]) -> bool:
+    if has_more is None:
+        return total is not None and (skip + len(items)) < total
+    return has_more
+
+
+@lru_cache(maxsize=None)
+def page_adapter(item_schema: type[BaseModel]) -> TypeAdapter[Any]:
+    """Compiled validator/serializer for a page of ``item_schema`` rows.
+
+    Mirrors ``PaginatedResponse[item_schema]`` field for field, but as
+    TypedDicts: rows are validated into plain dicts instead of one model
+    instance each, and serialize to the same JSON.
+    """
+    item = TypedDict(  # type: ignore[misc]
+        f"{item_schema.__name__}Row",
+        {name: field.annotation for name, field in item_schema.model_fields.items()},
+    )
+    fields = {name: field.annotation for name, field in PaginatedResponse.model_fields.items()}
+    fields["items"] = list[item]
+    return TypeAdapter(TypedDict(f"{item_schema.__name__}Page", fields))  # type: ignore[operator]
+
+
+def dump_page(
+    item_schema: type[BaseModel],
+    items: Sequence[Row[Unpack[tuple[Any, ...]]]],
+    total: Optional[int],
+    skip: int = 0,
+    limit: int = 100,
+    has_more: Optional[bool] = None,
+    next_cursor: Optional[str] = None,
+    count: CountStrategy = CountStrategy.exact,
+) -> bytes:
+    """Validate a page of Core rows in one pass and serialize it to JSON bytes.
+
+    ``items`` are rows selected with ``schema_columns(model, item_schema)``.
+    The bytes match what FastAPI renders for ``PaginatedResponse.create(...)``
+    under ``response_model``, without building ORM objects, per-row models or
+    validating the page twice.
+    """
+    keys = items[0]._fields if items else ()
+    adapter = page_adapter(item_schema)
+    page = adapter.validate_python(
+        {
+            "items": [dict(zip(keys, row, strict=True)) for row in items],
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "has_more": _has_more(items, total, skip, has_more),
+            "next_cursor": next_cursor,
+            "count": count,
+        }
+    )
+    return adapter.dump_json(page)
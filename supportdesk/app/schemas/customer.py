@@ -34,6 +34,8 @@ class CustomerResponse(CustomerBase, UUIDSchema, TimestampSchema):
     """Schema for customer responses."""
 
     tenant_id: uuid.UUID
+    # Validated on the way in; re-parsing every stored address dominated list latency
+    email: Optional[str] = Field(None, description="Email address")
 
 
 class CustomerSummary(UUIDSchema):
@@ -0,0 +1,24 @@
+"""Knowledge-base article Pydantic schemas."""
+
+import uuid
+from typing import Optional
+
+from pydantic import Field
+
+from .common import TimestampSchema, UUIDSchema
+
+
+class KBArticleResponse(UUIDSchema, TimestampSchema):
+    """Schema for knowledge-base article responses."""
+
+    tenant_id: uuid.UUID
+    title: str
+    body: str
+    url: Optional[str] = None
+
+
+class KBArticleHit(KBArticleResponse):
+    """An article close in meaning to a query."""
+
+    distance: float = Field(..., description="Cosine distance to the query; lower is closer")
+
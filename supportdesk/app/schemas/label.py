@@ -38,3 +38,18 @@ class LabelSummary(UUIDSchema):
     """Minimal label schema for references."""
 
     name: str
+
+
+class LabelCount(BaseSchema):
+    """Threads carrying a label, by status."""
+
+    label: str
+    counts: dict[str, int] = Field(..., description="Thread count per status")
+    total: int
+
+
+class LabelCountsResponse(BaseSchema):
+    """Label sidebar counts for a tenant."""
+
+    tenant_id: uuid.UUID
+    labels: list[LabelCount]
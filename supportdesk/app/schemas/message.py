@@ -1,6 +1,7 @@
 """Message Pydantic schemas."""
 
 import uuid
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 from pydantic import Field
@@ -40,6 +41,7 @@ class MessageResponse(MessageBase, UUIDSchema, TimestampSchema):
     tenant_id: uuid.UUID
     thread_id: uuid.UUID
     platform_message_id: Optional[str]
+    sent_at: Optional[datetime] = Field(None, description="When the platform says the message was sent")
     thread: Optional[ThreadSummary] = None
 
 
@@ -48,3 +50,16 @@ class MessageSummary(UUIDSchema):
 
     direction: MessageDirection
     text: Optional[str]
+
+
+class MessageSearchHit(MessageResponse):
+    """A message matching a search, with its rank and highlighted snippet."""
+
+    rank: float = Field(..., description="Relevance; higher ranks first")
+    snippet: Optional[str] = Field(None, description="Matching fragments with terms wrapped in <mark>")
+
+
+class MessageSimilarHit(MessageResponse):
+    """A message close in meaning to a query."""
+
+    distance: float = Field(..., description="Cosine distance to the query; lower is closer")
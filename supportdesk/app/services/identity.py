@@ -0,0 +1,260 @@
+"""Resolve platform identities to customers, creating the missing ones.
+
+An identity is ``(tenant_id, platform, platform_user_id)``, unique per
+customer (``uq_customer_platform_user``). A resolved identity never points
+at another customer later, so the mapping is cached first in this worker's
+memory, then in Redis for every worker. Whatever neither tier knows is
+resolved for the whole batch in one statement that inserts the new customers
+and reads the existing ones.
+
+Deleting customers, or a tenant and with it its customers, drops the
+tenant's mappings from Redis and clears this worker's memory once the delete
+commits. Other workers keep theirs for up to
+``customer_identity_local_ttl_seconds``, and a resolve that read a customer
+just before the delete may re-cache its id; inserts for such a customer then
+fail their foreign key until the entry expires.
+
+Only customers that were already committed are cached. Ids created by the
+caller's transaction are cached the next time they are seen, so a rollback
+never leaves the cache pointing at a customer that does not exist.
+"""
+
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Mapping, Optional
+
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..core.local_cache import LocalCache
+from ..core import redis_client
+from ..core.redis_client import get_redis_client
+from ..db.listeners import ChangedRow, on_commit, record_changes
+from ..db.models import Customer
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+IDENTITY_PREFIX = "supportdesk:identity:customer"
+
+Identity = tuple[uuid.UUID, str, str]  # tenant_id, platform, platform_user_id
+
+# Inserts run in key order so concurrent batches take unique-index locks in
+# the same order. Rows a concurrent transaction commits while this statement
+# runs are neither inserted (conflict) nor visible to its snapshot; callers
+# retry those.
+RESOLVE = text(
+    """
+WITH input AS (
+    SELECT * FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:tenant_ids AS uuid[]), CAST(:platforms AS text[]),
+        CAST(:platform_user_ids AS text[]), CAST(:phones AS text[])
+    ) AS i(id, tenant_id, platform, platform_user_id, phone)
+), created AS (
+    INSERT INTO customers (id, tenant_id, platform, platform_user_id, phone)
+    SELECT id, tenant_id, platform, platform_user_id, phone FROM input
+    ORDER BY tenant_id, platform, platform_user_id
+    ON CONFLICT ON CONSTRAINT uq_customer_platform_user DO NOTHING
+    RETURNING id, tenant_id, platform, platform_user_id
+)
+SELECT id, tenant_id, platform, platform_user_id, true AS created FROM created
+UNION ALL
+SELECT c.id, c.tenant_id, c.platform, c.platform_user_id, false AS created
+FROM customers c JOIN input i USING (tenant_id, platform, platform_user_id)
+"""
+)
+
+_RESOLVE_ATTEMPTS = 3
+
+
+@dataclass
+class IdentityStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    resolved: int = 0
+    created: int = 0
+    round_trips: int = 0
+    errors: int = 0
+
+
+class CustomerResolver:
+    """Map identities to customer ids in bulk."""
+
+    def __init__(self, *, ttl_seconds: int, local: Optional[LocalCache] = None):
+        self.ttl_seconds = ttl_seconds
+        self.local = local
+        self.stats = IdentityStats()
+
+    def key(self, identity: Identity) -> str:
+        tenant_id, platform, platform_user_id = identity
+        return f"{IDENTITY_PREFIX}:{tenant_id}:{platform}:{platform_user_id}"
+
+    async def resolve_many(
+        self, session: AsyncSession, identities: Mapping[Identity, Optional[str]]
+    ) -> dict[Identity, uuid.UUID]:
+        """Customer id for every identity; ``identities`` maps each to the phone for new customers.
+
+        New customers are inserted in ``session``'s transaction, which the
+        caller commits.
+        """
+        resolved: dict[Identity, uuid.UUID] = {}
+        missing = list(identities)
+        if self.local is not None:
+            for identity in missing:
+                cached = self.local.get(self.key(identity))
+                if cached is not None:
+                    resolved[identity] = uuid.UUID(cached)
+            self.stats.local_hits += len(resolved)
+            missing = [identity for identity in missing if identity not in resolved]
+        if not missing:
+            return resolved
+
+        try:
+            redis = await get_redis_client()
+            values = await redis.mget([self.key(identity) for identity in missing])
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Identity cache unavailable", error=str(e))
+            values = [None] * len(missing)
+        for identity, value in zip(missing, values, strict=True):
+            if value is not None:
+                resolved[identity] = uuid.UUID(value)
+                self._remember_locally(identity, value)
+                self.stats.redis_hits += 1
+        missing = [identity for identity in missing if identity not in resolved]
+        if not missing:
+            return resolved
+
+        existing = await self._resolve(session, {identity: identities[identity] for identity in missing}, resolved)
+        await self._remember(existing)
+        return resolved
+
+    async def _resolve(
+        self,
+        session: AsyncSession,
+        identities: Mapping[Identity, Optional[str]],
+        resolved: dict[Identity, uuid.UUID],
+    ) -> dict[Identity, uuid.UUID]:
+        """Resolve from the database into ``resolved``; returns the already committed ones."""
+        existing: dict[Identity, uuid.UUID] = {}
+        pending = dict(identities)
+        for _ in range(_RESOLVE_ATTEMPTS):
+            if session.get_bind().dialect.name == "postgresql":
+                rows = await self._upsert(session, pending)
+            else:
+                rows = await self._select_then_insert(session, pending)
+            self.stats.round_trips += 1
+            for customer_id, identity, created in rows:
+                resolved[identity] = customer_id
+                pending.pop(identity, None)
+                if created:
+                    self.stats.created += 1
+                else:
+                    existing[identity] = customer_id
+            if not pending:
+                break
+        else:
+            raise RuntimeError(f"Could not resolve {len(pending)} customer identities")
+        self.stats.resolved += len(identities)
+        return existing
+
+    async def _upsert(
+        self, session: AsyncSession, identities: Mapping[Identity, Optional[str]]
+    ) -> list[tuple[uuid.UUID, Identity, bool]]:
+        keys = list(identities)
+        result = await session.execute(
+            RESOLVE,
+            {
+                "ids": [uuid.uuid4() for _ in keys],
+                "tenant_ids": [tenant_id for tenant_id, _, _ in keys],
+                "platforms": [platform for _, platform, _ in keys],
+                "platform_user_ids": [platform_user_id for _, _, platform_user_id in keys],
+                "phones": [identities[key] for key in keys],
+            },
+        )
+        rows = [(row.id, (row.tenant_id, row.platform, row.platform_user_id), row.created) for row in result]
+        record_changes(
+            session,
+            (
+                ChangedRow("customers", customer_id, identity[0], "insert")
+                for customer_id, identity, created in rows
+                if created
+            ),
+        )
+        return rows
+
+    async def _select_then_insert(
+        self, session: AsyncSession, identities: Mapping[Identity, Optional[str]]
+    ) -> list[tuple[uuid.UUID, Identity, bool]]:
+        # Other dialects (SQLite in tests) have no unnest; not safe under concurrency
+        stmt = select(Customer.id, Customer.tenant_id, Customer.platform, Customer.platform_user_id).where(
+            tuple_(Customer.tenant_id, Customer.platform, Customer.platform_user_id).in_(list(identities))
+        )
+        rows = [(row.id, (row.tenant_id, row.platform, row.platform_user_id), False) for row in await session.execute(stmt)]
+        found = {identity for _, identity, _ in rows}
+        for identity in sorted(set(identities) - found):
+            customer = Customer(
+                tenant_id=identity[0], platform=identity[1], platform_user_id=identity[2], phone=identities[identity]
+            )
+            session.add(customer)
+            await session.flush()
+            rows.append((customer.id, identity, True))
+        return rows
+
+    def _remember_locally(self, identity: Identity, customer_id: str) -> None:
+        if self.local is not None:
+            self.local.set(self.key(identity), customer_id)
+
+    async def _remember(self, customers: Mapping[Identity, uuid.UUID]) -> None:
+        if not customers:
+            return
+        for identity, customer_id in customers.items():
+            self._remember_locally(identity, str(customer_id))
+        try:
+            redis = await get_redis_client()
+            async with redis.pipeline(transaction=False) as pipe:
+                for identity, customer_id in customers.items():
+                    pipe.set(self.key(identity), str(customer_id), ex=self.ttl_seconds)
+                await pipe.execute()
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Failed to populate identity cache", error=str(e))
+
+    async def forget_tenants(self, tenant_ids: Iterable[uuid.UUID]) -> None:
+        """Drop every cached identity of ``tenant_ids`` from Redis and this worker's memory."""
+        if self.local is not None:
+            # Deletes are rare; clearing beats tracking which local keys belong to a tenant
+            self.local.clear()
+        redis = await get_redis_client()
+        for tenant_id in tenant_ids:
+            keys = [key async for key in redis.scan_iter(match=f"{IDENTITY_PREFIX}:{tenant_id}:*", count=1000)]
+            if keys:
+                await redis.delete(*keys)
+
+    def stats_dict(self) -> dict[str, Any]:
+        stats = asdict(self.stats)
+        if self.local is not None:
+            stats["local"] = self.local.stats_dict()
+        return stats
+
+
+def _local() -> Optional[LocalCache]:
+    if settings.customer_identity_local_max_entries <= 0:
+        return None
+    return LocalCache(
+        ttl_seconds=settings.customer_identity_local_ttl_seconds,
+        max_entries=settings.customer_identity_local_max_entries,
+        max_bytes=settings.local_cache_max_bytes,
+    )
+
+
+customer_resolver = CustomerResolver(ttl_seconds=settings.customer_identity_ttl_seconds, local=_local())
+
+
+@on_commit("tenants", "customers")
+async def forget_deleted_customers(changes: list[ChangedRow]) -> None:
+    # Deleting a tenant cascades to its customers in the database, unseen by the session
+    tenant_ids = {row.tenant_id for row in changes if row.op == "delete" and row.tenant_id is not None}
+    if tenant_ids:
+        await customer_resolver.forget_tenants(tenant_ids)
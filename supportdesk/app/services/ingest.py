@@ -0,0 +1,199 @@
+"""Webhook ingestion: enqueue raw payloads, persist them in batches from a stream."""
+
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..core.debounce import touch_inbound
+from ..core.metrics import ingest_unknown_tenant_messages
+from ..core.redis_client import get_redis_client
+from ..core.sla import track_sla
+from ..core.streams import StreamConsumer, StreamEntry
+from ..db.bulk import insert_messages
+from ..db.models import Message, MessageDirection, Tenant
+from ..db.models.thread import ThreadChannel
+from ..db.session import get_db_session
+from ..logging import get_logger
+from .identity import customer_resolver
+from .threads import Conversation, ThreadRequest, thread_resolver
+from .webhooks import InboundMessage, parse_webhook
+
+logger = get_logger(__name__)
+
+INGEST_STREAM = "supportdesk:ingest"
+INGEST_GROUP = "ingest"
+
+
+async def enqueue_webhook(tenant_id: uuid.UUID, channel: ThreadChannel, body: bytes) -> str:
+    """Append a verified raw webhook body to the ingestion stream."""
+    redis = await get_redis_client()
+    entry_id: str = await redis.xadd(
+        INGEST_STREAM,
+        {
+            "tenant_id": str(tenant_id),
+            "channel": channel.value,
+            "body": body,
+            "received_at": f"{time.time():.6f}",
+        },
+        maxlen=settings.ingest_stream_maxlen,
+        approximate=True,
+    )
+    return entry_id
+
+
+@dataclass
+class IngestResult:
+    """Outcome of persisting a batch of inbound messages."""
+
+    received: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    unknown_tenant: int = 0
+    unknown_tenant_ids: set[uuid.UUID] = field(default_factory=set)
+    # (tenant_id, thread_id) of every newly stored inbound message
+    inbound: list[tuple[uuid.UUID, uuid.UUID]] = field(default_factory=list)
+    # (tenant_id, thread_id) of every newly stored outbound message
+    outbound: list[tuple[uuid.UUID, uuid.UUID]] = field(default_factory=list)
+
+
+async def persist_messages(session: AsyncSession, messages: Sequence[InboundMessage]) -> IngestResult:
+    """Upsert customers, threads and messages for a batch in a few round trips."""
+    result = IngestResult(received=len(messages))
+    if not messages:
+        return result
+
+    tenant_ids = {m.tenant_id for m in messages}
+    known = set(
+        (await session.execute(select(Tenant.id).where(Tenant.id.in_(tenant_ids)))).scalars()
+    )
+    if known != tenant_ids:
+        result.unknown_tenant = sum(m.tenant_id not in known for m in messages)
+        result.unknown_tenant_ids = tenant_ids - known
+        messages = [m for m in messages if m.tenant_id in known]
+        if not messages:
+            return result
+
+    customer_ids = await customer_resolver.resolve_many(
+        session, {(m.tenant_id, m.channel.value, m.platform_user_id): m.phone for m in messages}
+    )
+    # The first message names the customer of a new thread; any inbound one reopens a closed thread
+    threads: dict[Conversation, ThreadRequest] = {}
+    for m in messages:
+        key = (m.tenant_id, m.channel.value, m.platform_thread_id)
+        first = threads.get(key)
+        threads[key] = ThreadRequest(
+            customer_id=first.customer_id if first else customer_ids[(m.tenant_id, m.channel.value, m.platform_user_id)],
+            reopen=(first is not None and first.reopen) or m.direction == MessageDirection.inbound,
+        )
+    thread_ids = await thread_resolver.resolve_many(session, threads)
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "tenant_id": m.tenant_id,
+            "thread_id": thread_ids[(m.tenant_id, m.channel.value, m.platform_thread_id)],
+            "platform_message_id": m.platform_message_id,
+            "direction": m.direction.value,
+            "text": m.text,
+            "media": m.media,
+            "sent_at": m.sent_at,
+        }
+        for m in messages
+    ]
+    written = await insert_messages(
+        session, rows, returning=(Message.tenant_id, Message.thread_id, Message.direction)
+    )
+    result.inserted = written.inserted
+    result.duplicates = written.duplicates
+    result.inbound = [
+        (row.tenant_id, row.thread_id)
+        for row in written.rows
+        if row.direction == MessageDirection.inbound.value
+    ]
+    result.outbound = [
+        (row.tenant_id, row.thread_id)
+        for row in written.rows
+        if row.direction == MessageDirection.outbound.value
+    ]
+    return result
+
+
+async def handle_ingest_batch(entries: list[StreamEntry]) -> dict[str, str]:
+    """Parse and persist a batch of stream entries; returns entries to dead-letter."""
+    dead: dict[str, str] = {}
+    parsed: list[tuple[str, list[InboundMessage]]] = []
+    for entry_id, fields in entries:
+        try:
+            messages = parse_webhook(
+                ThreadChannel(fields["channel"]),
+                uuid.UUID(fields["tenant_id"]),
+                json.loads(fields["body"]),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            dead[entry_id] = f"unparseable payload: {e!r}"
+            continue
+        parsed.append((entry_id, messages))
+
+    try:
+        async with get_db_session() as session:
+            result = await persist_messages(session, [m for _, ms in parsed for m in ms])
+    except (IntegrityError, DataError):
+        # One bad payload must not block the batch: retry entry by entry and
+        # dead-letter only the ones that fail on their own.
+        result = IngestResult()
+        for entry_id, messages in parsed:
+            try:
+                async with get_db_session() as session:
+                    single = await persist_messages(session, messages)
+            except (IntegrityError, DataError) as e:
+                dead[entry_id] = f"rejected by database: {e.orig!r}"
+                continue
+            result.received += single.received
+            result.inserted += single.inserted
+            result.duplicates += single.duplicates
+            result.unknown_tenant += single.unknown_tenant
+            result.unknown_tenant_ids |= single.unknown_tenant_ids
+            result.inbound += single.inbound
+            result.outbound += single.outbound
+
+    if result.unknown_tenant:
+        # Acked all the same: redelivery cannot make the tenant exist
+        ingest_unknown_tenant_messages.inc(amount=result.unknown_tenant)
+        logger.warning(
+            "Dropped webhook messages for unknown tenants",
+            messages=result.unknown_tenant,
+            tenant_ids=sorted(str(tenant_id) for tenant_id in result.unknown_tenant_ids),
+        )
+
+    await touch_inbound(result.inbound)
+    await track_sla(result.inbound, result.outbound)
+
+    logger.info(
+        "Ingested webhook batch",
+        entries=len(entries),
+        received=result.received,
+        inserted=result.inserted,
+        duplicates=result.duplicates,
+        unknown_tenant=result.unknown_tenant,
+        dead=len(dead),
+    )
+    return dead
+
+
+def ingest_consumer() -> StreamConsumer:
+    """Consumer-group worker draining the ingestion stream."""
+    return StreamConsumer(
+        INGEST_STREAM,
+        INGEST_GROUP,
+        handle_ingest_batch,
+        batch_size=settings.ingest_batch_size,
+        block_ms=settings.ingest_block_ms,
+        claim_idle_ms=settings.ingest_claim_idle_ms,
+    )
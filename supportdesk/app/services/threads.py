@@ -0,0 +1,360 @@
+"""Resolve incoming conversations to threads, creating and reopening as needed.
+
+A conversation is ``(tenant_id, channel, platform_thread_id)``, unique per
+thread (``uq_thread_platform``). Like customer identities, the mapping to a
+thread id never changes and is cached in memory and in Redis. Statuses do
+change, so they are cached in Redis only, by thread id, and dropped by the
+``threads`` commit hook whenever a thread is updated through the ORM.
+
+A batch is served from the caches when every thread's id is known and no
+inbound message arrived on a thread that may be closed. All other threads go
+to the database in one statement. That statement inserts the new threads,
+reads the existing ones, and reopens closed threads that got an inbound
+message. The reopen is an ``UPDATE ... WHERE status = 'closed'``, so it is
+atomic against a concurrent close or reopen.
+
+Every message counts as activity on its thread, but ``updated_at`` is only
+bumped once it is ``thread_touch_interval_seconds`` old, so a busy thread
+gets one new row version per interval rather than one per batch. The
+statement bumps the existing threads it reads; threads served from the
+caches get the same bump in one ``UPDATE`` by id. Both lock in id order and
+skip threads another batch holds, which is then bumping them anyway, so
+concurrent consumers neither wait nor deadlock here. Neither bump goes
+through the commit hook, so cached statuses survive it.
+"""
+
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import func, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..core.cache import thread_status_key
+from ..core.local_cache import LocalCache
+from ..core import redis_client
+from ..core.redis_client import get_redis_client
+from ..db.listeners import ChangedRow, record_changes
+from ..db.models import Thread, ThreadStatus
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+THREAD_IDENTITY_PREFIX = "supportdesk:identity:thread"
+
+Conversation = tuple[uuid.UUID, str, str]  # tenant_id, channel, platform_thread_id
+
+# Statuses an inbound message leaves alone
+_NO_REOPEN = {ThreadStatus.open.value, ThreadStatus.paused.value}
+
+RESOLVE = text(
+    """
+WITH input AS (
+    SELECT * FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:tenant_ids AS uuid[]), CAST(:channels AS text[]),
+        CAST(:platform_thread_ids AS text[]), CAST(:customer_ids AS uuid[]), CAST(:reopen AS boolean[])
+    ) AS i(id, tenant_id, channel, platform_thread_id, customer_id, reopen)
+), created AS (
+    INSERT INTO threads (id, tenant_id, channel, platform_thread_id, customer_id, status, labels)
+    SELECT id, tenant_id, channel, platform_thread_id, customer_id, 'open', '[]'::jsonb FROM input
+    ORDER BY tenant_id, channel, platform_thread_id
+    ON CONFLICT ON CONSTRAINT uq_thread_platform DO NOTHING
+    RETURNING id, tenant_id, channel, platform_thread_id
+), reopened AS (
+    UPDATE threads t SET status = 'open', updated_at = now()
+    FROM input i
+    WHERE i.reopen AND t.status = 'closed'
+      AND t.tenant_id = i.tenant_id AND t.channel = i.channel AND t.platform_thread_id = i.platform_thread_id
+    RETURNING t.id
+), stale AS (
+    SELECT t.id FROM threads t
+    JOIN input i USING (tenant_id, channel, platform_thread_id)
+    WHERE NOT (i.reopen AND t.status = 'closed') AND t.updated_at < CAST(:touch_before AS timestamptz)
+    ORDER BY t.id
+    FOR UPDATE OF t SKIP LOCKED
+), touched AS (
+    UPDATE threads t SET updated_at = now() FROM stale s WHERE t.id = s.id
+)
+SELECT id, tenant_id, channel, platform_thread_id, 'open' AS status, true AS created, false AS reopened
+FROM created
+UNION ALL
+SELECT t.id, t.tenant_id, t.channel, t.platform_thread_id,
+       CASE WHEN r.id IS NULL THEN t.status ELSE 'open' END, false, r.id IS NOT NULL
+FROM threads t
+JOIN input i USING (tenant_id, channel, platform_thread_id)
+LEFT JOIN reopened r ON r.id = t.id
+"""
+)
+
+_RESOLVE_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class ThreadRequest:
+    """What a batch needs of one conversation's thread."""
+
+    customer_id: Optional[uuid.UUID]
+    # An inbound message arrived: a closed thread is reopened
+    reopen: bool = False
+
+
+@dataclass
+class ThreadResolverStats:
+    local_hits: int = 0
+    redis_hits: int = 0
+    cache_served: int = 0
+    resolved: int = 0
+    created: int = 0
+    reopened: int = 0
+    round_trips: int = 0
+    errors: int = 0
+
+
+class ThreadResolver:
+    """Map conversations to thread ids in bulk."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int,
+        status_ttl_seconds: int,
+        touch_after_seconds: float,
+        local: Optional[LocalCache] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.status_ttl_seconds = status_ttl_seconds
+        self.touch_after_seconds = touch_after_seconds
+        self.local = local
+        self.stats = ThreadResolverStats()
+
+    def key(self, conversation: Conversation) -> str:
+        tenant_id, channel, platform_thread_id = conversation
+        return f"{THREAD_IDENTITY_PREFIX}:{tenant_id}:{channel}:{platform_thread_id}"
+
+    async def resolve_many(
+        self, session: AsyncSession, requests: Mapping[Conversation, ThreadRequest]
+    ) -> dict[Conversation, uuid.UUID]:
+        """Thread id for every conversation.
+
+        New threads are created open; closed threads whose request has
+        ``reopen`` set are reopened. Both happen in ``session``'s transaction,
+        which the caller commits.
+        """
+        known = await self._cached_ids(list(requests))
+        reopen = [c for c in known if requests[c].reopen]
+        statuses = await self._cached_statuses([known[c] for c in reopen])
+        # Known id and nothing to reopen (or known not to need it): only the updated_at bump
+        settled = {c: thread_id for c, thread_id in known.items() if not requests[c].reopen}
+        settled.update({c: known[c] for c, status in zip(reopen, statuses, strict=True) if status in _NO_REOPEN})
+        self.stats.cache_served += len(settled)
+        if settled:
+            await self._touch(session, list(settled.values()))
+
+        pending = {c: request for c, request in requests.items() if c not in settled}
+        if pending:
+            settled.update(await self._resolve(session, pending))
+        return settled
+
+    def _touch_before(self) -> datetime:
+        return datetime.now(timezone.utc) - timedelta(seconds=self.touch_after_seconds)
+
+    async def _touch(self, session: AsyncSession, thread_ids: list[uuid.UUID]) -> None:
+        """Bump ``updated_at`` of threads that got a message and were not otherwise written."""
+        stale = (
+            select(Thread.id)
+            .where(Thread.id.in_(thread_ids), Thread.updated_at < self._touch_before())
+            .order_by(Thread.id)
+            .with_for_update(skip_locked=True)
+            .cte("stale")
+        )
+        await session.execute(
+            update(Thread)
+            .where(Thread.id.in_(select(stale.c.id)))
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _cached_ids(self, conversations: list[Conversation]) -> dict[Conversation, uuid.UUID]:
+        known: dict[Conversation, uuid.UUID] = {}
+        if self.local is not None:
+            for conversation in conversations:
+                cached = self.local.get(self.key(conversation))
+                if cached is not None:
+                    known[conversation] = uuid.UUID(cached)
+            self.stats.local_hits += len(known)
+        missing = [c for c in conversations if c not in known]
+        if not missing:
+            return known
+        try:
+            redis = await get_redis_client()
+            cached = await redis.mget([self.key(c) for c in missing])
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Thread cache unavailable", error=str(e))
+            return known
+        for conversation, value in zip(missing, cached, strict=True):
+            if value is not None:
+                known[conversation] = uuid.UUID(value)
+                if self.local is not None:
+                    self.local.set(self.key(conversation), value)
+                self.stats.redis_hits += 1
+        return known
+
+    async def _cached_statuses(self, thread_ids: list[uuid.UUID]) -> list[Optional[str]]:
+        if not thread_ids:
+            return []
+        try:
+            redis = await get_redis_client()
+            statuses: list[Optional[str]] = await redis.mget([thread_status_key(thread_id) for thread_id in thread_ids])
+            return statuses
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Thread status cache unavailable", error=str(e))
+            return [None] * len(thread_ids)
+
+    async def _resolve(
+        self, session: AsyncSession, requests: Mapping[Conversation, ThreadRequest]
+    ) -> dict[Conversation, uuid.UUID]:
+        resolved: dict[Conversation, uuid.UUID] = {}
+        # Committed threads this batch did not modify: their id and status are cacheable
+        existing: dict[Conversation, tuple[uuid.UUID, str]] = {}
+        reopened: list[uuid.UUID] = []
+        pending = dict(requests)
+        for _ in range(_RESOLVE_ATTEMPTS):
+            if session.get_bind().dialect.name == "postgresql":
+                rows = await self._upsert(session, pending)
+            else:
+                rows = await self._select_then_write(session, pending)
+            self.stats.round_trips += 1
+            for thread_id, conversation, status, created, was_reopened in rows:
+                resolved[conversation] = thread_id
+                pending.pop(conversation, None)
+                if created:
+                    self.stats.created += 1
+                elif was_reopened:
+                    self.stats.reopened += 1
+                    reopened.append(thread_id)
+                else:
+                    existing[conversation] = (thread_id, status)
+            if not pending:
+                break
+        else:
+            raise RuntimeError(f"Could not resolve {len(pending)} threads")
+        self.stats.resolved += len(requests)
+        await self._remember(existing, reopened)
+        return resolved
+
+    async def _upsert(
+        self, session: AsyncSession, requests: Mapping[Conversation, ThreadRequest]
+    ) -> list[tuple[uuid.UUID, Conversation, str, bool, bool]]:
+        keys = list(requests)
+        result = await session.execute(
+            RESOLVE,
+            {
+                "ids": [uuid.uuid4() for _ in keys],
+                "tenant_ids": [tenant_id for tenant_id, _, _ in keys],
+                "channels": [channel for _, channel, _ in keys],
+                "platform_thread_ids": [platform_thread_id for _, _, platform_thread_id in keys],
+                "customer_ids": [requests[key].customer_id for key in keys],
+                "reopen": [requests[key].reopen for key in keys],
+                "touch_before": self._touch_before(),
+            },
+        )
+        rows = [
+            (row.id, (row.tenant_id, row.channel, row.platform_thread_id), row.status, row.created, row.reopened)
+            for row in result
+        ]
+        record_changes(
+            session,
+            (
+                ChangedRow("threads", thread_id, conversation[0], "insert" if created else "update")
+                for thread_id, conversation, _, created, reopened in rows
+                if created or reopened
+            ),
+        )
+        return rows
+
+    async def _select_then_write(
+        self, session: AsyncSession, requests: Mapping[Conversation, ThreadRequest]
+    ) -> list[tuple[uuid.UUID, Conversation, str, bool, bool]]:
+        # Other dialects (SQLite in tests) have no unnest; not safe under concurrency
+        stmt = select(Thread).where(
+            tuple_(Thread.tenant_id, Thread.channel, Thread.platform_thread_id).in_(list(requests))
+        )
+        threads: dict[Conversation, Thread] = {
+            (t.tenant_id, t.channel, t.platform_thread_id): t for t in (await session.scalars(stmt)).all()
+        }
+        rows = []
+        untouched = []
+        for conversation in sorted(requests):
+            request = requests[conversation]
+            thread = threads.get(conversation)
+            if thread is None:
+                tenant_id, channel, platform_thread_id = conversation
+                thread = Thread(
+                    tenant_id=tenant_id,
+                    channel=channel,
+                    platform_thread_id=platform_thread_id,
+                    customer_id=request.customer_id,
+                )
+                session.add(thread)
+                await session.flush()
+                rows.append((thread.id, conversation, ThreadStatus.open.value, True, False))
+            elif request.reopen and thread.status == ThreadStatus.closed.value:
+                thread.status = ThreadStatus.open
+                await session.flush()
+                rows.append((thread.id, conversation, ThreadStatus.open.value, False, True))
+            else:
+                rows.append((thread.id, conversation, thread.status, False, False))
+                untouched.append(thread.id)
+        if untouched:
+            await self._touch(session, untouched)
+        return rows
+
+    async def _remember(
+        self, existing: Mapping[Conversation, tuple[uuid.UUID, str]], reopened: list[uuid.UUID]
+    ) -> None:
+        if self.local is not None:
+            for conversation, (thread_id, _) in existing.items():
+                self.local.set(self.key(conversation), str(thread_id))
+        if not existing and not reopened:
+            return
+        try:
+            redis = await get_redis_client()
+            async with redis.pipeline(transaction=False) as pipe:
+                for conversation, (thread_id, status) in existing.items():
+                    pipe.set(self.key(conversation), str(thread_id), ex=self.ttl_seconds)
+                    pipe.set(thread_status_key(thread_id), status, ex=self.status_ttl_seconds)
+                if reopened:
+                    # Not cached as open until committed; the next lookup reads it back
+                    pipe.delete(*(thread_status_key(thread_id) for thread_id in reopened))
+                await pipe.execute()
+        except redis_client.RedisError as e:
+            self.stats.errors += 1
+            logger.warning("Failed to populate thread cache", error=str(e))
+
+    def stats_dict(self) -> dict[str, Any]:
+        stats = asdict(self.stats)
+        if self.local is not None:
+            stats["local"] = self.local.stats_dict()
+        return stats
+
+
+def _local() -> Optional[LocalCache]:
+    if settings.thread_identity_local_max_entries <= 0:
+        return None
+    return LocalCache(
+        ttl_seconds=settings.thread_identity_ttl_seconds,
+        max_entries=settings.thread_identity_local_max_entries,
+        max_bytes=settings.local_cache_max_bytes,
+    )
+
+
+thread_resolver = ThreadResolver(
+    ttl_seconds=settings.thread_identity_ttl_seconds,
+    status_ttl_seconds=settings.thread_status_ttl_seconds,
+    touch_after_seconds=settings.thread_touch_interval_seconds,
+    local=_local(),
+)
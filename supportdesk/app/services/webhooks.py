@@ -0,0 +1,100 @@
+"""Normalization of Meta platform webhook payloads (WhatsApp, Instagram, Messenger)."""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from ..db.models.message import MessageDirection
+from ..db.models.thread import ThreadChannel
+
+
+@dataclass(frozen=True)
+class InboundMessage:
+    """A message received through a platform webhook, in platform-neutral form."""
+
+    tenant_id: uuid.UUID
+    channel: ThreadChannel
+    platform_user_id: str
+    platform_thread_id: str
+    platform_message_id: str
+    direction: MessageDirection
+    sent_at: datetime
+    text: Optional[str] = None
+    media: Optional[dict[str, Any]] = None
+    phone: Optional[str] = field(default=None, compare=False)
+
+
+def parse_webhook(
+    channel: ThreadChannel, tenant_id: uuid.UUID, payload: dict[str, Any]
+) -> list[InboundMessage]:
+    """Extract the messages carried by a webhook payload.
+
+    Delivery/read receipts and other non-message notifications yield nothing.
+    Raises ``KeyError``/``TypeError``/``ValueError`` on malformed payloads.
+    """
+    if channel is ThreadChannel.wa:
+        return _parse_whatsapp(tenant_id, payload)
+    return _parse_messaging(channel, tenant_id, payload)
+
+
+def _parse_whatsapp(tenant_id: uuid.UUID, payload: dict[str, Any]) -> list[InboundMessage]:
+    messages = []
+    for entry in payload.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value", {})
+            for msg in value.get("messages", []):
+                msg_type = msg.get("type", "text")
+                text = msg["text"]["body"] if msg_type == "text" else None
+                media = None
+                if msg_type != "text" and isinstance(msg.get(msg_type), dict):
+                    media = {"type": msg_type, **msg[msg_type]}
+                    text = media.get("caption")
+                messages.append(
+                    InboundMessage(
+                        tenant_id=tenant_id,
+                        channel=ThreadChannel.wa,
+                        platform_user_id=msg["from"],
+                        platform_thread_id=msg["from"],
+                        platform_message_id=msg["id"],
+                        direction=MessageDirection.inbound,
+                        sent_at=datetime.fromtimestamp(int(msg["timestamp"]), tz=timezone.utc),
+                        text=text,
+                        media=media,
+                        phone=msg["from"],
+                    )
+                )
+    return messages
+
+
+def _parse_messaging(
+    channel: ThreadChannel, tenant_id: uuid.UUID, payload: dict[str, Any]
+) -> list[InboundMessage]:
+    messages = []
+    for entry in payload.get("entry", []):
+        for event in entry.get("messaging", []):
+            msg = event.get("message")
+            if not msg:
+                continue
+            # Echoes are copies of messages the page itself sent
+            if msg.get("is_echo"):
+                direction = MessageDirection.outbound
+                user_id = event["recipient"]["id"]
+            else:
+                direction = MessageDirection.inbound
+                user_id = event["sender"]["id"]
+            attachments = msg.get("attachments")
+            messages.append(
+                InboundMessage(
+                    tenant_id=tenant_id,
+                    channel=channel,
+                    platform_user_id=user_id,
+                    platform_thread_id=user_id,
+                    platform_message_id=msg["mid"],
+                    direction=direction,
+                    sent_at=datetime.fromtimestamp(event["timestamp"] / 1000, tz=timezone.utc),
+                    text=msg.get("text"),
+                    media={"attachments": attachments} if attachments else None,
+                )
+            )
+    return messages
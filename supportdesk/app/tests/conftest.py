@@ -2,17 +2,23 @@
 
 import asyncio
 import uuid
-from typing import AsyncGenerator, Generator
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Callable, Generator
 
 import pytest
 import pytest_asyncio
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
 
+from ..config import settings
+from ..core import redis_client
+from ..db import bulk
 from ..db.base import Base
-from ..db.session import AsyncSessionLocal
+from ..deps import get_db, get_read_db, get_read_sessions, get_session_factory
 from ..main import app
 
 
@@ -27,6 +33,64 @@ test_engine = create_async_engine(
 )
 
 
+@pytest.fixture(autouse=True)
+def strict_query_budgets(monkeypatch):
+    """Make routes that exceed their query budget fail the test."""
+    monkeypatch.setattr(settings, "query_budget_strict", True)
+
+
+class FakeCopySession:
+    """Just enough of an AsyncSession for the bulk COPY paths."""
+
+    def __init__(self):
+        self.sync_session = SimpleNamespace(info={})
+        self.statements: list[Any] = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return SimpleNamespace(all=list)
+
+
+class FakeCopyDriver:
+    """asyncpg connection whose COPY rejects records holding ``bad`` with ``error``."""
+
+    def __init__(self, bad: object, error: Exception):
+        self.bad = bad
+        self.error = error
+        self.copied: list[tuple[Any, ...]] = []
+
+    async def copy_records_to_table(self, table_name, *, records, columns):
+        if any(self.bad in record for record in records):
+            raise self.error
+        self.copied.extend(records)
+
+
+@pytest.fixture
+def fake_copy(monkeypatch) -> Callable[[object, Exception], FakeCopyDriver]:
+    """Route every bulk write through COPY on a fake asyncpg connection."""
+
+    def install(bad: object, error: Exception) -> FakeCopyDriver:
+        driver = FakeCopyDriver(bad, error)
+
+        async def driver_connection(session):
+            return driver
+
+        monkeypatch.setattr(bulk, "_driver_connection", driver_connection)
+        monkeypatch.setattr(settings, "bulk_copy_min_rows", 1)
+        return driver
+
+    return install
+
+
+@pytest_asyncio.fixture
+async def fake_redis(monkeypatch) -> AsyncGenerator[FakeRedis, None]:
+    """In-memory Redis, Lua scripting included, in place of the shared client."""
+    redis = FakeRedis(server=FakeServer(), decode_responses=True)
+    monkeypatch.setattr(redis_client, "_redis_client", redis)
+    yield redis
+    await redis.aclose()
+
+
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create test database session."""
@@ -35,7 +99,7 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.create_all)
     
     # Create session
-    async with AsyncSession(test_engine) as session:
+    async with AsyncSession(test_engine, expire_on_commit=False) as session:
         yield session
     
     # Drop tables
@@ -51,7 +115,30 @@ def client() -> Generator[TestClient, None, None]:
 
 
 @pytest_asyncio.fixture
-async def async_client() -> AsyncGenerator[AsyncClient, None, None]:
+async def db_client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
+    """Create async test client whose requests use the test database session."""
+
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: async_sessionmaker(
+        test_engine, expire_on_commit=False
+    )
+    app.dependency_overrides[get_read_sessions] = app.dependency_overrides[get_session_factory]
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        app.dependency_overrides.pop(get_session_factory, None)
+        app.dependency_overrides.pop(get_read_sessions, None)
+
+
+@pytest_asyncio.fixture
+async def async_client() -> AsyncGenerator[AsyncClient, None]:
     """Create async test client."""
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
@@ -0,0 +1,66 @@
+import json
+import uuid
+
+import pytest
+from asyncpg.exceptions import StringDataRightTruncationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DataError
+
+from ..config import settings
+from ..db.bulk import EVENT_COLUMNS, MESSAGE_COLUMNS, _chunks, _records, insert_events, insert_messages
+from ..db.models import Event, Message
+from .conftest import FakeCopySession
+
+
+def test_records_follow_column_order_and_encode_json():
+    columns = [Message.__table__.c[name] for name in MESSAGE_COLUMNS]
+    tenant_id, thread_id = uuid.uuid4(), uuid.uuid4()
+    [record] = _records(
+        columns,
+        [{"tenant_id": tenant_id, "thread_id": thread_id, "direction": "inbound", "media": {"type": "image"}}],
+    )
+    values = dict(zip(MESSAGE_COLUMNS, record, strict=True))
+    assert isinstance(values["id"], uuid.UUID)
+    assert values["tenant_id"] == tenant_id
+    assert values["thread_id"] == thread_id
+    assert json.loads(values["media"]) == {"type": "image"}
+    assert values["text"] is None
+
+
+def test_records_apply_defaults_only_when_missing():
+    columns = [Event.__table__.c[name] for name in EVENT_COLUMNS]
+    event_id = uuid.uuid4()
+    records = _records(columns, [{"id": event_id, "ts": "given"}, {}], {"ts": lambda: "default"})
+    assert records[0][0] == event_id and records[0][-1] == "given"
+    assert isinstance(records[1][0], uuid.UUID) and records[1][-1] == "default"
+
+
+def test_chunks():
+    assert [len(c) for c in _chunks(list(range(7)), 3)] == [3, 3, 1]
+
+
+async def test_copy_rejections_raise_like_the_insert_path(fake_copy):
+    fake_copy("x" * 300, StringDataRightTruncationError("value too long for type character varying(255)"))
+    rows = [
+        {"tenant_id": uuid.uuid4(), "thread_id": uuid.uuid4(), "direction": "inbound", "platform_message_id": pid}
+        for pid in ("ok", "x" * 300)
+    ]
+    with pytest.raises(DataError) as caught:
+        await insert_messages(FakeCopySession(), rows)
+    assert isinstance(caught.value.orig, StringDataRightTruncationError)
+
+
+@pytest.mark.parametrize("copy", [False, True])
+async def test_events_skip_rows_already_stored(monkeypatch, fake_copy, copy):
+    if copy:
+        fake_copy(object(), Exception("unused"))
+    else:
+        monkeypatch.setattr(settings, "bulk_copy_min_rows", 10)
+    session = FakeCopySession()
+    rows = [{"tenant_id": uuid.uuid4(), "thread_id": uuid.uuid4(), "type": "ack_sent"} for _ in range(3)]
+    await insert_events(session, rows)
+
+    # A retried row must hit the same key: id and ts are filled in place
+    assert all(row["id"] and row["ts"] for row in rows)
+    sql = [str(statement.compile(dialect=postgresql.dialect())) for statement in session.statements]
+    assert any("INSERT INTO events" in s and "ON CONFLICT (id, ts) DO NOTHING" in s for s in sql)
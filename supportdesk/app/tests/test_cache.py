@@ -0,0 +1,117 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+
+from ..config import settings
+from ..core import cache as cache_module
+from ..core.cache import EntityCache
+from ..db.models import Label, Tenant
+
+
+async def test_get_tenant(db_client, db_session):
+    tenant = Tenant(name="Cached Tenant")
+    db_session.add(tenant)
+    await db_session.commit()
+
+    for _ in range(2):
+        r = await db_client.get(f"/tenants/{tenant.id}")
+        assert r.status_code == 200
+        assert r.json()["name"] == "Cached Tenant"
+
+
+async def test_get_missing_tenant_404(db_client):
+    missing = uuid.uuid4()
+    for _ in range(2):
+        r = await db_client.get(f"/tenants/{missing}")
+        assert r.status_code == 404
+
+
+async def test_list_labels(db_client, db_session):
+    tenant = Tenant(name="Labelled Tenant")
+    db_session.add(tenant)
+    await db_session.flush()
+    db_session.add_all([Label(tenant_id=tenant.id, name=name) for name in ("urgent", "billing")])
+    await db_session.commit()
+
+    r = await db_client.get(f"/tenants/{tenant.id}/labels")
+    assert r.status_code == 200
+    assert [label["name"] for label in r.json()] == ["billing", "urgent"]
+
+    r = await db_client.get(f"/tenants/{uuid.uuid4()}/labels")
+    assert r.status_code == 404
+
+
+async def test_cache_stats(db_client, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_token", "ops-token")
+    r = await db_client.get("/internal/cache", headers={"Authorization": "Bearer ops-token"})
+    assert r.status_code == 200
+    assert {"tenant", "customer", "labels"} <= set(r.json())
+    assert "hits" in r.json()["tenant"]
+    assert "hit_rate" in r.json()["tenant"]["local"]
+
+
+async def test_internal_endpoints_require_the_token(db_client, monkeypatch):
+    monkeypatch.setattr(settings, "internal_api_token", None)
+    assert (await db_client.get("/internal/cache")).status_code == 404
+
+    monkeypatch.setattr(settings, "internal_api_token", "ops-token")
+    for headers in ({}, {"Authorization": "Bearer wrong"}, {"Authorization": "ops-token"}):
+        for path in ("/internal/cache", "/internal/db/pool", "/internal/db/replicas"):
+            assert (await db_client.get(path, headers=headers)).status_code == 401
+
+
+async def test_concurrent_misses_share_a_load_in_its_own_session(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache_module, "_caches", {})
+    cache = EntityCache("widget", ttl_seconds=60, negative_ttl_seconds=5)
+    opened, closed = [], []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    @asynccontextmanager
+    async def sessions():
+        session = object()
+        opened.append(session)
+        yield session
+        closed.append(session)
+
+    async def loader(session) -> str:
+        assert session in opened and session not in closed
+        started.set()
+        await release.wait()
+        return '{"id": 1}'
+
+    waiters = [asyncio.create_task(cache.get_or_load("1", loader, sessions)) for _ in range(3)]
+    await started.wait()
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*waiters) == ['{"id": 1}'] * 3
+    assert cache.stats.misses == 3
+    assert cache.stats.loads == 1
+    assert len(opened) == 1 and closed == opened
+
+    assert await cache.get_or_load("1", loader, sessions) == '{"id": 1}'
+    assert cache.stats.hits == 1
+    assert len(opened) == 1
+
+
+async def test_load_racing_an_invalidation_is_not_cached(monkeypatch, fake_redis):
+    monkeypatch.setattr(cache_module, "_caches", {})
+    cache = EntityCache("widget", ttl_seconds=60, negative_ttl_seconds=5)
+
+    @asynccontextmanager
+    async def sessions():
+        yield object()
+
+    async def loader(session) -> str:
+        # A write commits (and invalidates) after this load read the row
+        await cache.invalidate("1")
+        return '{"id": 1, "name": "old"}'
+
+    assert await cache.get_or_load("1", loader, sessions) == '{"id": 1, "name": "old"}'
+    assert await fake_redis.get(cache.key("1")) is None
+    assert await fake_redis.get(f"{cache.key('1')}:lock") is None
+
+    async def fresh(session) -> str:
+        return '{"id": 1, "name": "new"}'
+
+    assert await cache.get_or_load("1", fresh, sessions) == '{"id": 1, "name": "new"}'
+    assert await fake_redis.get(cache.key("1")) == '{"id": 1, "name": "new"}'
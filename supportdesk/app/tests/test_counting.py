@@ -0,0 +1,176 @@
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from ..db import counting, listeners
+from ..db.base import Base
+from ..db.counting import count_total
+from ..db.listeners import ChangedRow, on_commit, record_changes, run_commit_hooks
+from ..db.models import Customer, Tenant
+from ..db.replicas import REPLICA_INFO_KEY
+from ..schemas.common import CountStrategy
+
+
+@pytest.fixture
+def isolated_hooks(monkeypatch):
+    """Hooks registered by a test are gone after it; the app's stay registered."""
+    hooks = defaultdict(list, {table: list(registered) for table, registered in listeners._hooks.items()})
+    monkeypatch.setattr(listeners, "_hooks", hooks)
+
+
+async def _seed(db_session, customers: int) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(customers):
+        db_session.add(
+            Customer(
+                tenant_id=tenant.id,
+                platform="wa",
+                platform_user_id=str(i),
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    await db_session.commit()
+    return tenant
+
+
+async def test_list_customers_exact_total(db_client, db_session):
+    tenant = await _seed(db_session, 3)
+    r = await db_client.get("/customers", params={"tenant_id": str(tenant.id), "limit": 2})
+    body = r.json()
+    assert body["total"] == 3
+    assert body["count"] == "exact"
+    assert body["has_more"] is True
+    assert len(body["items"]) == 2
+
+
+async def test_list_customers_without_total(db_client, db_session):
+    tenant = await _seed(db_session, 3)
+    params = {"tenant_id": str(tenant.id), "limit": 2, "count": "none"}
+    body = (await db_client.get("/customers", params=params)).json()
+    assert body["total"] is None
+    assert body["has_more"] is True
+
+    params["cursor"] = body["next_cursor"]
+    body = (await db_client.get("/customers", params=params)).json()
+    assert len(body["items"]) == 1
+    assert body["has_more"] is False
+    assert body["next_cursor"] is None
+
+
+async def test_cached_total_served_until_invalidated(db_client, db_session, fake_redis):
+    tenant = await _seed(db_session, 3)
+    params = {"tenant_id": str(tenant.id), "limit": 2, "count": "cached"}
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 3
+
+    # Committed without running the hooks: the cached total is still served
+    db_session.add(Customer(tenant_id=tenant.id, platform="wa", platform_user_id="3"))
+    await db_session.commit()
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 3
+
+    await run_commit_hooks(db_session)
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 4
+
+
+async def test_core_writes_invalidate_cached_total(db_client, db_session, fake_redis):
+    tenant_id = (await _seed(db_session, 3)).id
+    params = {"tenant_id": str(tenant_id), "limit": 2, "count": "cached"}
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 3
+
+    async def write_customer(platform_user_id: str) -> None:
+        customer_id = uuid.uuid4()
+        await db_session.execute(
+            insert(Customer).values(id=customer_id, tenant_id=tenant_id, platform="wa", platform_user_id=platform_user_id)
+        )
+        record_changes(db_session, [ChangedRow("customers", customer_id, tenant_id, "insert")])
+
+    # A rolled back write leaves the cache alone
+    await write_customer("3")
+    await db_session.rollback()
+    await run_commit_hooks(db_session)
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 3
+
+    await write_customer("4")
+    await db_session.commit()
+    await run_commit_hooks(db_session)
+    assert (await db_client.get("/customers", params=params)).json()["total"] == 4
+
+
+async def test_cached_total_is_counted_on_the_primary_for_replica_reads(db_session, fake_redis, monkeypatch):
+    tenant = await _seed(db_session, 3)
+    monkeypatch.setattr(counting, "get_sessionmaker", lambda: async_sessionmaker(db_session.bind))
+
+    # A replica that has not replayed the seed yet
+    lagging = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with lagging.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    stmt = select(Customer).where(Customer.tenant_id == tenant.id)
+    try:
+        async with async_sessionmaker(lagging)() as replica:
+            replica.info[REPLICA_INFO_KEY] = "replica-1"
+            for _ in range(2):
+                total = await count_total(
+                    replica, stmt, CountStrategy.cached, table="customers", tenant_id=tenant.id
+                )
+                assert total == 3
+    finally:
+        await lagging.dispose()
+
+
+async def test_count_racing_an_invalidation_is_not_cached(db_session, fake_redis, monkeypatch):
+    tenant = await _seed(db_session, 3)
+    stmt = select(Customer).where(Customer.tenant_id == tenant.id)
+    exact = counting._exact_count
+
+    async def racing_count(db, stmt):
+        total = await exact(db, stmt)
+        # A write commits (and invalidates) after this count read the table
+        await counting.drop_cached_counts("customers", [tenant.id])
+        return total
+
+    monkeypatch.setattr(counting, "_exact_count", racing_count)
+    assert await count_total(db_session, stmt, CountStrategy.cached, table="customers", tenant_id=tenant.id) == 3
+    key = counting._cache_key("customers", tenant.id)
+    assert await fake_redis.hget(key, "-") is None
+
+    monkeypatch.setattr(counting, "_exact_count", exact)
+    assert await count_total(db_session, stmt, CountStrategy.cached, table="customers", tenant_id=tenant.id) == 3
+    assert await fake_redis.hget(key, "-") == "3"
+    assert await fake_redis.ttl(key) > 0
+
+
+async def test_estimated_total_falls_back_to_exact(db_client, db_session):
+    # SQLite has no planner statistics to estimate from
+    tenant = await _seed(db_session, 3)
+    params = {"tenant_id": str(tenant.id), "limit": 2, "count": "estimated"}
+    body = (await db_client.get("/customers", params=params)).json()
+    assert body["total"] == 3
+    assert body["count"] == "estimated"
+
+
+async def test_commit_hooks_receive_committed_changes(db_session, isolated_hooks):
+    seen: list[ChangedRow] = []
+
+    @on_commit("tenants")
+    async def record(changes):
+        seen.extend(changes)
+
+    tenant = Tenant(name="Hooked")
+    db_session.add(tenant)
+    await db_session.commit()
+    await run_commit_hooks(db_session)
+    assert any(row.id == tenant.id and row.op == "insert" for row in seen)
+
+    seen.clear()
+    db_session.add(Tenant(name="Rolled back"))
+    await db_session.flush()
+    await db_session.rollback()
+    await run_commit_hooks(db_session)
+    assert seen == []
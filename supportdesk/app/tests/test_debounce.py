@@ -0,0 +1,91 @@
+import asyncio
+import uuid
+from datetime import timedelta
+
+from ..core.debounce import DUE_KEY, INFLIGHT_KEY, WINDOWS_KEY, ClosedWindow, DebounceEngine
+
+T0 = 1_700_000_000.0
+
+
+def _engine() -> DebounceEngine:
+    return DebounceEngine(8, 15, 2, lease_seconds=30, claim_batch=10, poll_interval_seconds=0.1)
+
+
+def test_closed_window_from_token():
+    tenant_id, thread_id = uuid.uuid4(), uuid.uuid4()
+    token = f"{tenant_id}:{thread_id}|1700000000000|3|1700000012500"
+    window = ClosedWindow.from_token(token)
+    assert window.tenant_id == tenant_id
+    assert window.thread_id == thread_id
+    assert window.messages == 3
+    assert window.closed_at - window.started_at == timedelta(seconds=12.5)
+    assert window.token == token
+
+
+async def test_touch_opens_then_widens_up_to_the_cap(fake_redis):
+    engine = _engine()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    member = f"{thread[0]}:{thread[1]}"
+
+    assert await engine.touch_many([thread], now=T0) == [thread]
+    assert await fake_redis.zscore(DUE_KEY, member) == T0 * 1000 + 8000
+
+    # Each message widens the window by the increment, counted from that message
+    assert await engine.touch_many([thread], now=T0 + 1) == []
+    assert await fake_redis.zscore(DUE_KEY, member) == (T0 + 1) * 1000 + 10000
+
+    # Never due later than debounce_max_seconds after the first message
+    for second in range(2, 8):
+        await engine.touch_many([thread], now=T0 + second)
+    assert await fake_redis.zscore(DUE_KEY, member) == T0 * 1000 + 15000
+    assert await engine.open_windows() == 1
+
+
+async def test_claim_closes_due_windows_once(fake_redis):
+    engine = _engine()
+    quiet, busy = (uuid.uuid4(), uuid.uuid4()), (uuid.uuid4(), uuid.uuid4())
+    await engine.touch_many([quiet, busy, busy], now=T0)
+    await engine.touch_many([busy], now=T0 + 5)
+
+    assert await engine.claim_expired(now=T0 + 7) == []
+    [window] = await engine.claim_expired(now=T0 + 9)
+    assert (window.tenant_id, window.thread_id) == quiet
+    assert window.messages == 1
+    assert window.closed_at - window.started_at == timedelta(seconds=8)
+
+    [window] = await engine.claim_expired(now=T0 + 16)
+    assert (window.tenant_id, window.thread_id) == busy
+    assert window.messages == 3
+    assert window.closed_at - window.started_at == timedelta(seconds=15)
+    assert await engine.open_windows() == 0
+    assert await fake_redis.hlen(WINDOWS_KEY) == 0
+    assert await engine.claim_expired(now=T0 + 20) == []
+
+
+async def test_unacked_windows_are_reclaimed_after_the_lease(fake_redis):
+    engine = _engine()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    await engine.touch_many([thread], now=T0)
+    [window] = await engine.claim_expired(now=T0 + 10)
+
+    # Leased: no other poller gets it until the lease runs out
+    assert await engine.claim_expired(now=T0 + 39) == []
+    assert await engine.claim_expired(now=T0 + 41) == [window]
+
+    await engine.ack([window])
+    assert await fake_redis.zcard(INFLIGHT_KEY) == 0
+    assert await engine.claim_expired(now=T0 + 100) == []
+
+
+async def test_failed_handler_leaves_window_leased(fake_redis):
+    engine = _engine()
+    stop = asyncio.Event()
+
+    async def failing(windows):
+        stop.set()
+        raise RuntimeError("events not stored")
+
+    engine.handlers = [failing]
+    await engine.touch_many([(uuid.uuid4(), uuid.uuid4())], now=T0)
+    await asyncio.wait_for(engine.run(stop), timeout=5)
+    assert await fake_redis.zcard(INFLIGHT_KEY) == 1
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from ..core.query_budget import QueryBudgetExceeded, QueryCounter, QueryCountMiddleware, check_budget, query_budget
+from ..db.models import Customer, Event, Message, Tenant, Thread
+
+
+async def _seed(db_session, threads: int) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(threads):
+        customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id=str(i))
+        db_session.add(customer)
+        await db_session.flush()
+        thread = Thread(
+            tenant_id=tenant.id,
+            channel="wa",
+            platform_thread_id=f"t{i}",
+            customer_id=customer.id,
+            created_at=start + timedelta(minutes=i),
+        )
+        db_session.add(thread)
+        await db_session.flush()
+        db_session.add(
+            Message(
+                tenant_id=tenant.id,
+                thread_id=thread.id,
+                platform_message_id=f"m{i}",
+                direction="inbound",
+                text="hi",
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+        db_session.add(
+            Event(tenant_id=tenant.id, thread_id=thread.id, type="ack_sent", ts=start + timedelta(minutes=i))
+        )
+    await db_session.commit()
+    db_session.expunge_all()
+    return tenant
+
+
+async def test_list_threads_includes_customers(db_client, db_session):
+    tenant = await _seed(db_session, 5)
+    r = await db_client.get("/threads", params={"tenant_id": str(tenant.id), "limit": 3})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] == 5
+    assert [item["customer"]["platform_user_id"] for item in body["items"]] == ["4", "3", "2"]
+
+    r = await db_client.get("/threads", params={"tenant_id": str(tenant.id), "cursor": body["next_cursor"]})
+    assert [item["platform_thread_id"] for item in r.json()["items"]] == ["t1", "t0"]
+
+
+async def test_list_messages_and_events_include_thread(db_client, db_session):
+    tenant = await _seed(db_session, 4)
+    body = (await db_client.get("/messages", params={"tenant_id": str(tenant.id)})).json()
+    assert [item["thread"]["platform_thread_id"] for item in body["items"]] == ["t3", "t2", "t1", "t0"]
+
+    body = (await db_client.get("/events", params={"tenant_id": str(tenant.id), "limit": 2})).json()
+    assert [item["thread"]["platform_thread_id"] for item in body["items"]] == ["t3", "t2"]
+    assert body["next_cursor"]
+
+
+async def test_detail_routes_load_relations(db_client, db_session):
+    tenant = await _seed(db_session, 1)
+    thread = (await db_client.get("/threads", params={"tenant_id": str(tenant.id)})).json()["items"][0]
+    r = await db_client.get(f"/threads/{thread['id']}")
+    assert r.json()["customer"]["platform_user_id"] == "0"
+
+    message = (await db_client.get("/messages", params={"thread_id": thread["id"]})).json()["items"][0]
+    r = await db_client.get(f"/messages/{message['id']}")
+    assert r.json()["thread"]["id"] == thread["id"]
+
+
+def test_check_budget_raises_when_strict():
+    check_budget(QueryCounter(count=2, budget=2), "/ok")
+    with pytest.raises(QueryBudgetExceeded):
+        check_budget(QueryCounter(count=3, budget=2, statements=["SELECT 1"] * 3), "/threads")
+
+
+async def test_route_over_budget_fails_before_responding(db_session):
+    app = FastAPI()
+    app.add_middleware(QueryCountMiddleware)
+
+    @app.get("/n-plus-one", dependencies=[Depends(query_budget(1))])
+    async def n_plus_one():
+        for _ in range(3):
+            await db_session.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        with pytest.raises(QueryBudgetExceeded, match="ran 3 queries, budget is 1"):
+            await client.get("/n-plus-one")
+
+    # The client sees a server error, never the over-budget response
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        r = await client.get("/n-plus-one")
+    assert r.status_code == 500
+    assert "ok" not in r.text
+
+
+async def test_list_routes_document_their_item_schema(db_client):
+    paths = (await db_client.get("/openapi.json")).json()["paths"]
+    for path, item in (("/messages", "MessageResponse"), ("/threads", "ThreadResponse"), ("/events", "EventResponse")):
+        schema = paths[path]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema["$ref"].endswith(f"PaginatedResponse_{item}_")
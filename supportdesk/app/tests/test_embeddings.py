@@ -0,0 +1,118 @@
+import math
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core import embeddings as embeddings_module
+from ..core.embeddings import EmbeddingWorker, HashingEncoder, load_encoder
+from ..db.models import Customer, KBArticle, Message, Tenant, Thread
+from ..db.semantic import cosine_distance
+from ..db.types import EMBEDDING_DIMENSIONS
+from .conftest import test_engine
+
+
+def test_hashing_encoder_is_deterministic_and_normalized():
+    encoder = HashingEncoder(64)
+    first = encoder.encode_one("Where is my refund?")
+    assert first == HashingEncoder(64).encode_one("where is my REFUND")
+    assert math.isclose(sum(x * x for x in first), 1.0)
+    assert any(encoder.encode_one(""))
+
+    refund = encoder.encode_one("I want a refund for my order")
+    assert cosine_distance(refund, encoder.encode_one("refund my order please")) < cosine_distance(
+        refund, encoder.encode_one("the app crashes at login")
+    )
+
+
+def test_load_encoder_checks_dimensions():
+    assert load_encoder("hashing").dimensions == EMBEDDING_DIMENSIONS
+    with pytest.raises(ValueError):
+        load_encoder("not-a-factory")
+    with pytest.raises(ValueError):
+        load_encoder(f"{__name__}:_wrong_width")
+
+
+def _wrong_width(dimensions: int) -> HashingEncoder:
+    return HashingEncoder(dimensions // 2)
+
+
+async def _seed(db_session) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(customer)
+    await db_session.flush()
+    thread = Thread(tenant_id=tenant.id, channel="wa", platform_thread_id="t0", customer_id=customer.id)
+    db_session.add(thread)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    texts = ["Where is my refund?", "The app crashes at login", "Thanks!", None]
+    for i, text in enumerate(texts):
+        db_session.add(
+            Message(
+                tenant_id=tenant.id,
+                thread_id=thread.id,
+                platform_message_id=f"m{i}",
+                direction="inbound",
+                text=text,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    db_session.add_all(
+        [
+            KBArticle(tenant_id=tenant.id, title="Refunds", body="Refunds take 5 days to reach your card."),
+            KBArticle(tenant_id=tenant.id, title="Login problems", body="Reinstall the app if login crashes."),
+        ]
+    )
+    await db_session.commit()
+    db_session.expunge_all()
+    return tenant
+
+
+@pytest.fixture
+def test_db_sessions(monkeypatch):
+    @asynccontextmanager
+    async def session():
+        async with AsyncSession(test_engine, expire_on_commit=False) as s:
+            yield s
+            await s.commit()
+
+    monkeypatch.setattr(embeddings_module, "get_db_session", session)
+
+
+async def test_worker_embeds_pending_rows(db_session, test_db_sessions):
+    await _seed(db_session)
+    worker = EmbeddingWorker(batch_size=2, poll_interval_seconds=0)
+
+    assert await worker.embed_pending() == 4  # two messages, two articles
+    assert await worker.embed_pending() == 1  # the last message with text
+    assert await worker.embed_pending() == 0
+
+    embedded = (await db_session.execute(select(Message.text, Message.embedding))).all()
+    assert all((text is None) == (embedding is None) for text, embedding in embedded)
+    assert all(len(embedding) == EMBEDDING_DIMENSIONS for _, embedding in embedded if embedding)
+
+
+async def test_similar_messages_and_kb_search(db_client, db_session, test_db_sessions):
+    tenant = await _seed(db_session)
+    worker = EmbeddingWorker(batch_size=100, poll_interval_seconds=0)
+    await worker.embed_pending()
+
+    r = await db_client.get("/messages/similar", params={"tenant_id": str(tenant.id), "q": "refund status", "limit": 2})
+    assert r.status_code == 200
+    hits = r.json()
+    assert hits[0]["text"] == "Where is my refund?"
+    assert hits[0]["distance"] <= hits[1]["distance"]
+    assert hits[0]["thread"]["platform_thread_id"] == "t0"
+
+    r = await db_client.get("/kb/search", params={"tenant_id": str(tenant.id), "q": "app crashes on login"})
+    assert r.status_code == 200
+    assert [hit["title"] for hit in r.json()] == ["Login problems", "Refunds"]
+
+    r = await db_client.get("/kb/search", params={"tenant_id": str(uuid.uuid4()), "q": "refund"})
+    assert r.json() == []
@@ -0,0 +1,146 @@
+import asyncio
+import uuid
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any
+
+import pytest
+from asyncpg.exceptions import UniqueViolationError
+from sqlalchemy.exc import IntegrityError
+
+from ..core import event_writer as event_writer_module
+from ..core.event_writer import EventWriter
+from ..db.models import EventType
+from ..db.partitions import add_months, partition_name
+from .conftest import FakeCopySession
+
+
+def _patch_db(monkeypatch, written: list[Any], fail: list[Any], bad_ids: frozenset[Any] = frozenset()):
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_insert(session, rows):
+        if any(row["id"] in bad_ids for row in rows):
+            raise IntegrityError("INSERT INTO events", None, Exception("duplicate key"))
+        if fail:
+            fail.pop()
+            raise RuntimeError("db down")
+        written.append(list(rows))
+        return len(rows)
+
+    monkeypatch.setattr(event_writer_module, "get_db_session", fake_session)
+    monkeypatch.setattr(event_writer_module, "insert_events", fake_insert)
+
+
+async def test_flush_writes_in_batches_and_keeps_failed_rows(monkeypatch):
+    written: list[Any] = []
+    fail = [True]
+    _patch_db(monkeypatch, written, fail)
+    writer = EventWriter(batch_size=2, flush_interval_seconds=60, max_buffer=10)
+    for _ in range(3):
+        writer.emit(uuid.uuid4(), uuid.uuid4(), EventType.ack_sent)
+
+    assert await writer.flush() == 0
+    assert len(writer) == 3 and writer.stats.failures == 1
+
+    assert await writer.flush() == 3
+    assert [len(batch) for batch in written] == [2, 1]
+    assert len(writer) == 0
+
+
+async def test_flush_drops_rows_the_database_rejects(monkeypatch):
+    written: list[Any] = []
+    _patch_db(monkeypatch, written, [], bad_ids=frozenset({2, 5}))
+    writer = EventWriter(batch_size=4, flush_interval_seconds=60, max_buffer=10)
+    writer.emit_many({"id": i} for i in range(7))
+
+    assert await writer.flush() == 5
+    assert sorted(row["id"] for batch in written for row in batch) == [0, 1, 3, 4, 6]
+    assert writer.stats.rejected == 2
+    assert len(writer) == 0
+
+
+async def test_flush_keeps_unwritten_rows_when_db_fails_while_isolating(monkeypatch):
+    written: list[Any] = []
+    fail: list[bool] = []
+    _patch_db(monkeypatch, written, fail, bad_ids=frozenset({0}))
+    writer = EventWriter(batch_size=4, flush_interval_seconds=60, max_buffer=10)
+    writer.emit_many({"id": i} for i in range(4))
+    fail.append(True)
+
+    # [0, 1] is split, [0] is rejected, then the database goes away at [1]
+    assert await writer.flush() == 0
+    assert [row["id"] for row in writer._buffer] == [1, 2, 3]
+    assert writer.stats.rejected == 1 and writer.stats.failures == 1
+
+    assert await writer.flush() == 3
+    assert len(writer) == 0
+
+
+async def test_flush_drops_rows_the_copy_path_rejects(monkeypatch, fake_copy):
+    bad_id = uuid.uuid4()
+    driver = fake_copy(bad_id, UniqueViolationError("duplicate key value violates unique constraint"))
+
+    @asynccontextmanager
+    async def fake_session():
+        yield FakeCopySession()
+
+    monkeypatch.setattr(event_writer_module, "get_db_session", fake_session)
+    writer = EventWriter(batch_size=8, flush_interval_seconds=60, max_buffer=20)
+    for _ in range(7):
+        writer.emit(uuid.uuid4(), uuid.uuid4(), EventType.ack_sent)
+    writer.emit_many([{"id": bad_id, "tenant_id": uuid.uuid4(), "thread_id": None, "type": "ack_sent"}])
+
+    assert await writer.flush() == 7
+    assert len(driver.copied) == 7 and bad_id not in {record[0] for record in driver.copied}
+    assert writer.stats.rejected == 1 and writer.stats.failures == 0
+    assert len(writer) == 0
+
+
+async def test_buffer_drops_oldest_when_full(monkeypatch):
+    _patch_db(monkeypatch, [], [])
+    writer = EventWriter(batch_size=100, flush_interval_seconds=60, max_buffer=3)
+    writer.emit_many({"id": i} for i in range(5))
+    assert [row["id"] for row in writer._buffer] == [2, 3, 4]
+    assert writer.stats.dropped == 2
+
+
+async def test_run_flushes_when_batch_is_full(monkeypatch):
+    written: list[Any] = []
+    _patch_db(monkeypatch, written, [])
+    writer = EventWriter(batch_size=2, flush_interval_seconds=60, max_buffer=10)
+    stop = asyncio.Event()
+    task = asyncio.create_task(writer.run(stop))
+    await asyncio.sleep(0)
+    writer.emit_many([{"id": 1}, {"id": 2}])
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert written == [[{"id": 1}, {"id": 2}]]
+
+    writer.emit_many([{"id": 3}])
+    stop.set()
+    await task
+    assert written[-1] == [{"id": 3}]
+
+
+async def test_write_raises_until_rows_are_stored(monkeypatch):
+    written: list[Any] = []
+    fail = [True]
+    _patch_db(monkeypatch, written, fail)
+    writer = EventWriter(batch_size=10, flush_interval_seconds=60, max_buffer=10)
+    rows = [{"id": 1}, {"id": 2}]
+
+    with pytest.raises(RuntimeError):
+        await writer.write(rows)
+
+    # A retry of the same rows does not queue them twice
+    await writer.write(rows)
+    assert written == [[{"id": 1}, {"id": 2}]]
+    assert len(writer) == 0
+
+
+def test_partition_months():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+    assert partition_name("events", date(2026, 3, 1)) == "events_p202603"
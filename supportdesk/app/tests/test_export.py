@@ -0,0 +1,89 @@
+import csv
+import gzip
+import io
+import json
+import uuid
+
+import pytest
+
+from ..db.models import Customer, Message, Tenant, Thread
+from ..services.export import accepts_gzip
+
+
+async def _seed(db_session, messages: int) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(customer)
+    await db_session.flush()
+    thread = Thread(tenant_id=tenant.id, channel="wa", platform_thread_id="t1", customer_id=customer.id, labels=["vip"])
+    db_session.add(thread)
+    await db_session.flush()
+    for i in range(messages):
+        db_session.add(
+            Message(
+                tenant_id=tenant.id,
+                thread_id=thread.id,
+                platform_message_id=f"m{i}",
+                direction="inbound",
+                text=f"hello, {i}",
+                media={"n": i},
+            )
+        )
+    await db_session.commit()
+    return tenant
+
+
+async def test_export_messages_ndjson(db_client, db_session):
+    tenant = await _seed(db_session, 5)
+    r = await db_client.get(
+        f"/tenants/{tenant.id}/export/messages", headers={"Accept-Encoding": "identity"}
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in r.headers
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [(row["created_at"], row["id"]) for row in rows] == sorted((row["created_at"], row["id"]) for row in rows)
+    assert sorted(row["platform_message_id"] for row in rows) == [f"m{i}" for i in range(5)]
+    assert rows[0]["media"] == {"n": int(rows[0]["platform_message_id"][1:])}
+
+
+async def test_export_threads_csv_gzip(db_client, db_session):
+    tenant = await _seed(db_session, 1)
+    async with db_client.stream(
+        "GET",
+        f"/tenants/{tenant.id}/export/threads",
+        params={"format": "csv"},
+        headers={"Accept-Encoding": "gzip"},
+    ) as r:
+        assert r.status_code == 200
+        assert r.headers["content-encoding"] == "gzip"
+        raw = b"".join([chunk async for chunk in r.aiter_raw()])
+    header, row = list(csv.reader(io.StringIO(gzip.decompress(raw).decode())))
+    assert header[:3] == ["id", "channel", "platform_thread_id"]
+    assert row[2] == "t1"
+    assert json.loads(row[header.index("labels")]) == ["vip"]
+
+
+async def test_export_unknown_tenant(db_client, db_session):
+    r = await db_client.get(f"/tenants/{uuid.uuid4()}/export/messages")
+    assert r.status_code == 404
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("gzip", True),
+        ("br, gzip;q=0.5", True),
+        ("GZIP ; Q=1", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, deflate", False),
+        ("*;q=0.5, gzip;q=0", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_honours_q_values(header, expected):
+    assert accepts_gzip(header) is expected
@@ -1,3 +1,12 @@
+import asyncio
+
+from httpx import ASGITransport, AsyncClient
+
+from ..core.health import HealthChecker
+from ..main import app
+from ..routers import health as health_router
+
+
 def test_health_ok(client):
     r = client.get("/healthz")
     assert r.status_code == 200
@@ -5,3 +14,51 @@ def test_health_ok(client):
     assert body["status"] == "ok"
     assert body["checks"]["database"] == "ok"
     assert body["checks"]["redis"] == "ok"
+
+
+def test_livez(client):
+    r = client.get("/livez")
+    assert r.status_code == 200
+    assert r.json() == {"status": "ok"}
+
+
+def _checker(monkeypatch, redis_ok: bool = True) -> HealthChecker:
+    checker = HealthChecker(interval_seconds=60, timeout_seconds=0.1, pool_saturation_warn=0.9)
+    calls = {"database": 0, "redis": 0}
+
+    async def ping_database():
+        calls["database"] += 1
+
+    async def ping_redis():
+        calls["redis"] += 1
+        if not redis_ok:
+            await asyncio.sleep(1)
+
+    checker.calls = calls
+    monkeypatch.setattr(checker, "_ping_database", ping_database)
+    monkeypatch.setattr(checker, "_ping_redis", ping_redis)
+    monkeypatch.setattr(health_router, "health_checker", checker)
+    return checker
+
+
+async def test_readyz_serves_cached_report(monkeypatch):
+    checker = _checker(monkeypatch)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        for _ in range(3):
+            r = await ac.get("/readyz")
+            assert r.status_code == 200
+        healthz = await ac.get("/healthz")
+    body = r.json()
+    assert body["checks"]["database"]["status"] == "ok"
+    assert "latency_ms" in body["checks"]["redis"]
+    assert body["checks"]["db_pool"]["saturation"] == 0
+    assert checker.calls == {"database": 1, "redis": 1}
+    assert healthz.json() == {"status": "ok", "checks": {"database": "ok", "redis": "ok"}}
+
+
+async def test_readyz_fails_on_slow_dependency(monkeypatch):
+    _checker(monkeypatch, redis_ok=False)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        r = await ac.get("/readyz")
+    assert r.status_code == 503
+    assert r.json()["detail"]["checks"]["redis"]["status"] == "error"
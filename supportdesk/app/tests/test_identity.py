@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from ..core.local_cache import LocalCache
+from ..db.listeners import run_commit_hooks
+from ..db.models import Customer, Tenant
+from ..services import identity
+from ..services.identity import CustomerResolver
+
+
+def _resolver() -> CustomerResolver:
+    return CustomerResolver(ttl_seconds=60, local=LocalCache(ttl_seconds=60, max_entries=100, max_bytes=1 << 20))
+
+
+async def test_resolve_many_creates_once_and_caches_committed(db_session):
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    existing = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(existing)
+    await db_session.commit()
+
+    resolver = _resolver()
+    identities = {(tenant.id, "wa", "1"): None, (tenant.id, "wa", "2"): "+15550100", (tenant.id, "ig", "1"): None}
+    first = await resolver.resolve_many(db_session, identities)
+    await db_session.commit()
+    assert first[(tenant.id, "wa", "1")] == existing.id
+    assert len(set(first.values())) == 3
+    assert resolver.stats.created == 2
+    assert await db_session.scalar(select(func.count()).select_from(Customer)) == 3
+
+    # Customers created by the first call were not cached until committed
+    assert await resolver.resolve_many(db_session, identities) == first
+    assert resolver.stats.local_hits == 1
+    assert resolver.stats.created == 2
+
+    assert await resolver.resolve_many(db_session, identities) == first
+    assert resolver.stats.local_hits == 4
+    assert resolver.stats.round_trips == 2
+
+
+async def test_platform_identity_is_unique(db_session):
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    db_session.add_all([Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1") for _ in range(2)])
+    with pytest.raises(IntegrityError):
+        await db_session.flush()
+
+
+async def test_deletes_drop_the_tenants_cached_identities(db_session, fake_redis, monkeypatch):
+    local = LocalCache(ttl_seconds=60, max_entries=100, max_bytes=1 << 20)
+    resolver = CustomerResolver(ttl_seconds=60, local=local)
+    monkeypatch.setattr(identity, "customer_resolver", resolver)
+    acme, globex = Tenant(name="Acme"), Tenant(name="Globex")
+    db_session.add_all([acme, globex])
+    await db_session.flush()
+    customers = [Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1") for tenant in (acme, globex)]
+    db_session.add_all(customers)
+    await db_session.commit()
+    await run_commit_hooks(db_session)
+    identities = {(tenant.id, "wa", "1"): None for tenant in (acme, globex)}
+    await resolver.resolve_many(db_session, identities)
+    acme_key, globex_key = (resolver.key(identity) for identity in identities)
+
+    await db_session.delete(customers[0])
+    await db_session.commit()
+    await run_commit_hooks(db_session)
+    assert await fake_redis.get(acme_key) is None
+    assert await fake_redis.get(globex_key) == str(customers[1].id)
+    assert local.get(globex_key) is None
+
+    # The tenant's customers go with it in the database, unseen by the session
+    await db_session.delete(globex)
+    await db_session.commit()
+    await run_commit_hooks(db_session)
+    assert await fake_redis.get(globex_key) is None
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+from ..db.models import Customer, Tenant, Thread, ThreadLabelCount
+
+
+async def _seed(db_session) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(customer)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i, (labels, status) in enumerate(
+        [(["refund"], "open"), (["refund", "vip"], "open"), (["vip"], "closed"), ([], "open")]
+    ):
+        db_session.add(
+            Thread(
+                tenant_id=tenant.id,
+                channel="wa",
+                platform_thread_id=f"t{i}",
+                customer_id=customer.id,
+                status=status,
+                labels=labels,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    await db_session.commit()
+    db_session.expunge_all()
+    return tenant
+
+
+async def test_filter_threads_by_labels(db_client, db_session):
+    tenant = await _seed(db_session)
+
+    async def thread_ids(**params):
+        r = await db_client.get("/threads", params={"tenant_id": str(tenant.id), **params})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["total"] == len(body["items"])
+        return [item["platform_thread_id"] for item in body["items"]]
+
+    assert await thread_ids(label="refund") == ["t1", "t0"]
+    assert await thread_ids(label=["refund", "vip"]) == ["t1"]
+    assert await thread_ids(label="vip", status="closed") == ["t2"]
+    assert await thread_ids(label="missing") == []
+
+
+async def test_label_counts(db_client, db_session):
+    tenant = await _seed(db_session)
+    # Postgres maintains these with a trigger; SQLite has none, so seed them as it would
+    db_session.add_all(
+        [
+            ThreadLabelCount(tenant_id=tenant.id, label="refund", status="open", count=2),
+            ThreadLabelCount(tenant_id=tenant.id, label="vip", status="open", count=1),
+            ThreadLabelCount(tenant_id=tenant.id, label="vip", status="closed", count=1),
+            ThreadLabelCount(tenant_id=tenant.id, label="stale", status="open", count=0),
+        ]
+    )
+    await db_session.commit()
+
+    r = await db_client.get(f"/tenants/{tenant.id}/labels/counts")
+    assert r.status_code == 200
+    assert r.json()["labels"] == [
+        {"label": "refund", "counts": {"open": 2}, "total": 2},
+        {"label": "vip", "counts": {"closed": 1, "open": 1}, "total": 2},
+    ]
+
+    r = await db_client.get(f"/tenants/{tenant.id}/labels/counts", params={"status": "closed"})
+    assert r.json()["labels"] == [{"label": "vip", "counts": {"closed": 1}, "total": 1}]
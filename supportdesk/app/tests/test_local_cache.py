@@ -0,0 +1,55 @@
+import json
+
+from ..core.cache import EntityCache, InvalidationListener, _caches
+from ..core.local_cache import LocalCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LocalCache(ttl_seconds=60, max_entries=2, max_bytes=1 << 20)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert cache.stats.evictions == 1
+
+
+def test_memory_limit_bounds_bytes():
+    cache = LocalCache(ttl_seconds=60, max_entries=1000, max_bytes=4096)
+    for i in range(100):
+        cache.set(f"k{i}", "x" * 500)
+    assert cache.bytes <= 4096
+    assert 0 < len(cache) < 10
+    cache.set("huge", "x" * 10_000)
+    assert cache.get("huge") is None
+
+
+def test_expired_entries_miss(monkeypatch):
+    cache = LocalCache(ttl_seconds=0, max_entries=10, max_bytes=1 << 20)
+    cache.set("a", "1")
+    assert cache.get("a") is None
+    assert cache.stats.expirations == 1
+    assert cache.stats_dict()["hit_rate"] == 0.0
+
+
+def test_invalidation_rejects_stale_loads():
+    cache = LocalCache(ttl_seconds=60, max_entries=10, max_bytes=1 << 20)
+    generation = cache.generation
+    cache.discard("a")
+    cache.set("a", "stale", generation=generation)
+    assert cache.get("a") is None
+
+
+def test_listener_applies_invalidations():
+    local = LocalCache(ttl_seconds=60, max_entries=10, max_bytes=1 << 20)
+    cache = EntityCache("test-local", ttl_seconds=60, negative_ttl_seconds=5, local=local)
+    local.set(cache.key("1"), "{}")
+    local.set(cache.key("2"), "{}")
+
+    listener = InvalidationListener()
+    listener.apply(json.dumps({"namespace": "test-local", "keys": [cache.key("1")]}))
+    listener.apply("not json")
+    assert local.get(cache.key("1")) is None
+    assert local.get(cache.key("2")) == "{}"
+    del _caches["test-local"]
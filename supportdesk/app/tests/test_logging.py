@@ -0,0 +1,76 @@
+import io
+
+import pytest
+import structlog
+
+from ..logging import QueuedWriter, RateLimitEvents, SampleEvents, _parse_event_map
+
+
+def _writer(overflow: str, max_lines: int = 2) -> QueuedWriter:
+    writer = QueuedWriter(io.StringIO(), max_lines=max_lines, overflow=overflow, flush_interval=60)
+    # Keep the thread from draining mid-test
+    writer._drain_lock.acquire()
+    return writer
+
+
+def _release(writer: QueuedWriter) -> list[str]:
+    writer._drain_lock.release()
+    writer.close()
+    assert isinstance(writer.stream, io.StringIO)
+    return writer.stream.getvalue().splitlines()
+
+
+def test_drop_newest_keeps_buffered_lines_and_important_ones():
+    writer = _writer("drop_newest")
+    for line in ("a", "b", "c"):
+        writer.write(line)
+    writer.write("error", important=True)
+    lines = _release(writer)
+    assert lines[:2] == ["b", "error"]
+    assert '"dropped": 2' in lines[2]
+
+
+def test_drop_oldest_keeps_latest_lines():
+    writer = _writer("drop_oldest")
+    for line in ("a", "b", "c"):
+        writer.write(line)
+    assert _release(writer)[:2] == ["b", "c"]
+
+
+def test_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        QueuedWriter(io.StringIO(), max_lines=1, overflow="block")
+
+
+def test_parse_event_map():
+    assert _parse_event_map(" Listed customers=0.01, Retrieved tenant = 5 ") == {
+        "Listed customers": 0.01,
+        "Retrieved tenant": 5.0,
+    }
+
+
+def test_sampling_never_drops_warnings(monkeypatch):
+    sample = SampleEvents({"Listed customers": 0.0})
+    with pytest.raises(structlog.DropEvent):
+        sample(None, "info", {"event": "Listed customers"})
+    assert sample(None, "warning", {"event": "Listed customers"}) == {"event": "Listed customers"}
+    assert sample(None, "info", {"event": "Other"}) == {"event": "Other"}
+
+    monkeypatch.setattr("random.random", lambda: 0.005)
+    assert SampleEvents({"Listed customers": 0.01})(None, "info", {"event": "Listed customers"}) == {
+        "event": "Listed customers",
+        "sample_rate": 0.01,
+    }
+
+
+def test_rate_limit_caps_events_per_second():
+    limit = RateLimitEvents({"Retrieved tenant": 3})
+    kept = 0
+    for _ in range(10):
+        try:
+            limit(None, "info", {"event": "Retrieved tenant"})
+            kept += 1
+        except structlog.DropEvent:
+            pass
+    assert kept == 3
+    limit(None, "error", {"event": "Retrieved tenant"})
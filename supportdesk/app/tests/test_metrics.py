@@ -0,0 +1,57 @@
+import uuid
+
+from ..core.metrics import Histogram, TenantLabels, statement_label
+from ..db.models import Tenant
+
+
+def test_statement_label():
+    assert statement_label("SELECT threads.id FROM threads WHERE threads.tenant_id = $1") == "SELECT threads"
+    assert statement_label('INSERT INTO "public"."messages" (id) VALUES ($1)') == "INSERT messages"
+    assert statement_label("UPDATE customers SET email = $1") == "UPDATE customers"
+    assert statement_label("DELETE FROM events WHERE id = $1") == "DELETE events"
+    assert statement_label("select 1") == "SELECT"
+    assert statement_label("/* comment */ SELECT 1") == "OTHER"
+
+
+def test_tenant_labels_are_bounded():
+    labels = TenantLabels(limit=2)
+    assert [labels.label(t) for t in ("a", "b", "c", "a", None)] == ["a", "b", "other", "a", "none"]
+
+
+def test_histogram_renders_cumulative_buckets_and_caps_series(monkeypatch):
+    histogram = Histogram("h", "help", ("route",), (0.1, 1.0))
+    histogram.max_series = 2
+    histogram.observe(("/a",), 0.05)
+    histogram.observe(("/a",), 0.5)
+    histogram.observe(("/b",), 5)
+    histogram.observe(("/c",), 0.1)
+    lines = list(histogram.render())
+    assert 'h_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'h_bucket{route="/a",le="1"} 2' in lines
+    assert 'h_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'h_count{route="/b"} 1' in lines
+    assert 'h_bucket{route="other",le="0.1"} 1' in lines
+    assert not any('route="/c"' in line for line in lines)
+
+
+async def test_metrics_endpoint_labels_route_templates(db_client, db_session):
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.commit()
+
+    assert (await db_client.get("/customers", params={"tenant_id": str(tenant.id)})).status_code == 200
+    assert (await db_client.get(f"/threads/{uuid.uuid4()}")).status_code == 404
+    await db_client.get(f"/does-not-exist/{uuid.uuid4()}")
+
+    r = await db_client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    body = r.text
+    assert (
+        'supportdesk_http_request_duration_seconds_count{method="GET",'
+        f'route="/customers",status="200",tenant="{tenant.id}"}}'
+    ) in body
+    assert 'route="unmatched",status="404",tenant="none"' in body
+    assert 'supportdesk_http_request_queries_count{method="GET",route="/customers"} ' in body
+    assert 'supportdesk_db_query_duration_seconds_count{statement="SELECT customers"}' in body
+    assert "supportdesk_db_pool_checkouts_total" in body
@@ -0,0 +1,73 @@
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from ..db.models import Customer, Tenant
+from ..schemas.common import PaginatedResponse, PaginationParams, decode_cursor, encode_cursor
+from ..schemas.customer import CustomerResponse
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    customer_id = uuid.uuid4()
+    params = PaginationParams(cursor=encode_cursor(created_at, customer_id))
+    assert params.keyset() == (created_at, customer_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor("x"), encode_cursor("x", "y")])
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(ValueError):
+        PaginationParams(cursor=cursor).keyset()
+
+
+def test_decode_cursor_requires_list():
+    with pytest.raises(ValueError):
+        decode_cursor("e30")  # "{}"
+
+
+@pytest.mark.parametrize("path", ["/tenants", "/customers"])
+def test_list_invalid_cursor_400(client, path):
+    r = client.get(path, params={"cursor": "garbage"})
+    assert r.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/tenants", "/customers"])
+@pytest.mark.parametrize("params", [{"limit": 0}, {"limit": 1001}, {"skip": -1}])
+def test_list_rejects_out_of_range_paging(client, path, params):
+    r = client.get(path, params=params)
+    assert r.status_code == 422
+
+
+async def test_fast_page_matches_model_serialization(db_client, db_session):
+    tenant = Tenant(name="Ünïcode")
+    db_session.add(tenant)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(3):
+        db_session.add(
+            Customer(
+                tenant_id=tenant.id,
+                platform="wa",
+                platform_user_id=f"ü{i}",
+                email=f"c{i}@example.com",
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    await db_session.commit()
+
+    r = await db_client.get("/customers", params={"tenant_id": str(tenant.id), "limit": 2})
+    stmt = select(Customer).order_by(Customer.created_at.desc()).limit(2)
+    customers = (await db_session.execute(stmt)).scalars().all()
+    page = PaginatedResponse.create(
+        items=[CustomerResponse.model_validate(c) for c in customers],
+        total=3,
+        limit=2,
+        has_more=True,
+        next_cursor=encode_cursor(customers[-1].created_at, customers[-1].id),
+    )
+    # What FastAPI renders for a model returned under response_model
+    expected = json.dumps(page.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":"))
+    assert r.content == expected.encode()
@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from ..db.pool import InstrumentedPool, pool_status
+
+
+async def test_pool_counts_waits_and_timeouts():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedPool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+    async def hold(seconds: float) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(seconds)
+
+    results = await asyncio.gather(hold(0.2), hold(0), return_exceptions=True)
+    assert results[0] is None
+    assert isinstance(results[1], exc.TimeoutError)
+
+    status = pool_status(engine.pool)
+    assert status["size"] == 1
+    assert status["in_use"] == 0 and status["idle"] == 1
+    assert status["checkouts"] == status["checkins"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.05
+    assert sum(status["wait_histogram"].values()) == 2
+
+    await engine.dispose()
+    assert pool_status(engine.pool)["timeouts"] == 1
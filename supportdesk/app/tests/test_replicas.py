@@ -0,0 +1,99 @@
+import asyncio
+
+from sqlalchemy import text
+
+from ..config import settings
+from ..db import replicas
+from ..db.replicas import REPLICA_INFO_KEY, WROTE_AT_COOKIE, ReplicaSet, read_session, wants_primary
+from ..db.session import get_engine
+
+
+def _replica_set(urls, selection="round_robin"):
+    return ReplicaSet(urls, selection=selection, max_lag_seconds=5, check_interval_seconds=1)
+
+
+def _make_usable(replica_set, *lags):
+    for replica, lag in zip(replica_set.replicas, lags, strict=True):
+        replica.healthy = True
+        replica.lag_seconds = lag
+
+
+def test_round_robin_skips_lagging_and_unchecked_replicas():
+    rs = _replica_set(["sqlite+aiosqlite:///a.db", "sqlite+aiosqlite:///b.db", "sqlite+aiosqlite:///c.db"])
+    assert rs.choose() is None
+
+    _make_usable(rs, 0, 30, 1)
+    a, _, c = rs.replicas
+    assert [rs.choose() for _ in range(4)] == [a, c, a, c]
+
+    rs.mark_down(a, OSError("gone"))
+    assert [rs.choose() for _ in range(2)] == [c, c]
+
+
+async def test_least_connections_prefers_idle_replica():
+    rs = _replica_set(["sqlite+aiosqlite://", "sqlite+aiosqlite://"], selection="least_connections")
+    _make_usable(rs, 0, 0)
+    first, second = rs.replicas
+    async with first.engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        assert rs.choose() is second
+    await rs.dispose()
+
+
+async def test_failed_check_marks_replica_down():
+    rs = _replica_set(["sqlite+aiosqlite://"])
+    _make_usable(rs, 0)
+    # SQLite has no pg_is_in_recovery(), which stands in for an unreachable replica
+    await rs.check(rs.replicas[0])
+    assert rs.status()[0]["usable"] is False
+    assert rs.status()[0]["error"]
+    await rs.dispose()
+
+
+async def test_checks_measure_lag_against_the_primary_position(monkeypatch):
+    rs = _replica_set(["sqlite+aiosqlite:///a.db", "sqlite+aiosqlite:///b.db"])
+    stop = asyncio.Event()
+    seen = []
+
+    async def primary_lsn():
+        return "2/8601C1A0"
+
+    async def check(replica, primary_lsn=None):
+        seen.append((replica.name, primary_lsn))
+        stop.set()
+
+    monkeypatch.setattr(rs, "primary_lsn", primary_lsn)
+    monkeypatch.setattr(rs, "check", check)
+    await rs.run(stop)
+    assert seen == [(r.name, "2/8601C1A0") for r in rs.replicas]
+    await rs.dispose()
+
+
+async def test_read_session_falls_back_to_primary(monkeypatch):
+    rs = _replica_set(["sqlite+aiosqlite:////nonexistent/dir/replica.db"])
+    _make_usable(rs, 0)
+    monkeypatch.setattr(replicas, "replica_set", rs)
+    async with read_session() as session:
+        assert session.bind is get_engine()
+        assert REPLICA_INFO_KEY not in session.info
+    assert rs.usable() == []
+
+
+async def test_read_session_names_its_replica(monkeypatch):
+    rs = _replica_set(["sqlite+aiosqlite://"])
+    _make_usable(rs, 0)
+    monkeypatch.setattr(replicas, "replica_set", rs)
+    async with read_session() as session:
+        assert session.info[REPLICA_INFO_KEY] == rs.replicas[0].name
+    await rs.dispose()
+
+
+def test_wants_primary_after_recent_write(monkeypatch):
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 10)
+    assert wants_primary({"x-read-your-writes": "1"}, {})
+    assert wants_primary({}, {WROTE_AT_COOKIE: "1000"}, now=1005)
+    assert not wants_primary({}, {WROTE_AT_COOKIE: "1000"}, now=1011)
+    assert not wants_primary({}, {WROTE_AT_COOKIE: "garbage"})
+
+    monkeypatch.setattr(settings, "read_your_writes_seconds", 0)
+    assert not wants_primary({}, {WROTE_AT_COOKIE: "1000"}, now=1005)
@@ -0,0 +1,90 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from ..db.models import Customer, Message, Tenant, Thread
+from ..db.search import query_config, search_messages
+
+
+async def _seed(db_session) -> Tenant:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(customer)
+    await db_session.flush()
+    thread = Thread(tenant_id=tenant.id, channel="wa", platform_thread_id="t0", customer_id=customer.id)
+    db_session.add(thread)
+    await db_session.flush()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    texts = ["Where is my refund?", "Refund issued", "Thanks!", "refund 100% please", None]
+    for i, text in enumerate(texts):
+        db_session.add(
+            Message(
+                tenant_id=tenant.id,
+                thread_id=thread.id,
+                platform_message_id=f"m{i}",
+                direction="inbound",
+                text=text,
+                created_at=start + timedelta(minutes=i),
+            )
+        )
+    await db_session.commit()
+    db_session.expunge_all()
+    return tenant
+
+
+async def test_search_pages_through_matches(db_client, db_session):
+    tenant = await _seed(db_session)
+
+    params = {"tenant_id": str(tenant.id), "q": "refund", "limit": 2}
+    r = await db_client.get("/messages/search", params=params)
+    assert r.status_code == 200
+    first = r.json()
+    assert first["total"] is None
+    assert first["has_more"] is True
+    assert len(first["items"]) == 2
+
+    r = await db_client.get("/messages/search", params={**params, "cursor": first["next_cursor"]})
+    second = r.json()
+    assert second["has_more"] is False
+    texts = {item["text"] for item in first["items"] + second["items"]}
+    assert texts == {"Where is my refund?", "Refund issued", "refund 100% please"}
+    assert all(item["thread"]["platform_thread_id"] == "t0" for item in first["items"])
+
+    r = await db_client.get("/messages/search", params={"tenant_id": str(tenant.id), "q": "100%"})
+    assert [item["text"] for item in r.json()["items"]] == ["refund 100% please"]
+
+    r = await db_client.get("/messages/search", params={"tenant_id": str(uuid.uuid4()), "q": "refund"})
+    assert r.json()["items"] == []
+
+
+async def test_search_rejects_bad_cursor(db_client):
+    params = {"tenant_id": str(uuid.uuid4()), "q": "refund", "cursor": "nope"}
+    r = await db_client.get("/messages/search", params=params)
+    assert r.status_code == 400
+
+
+def test_query_config():
+    assert query_config("en-US") == "english"
+    assert query_config("PT") == "portuguese"
+    assert query_config("xx") == "simple"
+    assert query_config(None) == "simple"
+
+
+def test_postgres_search_uses_index_and_pages_by_rank():
+    stmt = search_messages(
+        uuid.uuid4(),
+        "refund",
+        "postgresql",
+        language="de",
+        limit=20,
+        position=(0.5, uuid.uuid4()),
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "messages.search_vector @@ (websearch_to_tsquery(%(param_1)s::REGCONFIG" in sql
+    assert "(ts_rank(messages.search_vector" in sql and ") < (%(param_" in sql
+    # Headlines only for the page: ts_headline sits outside the LIMITed subquery
+    assert sql.index("ts_headline") < sql.index("LIMIT")
+    assert sql.count("ts_headline(") == 1
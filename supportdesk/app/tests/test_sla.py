@@ -0,0 +1,111 @@
+import time
+import uuid
+from typing import Any
+
+from ..core import sla
+from ..core.sla import DEADLINES_KEY, Breach, SlaKind, SlaScheduler, _member
+from ..db.models import EventType
+
+ACK_SECONDS = 60
+
+
+def _scheduler() -> tuple[SlaScheduler, list[Breach]]:
+    scheduler = SlaScheduler(
+        {SlaKind.ack: ACK_SECONDS},
+        tick_ms=100,
+        sweep_interval_seconds=60,
+        orphan_grace_seconds=30,
+    )
+    fired: list[Breach] = []
+
+    async def collect(breaches):
+        fired.extend(breaches)
+
+    scheduler.handlers = [collect]
+    return scheduler, fired
+
+
+async def _advance(scheduler: SlaScheduler, now: float) -> None:
+    expired = scheduler.wheel.advance(int(now * 1000))
+    if expired:
+        await scheduler._fire([(str(member), deadline_ms) for member, deadline_ms in expired])
+
+
+async def test_arm_keeps_the_earlier_deadline_and_fires_once(fake_redis):
+    a, fired_a = _scheduler()
+    b, fired_b = _scheduler()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    member = _member(SlaKind.ack, *thread)
+    t0 = time.time()
+    deadline_ms = int(t0 * 1000) + ACK_SECONDS * 1000
+
+    await a.arm_many([thread], now=t0)
+    await a.arm_many([thread], now=t0 + 5)
+    await b.arm_many([thread], now=t0 + 10)
+    assert await fake_redis.zscore(DEADLINES_KEY, member) == deadline_ms
+    # The second worker follows the deadline already stored in Redis
+    assert b.wheel.deadline(member) == deadline_ms
+
+    await _advance(a, t0 + ACK_SECONDS + 1)
+    await _advance(b, t0 + ACK_SECONDS + 1)
+    assert fired_a == [(SlaKind.ack, *thread, deadline_ms)]
+    assert fired_b == []
+    assert await fake_redis.zcard(DEADLINES_KEY) == 0
+
+
+async def test_cancel_elsewhere_then_rearm_does_not_fire_early(fake_redis):
+    a, fired_a = _scheduler()
+    b, fired_b = _scheduler()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    t0 = time.time()
+
+    await a.arm_many([thread], now=t0)
+    # Another worker sees the reply, then a new inbound message re-arms
+    await b.cancel_many([thread])
+    await b.arm_many([thread], now=t0 + 20)
+    rearmed_ms = int((t0 + 20) * 1000) + ACK_SECONDS * 1000
+
+    # A's stale wheel entry expires first and must not claim the new deadline
+    await _advance(a, t0 + ACK_SECONDS + 1)
+    assert fired_a == []
+    assert await fake_redis.zscore(DEADLINES_KEY, _member(SlaKind.ack, *thread)) == rearmed_ms
+
+    await _advance(b, t0 + ACK_SECONDS + 21)
+    assert fired_b == [(SlaKind.ack, *thread, rearmed_ms)]
+
+
+async def test_cancel_stops_the_local_timer(fake_redis):
+    scheduler, fired = _scheduler()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    t0 = time.time()
+    await scheduler.arm_many([thread], now=t0)
+    await scheduler.cancel_many([thread])
+    assert len(scheduler.wheel) == 0
+    await _advance(scheduler, t0 + ACK_SECONDS + 1)
+    assert fired == []
+    assert await fake_redis.zcard(DEADLINES_KEY) == 0
+
+
+async def test_sweep_fires_orphaned_deadlines(fake_redis):
+    gone, _ = _scheduler()
+    survivor, fired = _scheduler()
+    thread = (uuid.uuid4(), uuid.uuid4())
+    t0 = time.time()
+    await gone.arm_many([thread], now=t0)
+
+    assert await survivor.sweep_orphans(now=t0 + ACK_SECONDS + 10) == 0
+    assert await survivor.sweep_orphans(now=t0 + ACK_SECONDS + 31) == 1
+    assert [breach[:3] for breach in fired] == [(SlaKind.ack, *thread)]
+    assert await fake_redis.zcard(DEADLINES_KEY) == 0
+
+
+async def test_breaches_are_recorded_as_sla_breached(monkeypatch):
+    emitted: list[dict[str, Any]] = []
+    monkeypatch.setattr(sla.event_writer, "emit_many", emitted.extend)
+    tenant_id, thread_id = uuid.uuid4(), uuid.uuid4()
+    await sla.record_breaches([(SlaKind.ack, tenant_id, thread_id, 1_700_000_000_000)])
+
+    [row] = emitted
+    assert row["type"] == EventType.sla_breached.value
+    assert row["meta"] == {"kind": "ack", "deadline": "2023-11-14T22:13:20+00:00"}
+    assert (row["tenant_id"], row["thread_id"]) == (tenant_id, thread_id)
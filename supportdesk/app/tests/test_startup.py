@@ -0,0 +1,49 @@
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from ..db import session as session_module
+from ..main import app, lifespan
+
+# About 0.65s here; the headroom absorbs slower CI machines, not new imports
+IMPORT_BUDGET_SECONDS = 1.5
+STARTUP_BUDGET_SECONDS = 0.5
+
+IMPORT_MAIN = """
+import sys, time
+start = time.perf_counter()
+import supportdesk.app.main
+print(time.perf_counter() - start)
+print(" ".join(m for m in ("asyncpg", "redis") if m in sys.modules))
+"""
+
+
+def _import_main() -> tuple[float, str]:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_MAIN],
+        cwd=Path(__file__).resolve().parents[3],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, loaded = (result.stdout.splitlines() + [""])[:2]
+    return float(elapsed), loaded
+
+
+def test_import_is_lazy_and_within_budget():
+    # A cold interpreter can be slow once; retry before calling it a regression
+    for _ in range(3):
+        elapsed, loaded = _import_main()
+        assert loaded == "", f"imported at startup: {loaded}"
+        if elapsed < IMPORT_BUDGET_SECONDS:
+            break
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"importing the app took {elapsed:.2f}s"
+
+
+async def test_lifespan_creates_and_disposes_engine():
+    start = time.perf_counter()
+    async with lifespan(app):
+        assert time.perf_counter() - start < STARTUP_BUDGET_SECONDS
+        assert session_module._engine is not None
+    assert session_module._engine is None
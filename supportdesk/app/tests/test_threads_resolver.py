@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from ..core.local_cache import LocalCache
+from ..db.models import Customer, Tenant, Thread, ThreadStatus
+from ..services.threads import ThreadRequest, ThreadResolver
+
+
+def _resolver() -> ThreadResolver:
+    return ThreadResolver(
+        ttl_seconds=60,
+        status_ttl_seconds=60,
+        touch_after_seconds=60,
+        local=LocalCache(ttl_seconds=60, max_entries=100, max_bytes=1 << 20),
+    )
+
+
+async def _seed(db_session) -> tuple[Tenant, Customer, Thread]:
+    tenant = Tenant(name="Acme")
+    db_session.add(tenant)
+    await db_session.flush()
+    customer = Customer(tenant_id=tenant.id, platform="wa", platform_user_id="1")
+    db_session.add(customer)
+    await db_session.flush()
+    closed = Thread(
+        tenant_id=tenant.id,
+        channel="wa",
+        platform_thread_id="t0",
+        customer_id=customer.id,
+        status=ThreadStatus.closed.value,
+    )
+    db_session.add(closed)
+    await db_session.commit()
+    return tenant, customer, closed
+
+
+async def test_resolve_many_creates_and_caches_committed(db_session):
+    tenant, customer, closed = await _seed(db_session)
+    resolver = _resolver()
+    requests = {
+        (tenant.id, "wa", "t0"): ThreadRequest(customer.id),
+        (tenant.id, "wa", "t1"): ThreadRequest(customer.id),
+    }
+    first = await resolver.resolve_many(db_session, requests)
+    await db_session.commit()
+    assert first[(tenant.id, "wa", "t0")] == closed.id
+    assert resolver.stats.created == 1
+    assert await db_session.scalar(select(func.count()).select_from(Thread)) == 2
+
+    # The thread created by the first call was not cached until seen committed
+    assert await resolver.resolve_many(db_session, requests) == first
+    assert resolver.stats.cache_served == 1
+    assert await resolver.resolve_many(db_session, requests) == first
+    assert resolver.stats.cache_served == 3
+    assert resolver.stats.round_trips == 2
+    # Outbound messages never reopen
+    assert (await db_session.get(Thread, closed.id)).status == ThreadStatus.closed.value
+
+
+async def test_inbound_message_reopens_closed_thread(db_session):
+    tenant, customer, closed = await _seed(db_session)
+    resolver = _resolver()
+    key = (tenant.id, "wa", "t0")
+    await resolver.resolve_many(db_session, {key: ThreadRequest(customer.id)})
+    assert resolver.stats.local_hits == 0
+
+    # The id is cached, but a possibly closed thread still goes to the database
+    resolved = await resolver.resolve_many(db_session, {key: ThreadRequest(customer.id, reopen=True)})
+    await db_session.commit()
+    assert resolved == {key: closed.id}
+    assert resolver.stats.local_hits == 1
+    assert resolver.stats.reopened == 1
+    await db_session.refresh(closed)
+    assert closed.status == ThreadStatus.open.value
+
+    await resolver.resolve_many(db_session, {key: ThreadRequest(customer.id, reopen=True)})
+    assert resolver.stats.reopened == 1
+
+
+async def test_every_resolve_bumps_updated_at(db_session):
+    tenant, customer, closed = await _seed(db_session)
+    resolver = _resolver()
+    key = (tenant.id, "wa", "t0")
+    long_ago = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    async def updated_at() -> datetime:
+        value: datetime = await db_session.scalar(select(Thread.updated_at).where(Thread.id == closed.id))
+        return value.replace(tzinfo=timezone.utc)
+
+    for served_from_cache in (False, True):
+        await db_session.execute(update(Thread).where(Thread.id == closed.id).values(updated_at=long_ago))
+        await resolver.resolve_many(db_session, {key: ThreadRequest(customer.id)})
+        await db_session.commit()
+        assert resolver.stats.cache_served == int(served_from_cache)
+        assert await updated_at() > long_ago
+
+
+async def test_recently_bumped_threads_are_not_written(db_session):
+    tenant, customer, closed = await _seed(db_session)
+    resolver = _resolver()
+    key = (tenant.id, "wa", "t0")
+    recent = datetime.now(timezone.utc) - timedelta(seconds=10)
+
+    for _ in range(2):  # from the database, then from the caches
+        await db_session.execute(update(Thread).where(Thread.id == closed.id).values(updated_at=recent))
+        await resolver.resolve_many(db_session, {key: ThreadRequest(customer.id)})
+        await db_session.commit()
+        value = await db_session.scalar(select(Thread.updated_at).where(Thread.id == closed.id))
+        assert value.replace(tzinfo=timezone.utc) == recent
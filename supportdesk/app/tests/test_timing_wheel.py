@@ -0,0 +1,51 @@
+import random
+
+from ..core.timing_wheel import TimingWheel
+
+
+def test_fires_at_deadline_across_levels():
+    wheel = TimingWheel(tick_ms=10, slots=4, levels=2)
+    deadlines = {"a": 25, "b": 95, "c": 170, "d": 1000}  # "d" is past the top level
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    fired = {}
+    for now in range(0, 1200, 5):
+        for key, deadline in wheel.advance(now):
+            fired[key] = now
+            assert deadline == deadlines[key]
+    # Never early, at most one tick late
+    assert fired == {"a": 30, "b": 100, "c": 170, "d": 1000}
+    assert len(wheel) == 0
+
+
+def test_cancel_and_reschedule():
+    wheel = TimingWheel(tick_ms=10, slots=4, levels=2)
+    wheel.schedule("a", 50)
+    wheel.schedule("b", 50)
+    assert wheel.deadline("b") == 50
+    assert wheel.cancel("a") == 50
+    assert wheel.deadline("a") is None
+    assert wheel.cancel("a") is None
+    wheel.schedule("b", 300)
+    assert wheel.advance(100) == []
+    assert wheel.advance(300) == [("b", 300)]
+
+
+def test_matches_brute_force():
+    rng = random.Random(7)
+    wheel = TimingWheel(tick_ms=1, slots=8, levels=3)
+    armed: dict[int, int] = {}
+    now = 0
+    for _ in range(2000):
+        now += rng.randint(0, 40)
+        for key, _ in wheel.advance(now):
+            assert armed.pop(key) <= now
+        assert all(deadline > now for deadline in armed.values())
+        key = rng.randint(0, 200)
+        if rng.random() < 0.3:
+            wheel.cancel(key)
+            armed.pop(key, None)
+        else:
+            armed[key] = now + rng.randint(-5, 3000)
+            wheel.schedule(key, armed[key])
@@ -0,0 +1,129 @@
+import hashlib
+import hmac
+import json
+import uuid
+from contextlib import asynccontextmanager
+
+from ..config import settings
+from ..core.metrics import ingest_unknown_tenant_messages
+from ..db.models.message import MessageDirection
+from ..db.models.thread import ThreadChannel
+from ..services import ingest
+from ..services.ingest import INGEST_STREAM
+from ..services.webhooks import parse_webhook
+
+WHATSAPP_PAYLOAD = {
+    "object": "whatsapp_business_account",
+    "entry": [
+        {
+            "id": "WABA",
+            "changes": [
+                {
+                    "field": "messages",
+                    "value": {
+                        "messages": [
+                            {
+                                "from": "15551234567",
+                                "id": "wamid.1",
+                                "timestamp": "1700000000",
+                                "type": "text",
+                                "text": {"body": "hello"},
+                            },
+                            {
+                                "from": "15551234567",
+                                "id": "wamid.2",
+                                "timestamp": "1700000001",
+                                "type": "image",
+                                "image": {"id": "media-1", "caption": "receipt"},
+                            },
+                        ],
+                        "statuses": [{"id": "wamid.0", "status": "read"}],
+                    },
+                }
+            ],
+        }
+    ],
+}
+
+MESSENGER_PAYLOAD = {
+    "object": "page",
+    "entry": [
+        {
+            "id": "PAGE",
+            "messaging": [
+                {
+                    "sender": {"id": "PSID"},
+                    "recipient": {"id": "PAGE"},
+                    "timestamp": 1700000000000,
+                    "message": {"mid": "m_1", "text": "hi"},
+                },
+                {
+                    "sender": {"id": "PAGE"},
+                    "recipient": {"id": "PSID"},
+                    "timestamp": 1700000001000,
+                    "message": {"mid": "m_2", "text": "hello!", "is_echo": True},
+                },
+                {"sender": {"id": "PSID"}, "recipient": {"id": "PAGE"}, "read": {"watermark": 1}},
+            ],
+        }
+    ],
+}
+
+
+def test_parse_whatsapp():
+    tenant_id = uuid.uuid4()
+    text, image = parse_webhook(ThreadChannel.wa, tenant_id, WHATSAPP_PAYLOAD)
+    assert text.platform_message_id == "wamid.1"
+    assert text.text == "hello"
+    assert text.platform_thread_id == "15551234567"
+    assert image.text == "receipt"
+    assert image.media is not None and image.media["type"] == "image"
+
+
+def test_parse_messenger_echo_is_outbound():
+    inbound, echo = parse_webhook(ThreadChannel.fb, uuid.uuid4(), MESSENGER_PAYLOAD)
+    assert inbound.direction == MessageDirection.inbound
+    assert echo.direction == MessageDirection.outbound
+    assert echo.platform_user_id == "PSID"
+
+
+def test_verify_handshake(client, monkeypatch):
+    monkeypatch.setattr(settings, "whatsapp_webhook_verify_token", "s3cret")
+    url = f"/webhooks/{uuid.uuid4()}/wa"
+    params = {"hub.mode": "subscribe", "hub.verify_token": "s3cret", "hub.challenge": "42"}
+    r = client.get(url, params=params)
+    assert r.status_code == 200
+    assert r.text == "42"
+
+    r = client.get(url, params={**params, "hub.verify_token": "wrong"})
+    assert r.status_code == 403
+
+
+async def test_receive_rejects_bad_signature(db_client, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "facebook_app_secret", "app-secret")
+    body = json.dumps(WHATSAPP_PAYLOAD).encode()
+    url = f"/webhooks/{uuid.uuid4()}/wa"
+
+    r = await db_client.post(url, content=body, headers={"X-Hub-Signature-256": "sha256=bad"})
+    assert r.status_code == 403
+    assert await fake_redis.xlen(INGEST_STREAM) == 0
+
+    signature = hmac.new(b"app-secret", body, hashlib.sha256).hexdigest()
+    r = await db_client.post(url, content=body, headers={"X-Hub-Signature-256": f"sha256={signature}"})
+    assert r.status_code == 200
+    assert r.json() == {"status": "accepted"}
+    assert await fake_redis.xlen(INGEST_STREAM) == 1
+
+
+async def test_ingest_drops_and_counts_unknown_tenants(db_session, fake_redis, monkeypatch):
+    @asynccontextmanager
+    async def session():
+        yield db_session
+
+    monkeypatch.setattr(ingest, "get_db_session", session)
+    before = sum(value for (value,) in ingest_unknown_tenant_messages._series.values())
+    entry = {"tenant_id": str(uuid.uuid4()), "channel": "wa", "body": json.dumps(WHATSAPP_PAYLOAD)}
+
+    assert await ingest.handle_ingest_batch([("1-0", entry)]) == {}
+    after = sum(value for (value,) in ingest_unknown_tenant_messages._series.values())
+    assert after - before == 2